@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""闲鱼助手命令行入口（python src/cli.py）
+
+仓库没有安装成命令的打包配置，统一用 python src/cli.py 运行。
+
+子命令需要的模块在子命令内部才导入，查看帮助、检查配置、查询已保存的记录时不会加载 Appium，
+启动只需要几十毫秒。
+
+用法：
+    python src/cli.py run [--watch]       运行自动化任务
+    python src/cli.py monitor             监控当前所在页面
+    python src/cli.py fleet               多设备模式
+    python src/cli.py bench matching      性能测试（matching、snapshot、profiles）
+    python src/cli.py record out.jsonl    录制页面层级
+    python src/cli.py replay out.jsonl    用录制的页面回放运行任务
+    python src/cli.py simulate            用模拟设备做压力测试
+    python src/cli.py soak --hours 12     虚拟时间下长时间运行，检查内存增长
+    python src/cli.py query 'price < 80'  按规则查询保存的商品记录
+    python src/cli.py check               检查配置
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# 将 src 目录添加到 Python 路径
+src_path = str(Path(__file__).parent.absolute())
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from utils.logger import Logger
+
+
+def _device(args, default_id='default'):
+    """按命令行参数生成设备配置，格式同 FLEET_CONFIG['devices']"""
+    return {
+        'id': args.udid or default_id,
+        'udid': args.udid,
+        'appium_url': args.appium_url,
+        'replay': getattr(args, 'replay', None),
+        'simulate': getattr(args, 'simulate', False),
+    }
+
+
+async def run_automation(device=None, watch=False):
+    """运行自动化程序
+
+    Args:
+        device: 可选，设备配置
+        watch: 是否运行新品捡漏监控模式
+    """
+    from core.automation import XianyuAutomation
+    from core.signal import SignalHandler
+    from core.metrics import start_metrics_server
+
+    automation = XianyuAutomation(device=device)
+    signal_handler = SignalHandler(automation.stop)
+    signal_handler.register_flush(automation.flush_results)
+    metrics_server = await start_metrics_server()
+
+    # 收到信号时直接取消运行中的任务，不等当前的浏览、等待结束
+    runner = asyncio.create_task(automation.watch() if watch else automation.run())
+    signal_handler.register_task(runner)
+    try:
+        await runner
+    except asyncio.CancelledError:
+        Logger.info('自动化任务已取消')
+    except Exception as e:
+        Logger.error('程序异常退出', e)
+        raise
+    finally:
+        signal_handler.cleanup()
+        if metrics_server:
+            await metrics_server.stop()
+
+
+async def run_fleet():
+    """运行多设备模式，每台设备一个工作进程"""
+    from core.fleet import FleetSupervisor
+    from core.signal import SignalHandler, bounded
+    from core.sink import create_sink
+    from core.metrics import start_metrics_server
+
+    sink = create_sink()
+    supervisor = FleetSupervisor(sink=sink)
+    signal_handler = SignalHandler(supervisor.stop)
+    signal_handler.register_flush(supervisor.flush_results)
+    metrics_server = await start_metrics_server(supervisor.collect_metrics)
+
+    try:
+        await supervisor.run()
+    finally:
+        signal_handler.cleanup()
+        if metrics_server:
+            await metrics_server.stop()
+        if sink:
+            await bounded('保存商品记录', sink.close())
+
+
+async def run_record(device, path, interval, duration):
+    """录制页面层级，直到达到时长或收到停止信号"""
+    from core.drivers import create_driver
+    from core.drivers.record import record_frames
+    from core.signal import SignalHandler, quit_driver
+
+    driver = create_driver(device, launch_app=False)
+    runner = asyncio.create_task(record_frames(driver, path, interval, duration))
+    signal_handler = SignalHandler(lambda: None)
+    signal_handler.register_task(runner)
+    try:
+        await runner
+    except asyncio.CancelledError:
+        pass
+    finally:
+        signal_handler.cleanup()
+        await quit_driver(driver)
+
+
+async def run_replay(path, task_id, duration):
+    """用录制的页面回放运行任务，不需要设备"""
+    from core.drivers import ReplayDriver, create_page_factory
+    from core.tasks.task_manager import TaskManager
+    from core.signal import SignalHandler
+
+    driver = ReplayDriver.from_path(path)
+    page_factory = create_page_factory(driver)
+    task_manager = TaskManager(driver, page_factory)
+    signal_handler = SignalHandler(task_manager.stop_current_task)
+    page_factory.start_observer()
+    runner = asyncio.create_task(task_manager.run_task(task_id))
+    signal_handler.register_task(runner)
+    try:
+        await asyncio.wait([runner], timeout=duration)
+        task_manager.stop_current_task()
+        await asyncio.wait([runner])
+    finally:
+        signal_handler.cleanup()
+        await page_factory.stop_observer()
+    Logger.info(f'回放结束，共执行 {driver.action_count} 个操作')
+
+
+def _cmd_run(args):
+    asyncio.run(run_automation(_device(args), watch=args.watch))
+
+
+def _cmd_monitor(args):
+    from page_monitor import main as monitor_main
+    asyncio.run(monitor_main(_device(args)))
+
+
+def _cmd_fleet(args):
+    asyncio.run(run_fleet())
+
+
+def _cmd_bench(args):
+    if args.target == 'matching':
+        from core.matching.bench import run_benchmark
+        run_benchmark()
+    elif args.target == 'snapshot':
+        from core.snapshot.bench import run_benchmark
+        run_benchmark()
+    else:
+        from core.profiles.bench import run_benchmark
+        asyncio.run(run_benchmark(args.page, _device(args, 'bench'), save=not args.dry_run))
+
+
+def _cmd_record(args):
+    asyncio.run(run_record(_device(args), args.path, args.interval, args.duration))
+
+
+def _cmd_replay(args):
+    asyncio.run(run_replay(args.path, args.task, args.duration))
+
+
+def _cmd_simulate(args):
+    from core.simulator.load import run_from_args
+    asyncio.run(run_from_args(args))
+
+
+def _cmd_soak(args):
+    from core.soak.runner import run_from_args
+    return run_from_args(args)
+
+
+def _cmd_query(args):
+    import json
+    import os
+    from config.app_config import SINK_CONFIG
+    from core.rules import RuleSet, RuleSyntaxError
+    from core.sink import read_records
+
+    path = args.path or SINK_CONFIG['path']
+    # 输入错误只输出一行提示，不打印调用栈
+    if not os.path.exists(path):
+        Logger.error(f'记录文件不存在: {path}')
+        return 1
+    try:
+        rules = RuleSet([('query', args.rule)])
+    except RuleSyntaxError as e:
+        Logger.error(f'规则语法错误: {e}')
+        return 1
+    matched = 0
+
+    def evaluate(batch):
+        nonlocal matched
+        for record, fired in zip(batch, rules.evaluate(batch)):
+            if fired is None or (args.limit and matched >= args.limit):
+                continue
+            matched += 1
+            if not args.count:
+                print(json.dumps(record, ensure_ascii=False))
+
+    # 分批评估，每批内的条件只计算一次
+    batch = []
+    for record in read_records(path, args.format):
+        if args.kind and record.get('kind') != args.kind:
+            continue
+        batch.append(record)
+        if len(batch) >= 1000:
+            evaluate(batch)
+            batch = []
+            if args.limit and matched >= args.limit:
+                break
+    if batch:
+        evaluate(batch)
+    if args.count:
+        print(matched)
+
+
+def _cmd_check(args):
+    from config.validate import validate_config
+
+    problems = validate_config()
+    for problem in problems:
+        Logger.error(problem)
+    if problems:
+        return 1
+    Logger.success('配置检查通过')
+    return 0
+
+
+def build_parser():
+    """创建命令行解析器"""
+    parser = argparse.ArgumentParser(prog='python src/cli.py', description='闲鱼自动化助手')
+    subparsers = parser.add_subparsers(dest='command', metavar='命令')
+    subparsers.required = True
+
+    # 需要连接设备的子命令共用的参数
+    session = argparse.ArgumentParser(add_help=False)
+    session.add_argument('--udid', help='设备 udid')
+    session.add_argument('--appium-url', help='Appium 服务器地址，默认使用 APPIUM_HOST/APPIUM_PORT 或 APPIUM_CONFIG')
+
+    command = subparsers.add_parser('run', parents=[session], help='运行自动化任务')
+    command.add_argument('--watch', action='store_true', help='新品捡漏监控模式')
+    command.add_argument('--replay', help='使用录制的页面回放代替真实设备')
+    command.add_argument('--simulate', action='store_true', help='使用应用模拟器代替真实设备（见 SIMULATOR_CONFIG）')
+    command.set_defaults(handler=_cmd_run)
+
+    command = subparsers.add_parser('monitor', parents=[session], help='监控当前所在页面')
+    command.set_defaults(handler=_cmd_monitor)
+
+    command = subparsers.add_parser('fleet', help='多设备模式，设备配置见 FLEET_CONFIG')
+    command.set_defaults(handler=_cmd_fleet)
+
+    command = subparsers.add_parser('bench', parents=[session], help='性能测试')
+    command.add_argument('target', choices=['matching', 'snapshot', 'profiles'],
+                         help='matching：关键词匹配；snapshot：页面层级解析；profiles：各页面的 Appium 设置')
+    command.add_argument('--page', action='append', help='profiles：只测试指定的页面类，可以重复')
+    command.add_argument('--replay', help='profiles：使用录制的页面回放代替真实设备')
+    command.add_argument('--dry-run', action='store_true', help='profiles：不保存结果')
+    command.set_defaults(handler=_cmd_bench)
+
+    command = subparsers.add_parser('record', parents=[session], help='录制页面层级，供回放使用')
+    command.add_argument('path', help='输出的 JSONL 文件')
+    command.add_argument('--interval', type=float, default=1.0, help='读取间隔（秒）')
+    command.add_argument('--duration', type=float, help='录制时长（秒），默认一直录制到按 Ctrl+C')
+    command.set_defaults(handler=_cmd_record)
+
+    command = subparsers.add_parser('replay', help='用录制的页面回放运行任务，不需要设备')
+    command.add_argument('path', help='录制的 JSONL 文件或 XML 目录')
+    command.add_argument('--task', default='browse_items', help='任务ID')
+    command.add_argument('--duration', type=float, default=30, help='运行时长（秒）')
+    command.set_defaults(handler=_cmd_replay)
+
+    command = subparsers.add_parser('simulate', help='在一个进程里模拟多台设备，做压力测试')
+    command.add_argument('--devices', type=int, default=100, help='模拟设备数')
+    command.add_argument('--duration', type=float, default=60, help='运行时长（秒）')
+    command.add_argument('--task', default='browse_items', help='任务ID')
+    command.add_argument('--seed', type=int, help='随机种子，第 i 台设备使用 seed + i，设置后可以复现')
+    command.add_argument('--interval', type=float, default=10, help='输出统计的间隔（秒）')
+    command.add_argument('--latency-scale', type=float, default=0.0,
+                         help='按采样的命令耗时实际阻塞的比例，默认 0（只统计不等待）')
+    command.add_argument('--crash-rate', type=float, help='每个命令后应用崩溃的概率')
+    command.add_argument('--stale-rate', type=float, help='每个命令前元素失效的概率')
+    command.add_argument('--stall-rate', type=float, help='加载卡住的概率')
+    command.add_argument('--log', help='模拟设备的日志输出文件，默认丢弃')
+    command.set_defaults(handler=_cmd_simulate)
+
+    command = subparsers.add_parser('soak', help='在虚拟时间下长时间运行完整任务栈，检查内存增长（见 SOAK_CONFIG）')
+    command.add_argument('--hours', type=float, help='虚拟时长（小时）')
+    command.add_argument('--devices', type=int, help='模拟设备数')
+    command.add_argument('--task', default='browse_items', help='任务ID')
+    command.add_argument('--replay', help='录制文件或目录，使用回放驱动代替应用模拟器')
+    command.add_argument('--seed', type=int, help='随机种子，第 i 台设备使用 seed + i')
+    command.add_argument('--sample-minutes', type=float, help='采样间隔（虚拟分钟）')
+    command.add_argument('--warmup-items', type=int, help='处理多少个商品后取基线')
+    command.add_argument('--min-items', type=int, help='基线之后至少处理多少个商品才计算增长')
+    command.add_argument('--rss-threshold-mb', type=float, help='每万个商品允许的常驻内存增长（MB）')
+    command.add_argument('--traced-threshold-mb', type=float, help='每万个商品允许的 Python 分配增长（MB）')
+    command.add_argument('--object-threshold', type=int, help='每万个商品单个类型允许增加的对象数')
+    command.add_argument('--log', help='设备日志的输出文件，默认丢弃')
+    command.set_defaults(handler=_cmd_soak)
+
+    command = subparsers.add_parser('query', help='按规则查询保存的商品记录')
+    command.add_argument('rule', help="规则，语法同 MATCH_RULES，例如 'chiikawa AND price < 80'")
+    command.add_argument('--path', help='记录文件，默认使用 SINK_CONFIG 中的路径')
+    command.add_argument('--format', choices=['jsonl', 'sqlite', 'parquet'], help='文件格式，默认按扩展名判断')
+    command.add_argument('--kind', help='只查询指定类型的记录，例如 card、detail')
+    command.add_argument('--limit', type=int, help='最多输出的记录数')
+    command.add_argument('--count', action='store_true', help='只输出匹配的记录数')
+    command.set_defaults(handler=_cmd_query)
+
+    command = subparsers.add_parser('check', help='检查配置，不连接设备')
+    command.set_defaults(handler=_cmd_check)
+
+    return parser
+
+
+def main(argv=None):
+    """程序入口函数"""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args) or 0
+    except KeyboardInterrupt:
+        return 0  # 优雅退出，不显示错误堆栈
+    except Exception as e:
+        Logger.error('程序运行出错', e)
+        raise
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,9 +5,19 @@ XIANYU_ACTIVITY = 'com.taobao.fleamarket.home.activity.InitActivity'
 # 搜索配置
 SEARCH_CONFIG = {
     'keywords': ['chiikawa', '奇卡瓦'],  # 在这里添加要匹配的关键词，支持多个关键词
-    'case_sensitive': False,  # 是否区分大小写
+    'case_sensitive': False,  # 是否区分大小写，开启后只做精确包含匹配
+    'fuzzy_threshold': 0.7,  # 模糊匹配的相似度阈值（0-1），不区分大小写时生效
+    # 内置别名表之外的别名组，每组是互为别名的写法，例如 ['hachiware', '小八', 'ハチワレ']
+    'aliases': [],
 }
 
+# 匹配规则，配置后代替 SEARCH_CONFIG 的关键词匹配，按顺序取第一条命中的规则
+# 规则在列表卡片上评估，只能使用 title 和 price 字段
+# 语法示例：'chiikawa AND price < 80 AND NOT 盲盒'
+MATCH_RULES = [
+    # {'name': '便宜的chiikawa', 'rule': '(chiikawa OR 吉伊卡哇) AND price < 80 AND NOT 盲盒'},
+]
+
 # Appium 配置
 APPIUM_CONFIG = {
     'host': 'localhost',
@@ -21,4 +31,303 @@ APPIUM_CONFIG = {
         'autoLaunch': True,
         'newCommandTimeout': 60
     }
-} 
\ No newline at end of file
+} 
+
+# 捡漏监控配置
+SNIPER_CONFIG = {
+    'keywords': None,  # 监控的关键词，为 None 时使用 SEARCH_CONFIG['keywords']
+    'top_n': 10,  # 每次刷新只比对结果列表前 N 个商品
+    'refresh_mode': 'pull',  # 刷新方式：pull（下拉刷新）或 requery（重新搜索）
+    'initial_interval': 10,  # 初始刷新间隔（秒）
+    'min_interval': 3,  # 最短刷新间隔（秒）
+    'max_interval': 60,  # 最长刷新间隔（秒）
+    'target_per_refresh': 1.0,  # 期望每次刷新看到的新商品数，用于推算刷新间隔
+    'fire_on_first_scan': False,  # 首次扫描的商品是否触发回调（默认只作为基线）
+    'seen_capacity': 50000,  # 已见商品记录的最大条数
+}
+
+# 页面导航配置
+NAVIGATION_CONFIG = {
+    'max_steps': 4,  # 单次导航最多执行的页面跳转步数
+    'verify_timeout': 3,  # 每步跳转后确认页面的超时时间（秒）
+    'relaunch_limit': 1,  # 单次导航最多重启应用的次数
+    'deep_links': {
+        'HomePage': 'fleamarket://home',
+    },
+}
+
+# 页面观察器配置
+OBSERVER_CONFIG = {
+    'fast_interval': 0.2,  # 操作后的采样间隔（秒）
+    'idle_interval': 2.0,  # 空闲时的最长采样间隔（秒）
+    'backoff': 1.5,  # 页面未变化时采样间隔的增长倍数
+}
+
+# 详情页浏览配置（滑动次数和停留时间由 PACING_CONFIG 决定）
+DETAIL_BROWSE_CONFIG = {
+    'up_probability': 0.8,  # 向上滑动的概率
+    'min_dwell': 6,  # 最短停留时间（秒），页面提前到底时补足，保持像人工浏览
+    'stable_rounds': 1,  # 连续多少次向上滑动后页面内容不变视为到底
+}
+
+# 重复发布识别配置
+DEDUP_CONFIG = {
+    'enabled': True,  # 是否跳过同一商品的重复发布
+    'max_distance': 3,  # 标题指纹相差不超过多少比特视为重复（0-15）
+    'capacity': 1000000,  # 最多保存的指纹数量，超出后淘汰最早的记录
+}
+
+# 已处理商品服务配置（多个浏览进程共享，先运行 python -m core.seen.server）
+SEEN_SERVICE_CONFIG = {
+    'enabled': False,  # 是否连接共享的已处理商品服务，连接失败时各进程独立去重
+    'socket_path': 'output/seen.sock',  # Unix 域套接字路径
+    'snapshot_path': 'output/seen.snapshot',  # 快照文件路径，为 None 时不保存
+    'snapshot_interval': 60,  # 保存快照的间隔（秒）
+    'recent_capacity': 100000,  # 精确保存的最近商品数量
+    'initial_capacity': 1000000,  # 第一个布隆过滤器的容量
+    'error_rate': 0.001,  # 布隆过滤器的误判率
+    'max_bytes': 64 * 1024 * 1024,  # 布隆过滤器的内存上限（字节）
+}
+
+# 多设备配置（python src/main.py --fleet），每台设备运行在独立的工作进程中
+FLEET_CONFIG = {
+    'devices': [
+        # {'id': 'phone-1', 'udid': 'emulator-5554', 'system_port': 8201, 'account': 'alice'},
+        # {'id': 'phone-2', 'udid': 'emulator-5556', 'system_port': 8202, 'account': 'alice'},
+        # {'id': 'replay-1', 'replay': 'recordings/home'},  # 使用录制的页面回放，不需要设备
+        # {'id': 'sim-1', 'simulate': {'crash_rate': 0.001}},  # 使用应用模拟器（见 SIMULATOR_CONFIG），不需要设备
+    ],
+    'task': 'browse_items',  # 工作进程运行的任务ID，为 jobs 时从任务队列领取工作单元（见 JOBS_CONFIG）
+    'restart_delay': 2,  # 工作进程异常退出后的首次重启等待（秒），之后按指数增长
+    'max_restart_delay': 60,  # 最长重启等待（秒）
+    'max_restarts': 10,  # 连续重启超过该次数后不再重启
+    'metrics_interval': 5,  # 工作进程上报指标的间隔（秒）
+    'stop_timeout': 10,  # 停止时等待工作进程退出的时间（秒），超时后强制结束
+}
+
+# 任务队列配置，多台机器的工作进程从同一个队列领取工作单元
+JOBS_CONFIG = {
+    'backend': 'sqlite',  # memory（进程内）、sqlite（本机多进程共享）或 remote（连接 python -m core.jobs.server）
+    'path': 'output/jobs.db',  # sqlite 数据库路径，任务队列服务也使用该路径
+    'host': 'localhost',  # remote 后端连接的服务地址
+    'bind': '0.0.0.0',  # 任务队列服务监听的地址
+    'port': 8765,  # 任务队列服务端口
+    'lease_seconds': 60,  # 租约时长（秒），工作进程失联超过该时间后任务重新排队
+    'heartbeat_interval': 15,  # 续约间隔（秒），应明显小于租约时长
+    'poll_interval': 2,  # 队列为空时的等待间隔（秒）
+    'stop_timeout': 10,  # 任务超时或租约丢失后等待任务退出的时间（秒）
+}
+
+# 操作限速配置：每个动作依次经过设备、账号和动作类型三个令牌桶（次/分钟, 突发数）
+THROTTLE_CONFIG = {
+    'enabled': True,
+    # 账号标识，FLEET_CONFIG['devices'] 中设备的 account 优先；连接了已处理商品服务时
+    # 所有进程中相同账号共享令牌桶，否则只在本进程内共享（fleet 每个进程只有一台设备）
+    'account': 'default',
+    'device_per_minute': 60,  # 每台设备每分钟最多操作次数
+    'device_burst': 5,
+    'account_per_minute': 60,  # 每个账号每分钟最多操作次数
+    'account_burst': 5,
+    'actions': {
+        'tap': (30, 3),
+        'scroll': (30, 5),
+        'search': (6, 1),
+        'detail_open': (12, 2),
+        'back': (30, 3),
+        'navigate': (10, 2),
+    },
+    # 自适应降速：命令耗时突增或出错时按 decrease 倍降速，恢复正常后每次加回 increase
+    'spike_ratio': 2.0,  # 近期耗时超过长期耗时的倍数视为变慢
+    'min_latency': 0.5,  # 耗时低于该值（秒）时不视为变慢
+    'error_threshold': 0.2,  # 近期出错比例上限
+    'decrease': 0.7,
+    'increase': 0.05,
+    'min_multiplier': 0.2,  # 最低降到满速的比例
+}
+
+# 浏览节奏配置：停留时间服从对数正态分布，(中位数, sigma)，中位数单位为秒
+PACING_CONFIG = {
+    'target_views_per_hour': 60,  # 目标每小时浏览的详情数，停留时间按此缩放
+    'dwell': {
+        'initial': (1.5, 0.5),  # 进入页面后的停留
+        'scroll': (1.6, 0.6),  # 每次滑动后的停留
+        'final': (1.0, 0.5),  # 离开前的停留
+    },
+    'min_median': {  # 真实感下限：缩放后的中位数不低于这些值（秒）
+        'initial': 0.8,
+        'scroll': 0.7,
+        'final': 0.4,
+    },
+    'min_sigma': 0.3,  # 采样时的最小 sigma，避免节奏过于规律
+    'max_scale': 6.0,  # 目标较低时停留时间最多放大的倍数
+    'scrolls': (3, 0.4),  # 每个页面的滑动次数
+    'max_scrolls': 8,
+    'session_views': (12, 0.5),  # 每个会话连续浏览的详情数
+    'break_seconds': (90, 0.6),  # 会话之间的休息时间
+    'overhead_seconds': 4.0,  # 每个详情除停留外的耗时估计（点击、加载、返回）
+}
+
+# 阶段耗时追踪配置
+TRACE_CONFIG = {
+    'enabled': False,  # 开启后记录每轮循环各阶段及其中驱动命令的耗时
+    'driver_commands': True,  # 是否记录驱动命令（find_element、is_displayed 等）
+    'max_events': 200000,  # 保留的事件数上限，超出后丢弃最早的事件（汇总统计不受影响）
+    'chrome_path': 'output/trace.json',  # Chrome trace-event JSON，可在 chrome://tracing 或 Perfetto 中打开
+    'folded_path': 'output/trace.folded',  # 折叠栈格式，可用 flamegraph.pl 或 speedscope 生成火焰图
+}
+
+# 指标接口配置（Prometheus 文本格式，GET /metrics）
+METRICS_CONFIG = {
+    'enabled': False,
+    'host': '127.0.0.1',  # 只在本机抓取时保持 127.0.0.1
+    'port': 9108,
+}
+
+# 故障记录配置：内存中保留最近的页面层级和命令，连续失败或会话丢失时才写入磁盘
+FLIGHT_RECORDER_CONFIG = {
+    'enabled': True,
+    'snapshots': 20,  # 保留的页面层级快照数（gzip 压缩后保存）
+    'commands': 500,  # 保留的命令记录数
+    'events': 200,  # 保留的事件数
+    'failure_threshold': 3,  # 时间窗口内失败达到该次数时写入记录
+    'failure_window': 60,  # 失败计数的时间窗口（秒）
+    'min_interval': 300,  # 两次写入之间的最短间隔（秒）
+    'max_dumps': 20,  # 每个进程最多写入的次数
+    'screenshot': True,  # 写入时是否附带截图
+    'directory': 'output/flight',
+}
+
+# 页面快照配置
+SNAPSHOT_CONFIG = {
+    # 让驱动只返回需要的部分，首次获取快照时设置一次
+    'settings': {
+        'snapshotMaxDepth': 50,  # 层级深度上限，闲鱼首页的商品卡片在 30 层以内
+        # 页面源码中不需要的属性
+        'pageSourceExcludedAttributes': 'checkable,checked,clickable,enabled,focusable,focused,'
+                                        'long-clickable,password,scrollable,selected,displayed,package',
+    },
+    # 只在获取快照期间打开的设置，获取后恢复原值
+    'capture_settings': {
+        'ignoreUnimportantViews': True,  # 压缩层级，去掉仅用于布局的视图
+    },
+    'feed_scope': 'com.taobao.idlefish:id/nested_recycler_view',  # 首页商品流容器，只解析其中的节点
+}
+
+# 页面性能设置配置：页面类通过 PERFORMANCE_PROFILE 声明 Appium 设置，切换页面时自动应用
+PROFILE_CONFIG = {
+    'enabled': True,
+    'overrides': {},  # 按页面类名覆盖，例如 {'HomePage': {'waitForIdleTimeout': 0}}
+    'use_bench_results': True,  # 是否使用性能测试保存的结果
+    'bench_path': 'output/profiles.json',  # python -m core.profiles.bench 的结果
+    'bench_rounds': 5,  # 每个候选值测试的次数
+    'bench_candidates': {  # 性能测试尝试的候选值
+        'waitForIdleTimeout': [0, 100, 500, 1000, 3000],
+        'waitForSelectorTimeout': [0, 500, 1000, 3000],
+        'actionAcknowledgmentTimeout': [100, 500, 1000, 3000],
+        # 不测试 ignoreUnimportantViews：它会改变元素查找结果，离开页面后识别其他页面时仍然生效，
+        # 只测试当前页面的识别无法发现问题，由 SNAPSHOT_CONFIG['capture_settings'] 在获取快照时临时打开
+    },
+}
+
+# 阶段时间预算配置（秒）：预算从任务循环传到页面对象，等待只使用剩余时间
+DEADLINE_CONFIG = {
+    'enabled': True,
+    'overrun_grace': 0.2,  # 超出预算不到该秒数时不算超时，避免轮询间隔造成误报
+    'budgets': {
+        'item': 240,  # 处理一个商品（点击、浏览详情、返回）的总预算，不含会话间的休息
+        'ensure_home_page': 30,
+        'get_item_container': 8,
+        'get_items': 5,
+        'get_item_title': 3,
+        'tap': 5,
+        'wait_for_page': 5,
+        'browse_detail_page': 180,
+        'back': 30,
+        'scroll_page': 10,
+        'open_results': 60,  # 捡漏任务打开或刷新一个关键词的结果列表（导航、搜索、排序）
+        'scan_results': 15,  # 捡漏任务读取结果列表前 N 个商品
+    },
+}
+
+# 任务检查点配置：任务进度定期写入磁盘，重启后从检查点继续
+CHECKPOINT_CONFIG = {
+    'enabled': True,
+    'directory': 'output/checkpoints',  # 检查点目录，每台设备每个任务一个文件
+    'interval': 30,  # 增量日志合并为完整快照的间隔（秒）
+    'max_age': 6 * 3600,  # 超过该时间（秒）没有更新的检查点视为过期，从头开始
+    'recent_items': 500,  # 浏览商品任务记住的最近处理过的商品数，恢复后不再重复浏览
+    'seen_items': 2000,  # 捡漏任务保存的已见商品数，恢复后不会把旧商品当作新商品
+}
+
+# 应用模拟器配置：不需要设备，生成无限的商品流，用于压力测试
+SIMULATOR_CONFIG = {
+    'seed': None,  # 随机种子，设置后商品流和注入的故障可以复现
+    # 标题由 前缀 + 主体 + 后缀 组成，各部分的词按 Zipf 分布抽取，exponent 越大越集中在靠前的词
+    'titles': {
+        'prefixes': ['二手', '全新', '九成新', '自用', '闲置', '急出', '正版', '包邮'],
+        'subjects': ['switch oled', 'iPhone 13', '小米手环', '乐高积木', '机械键盘', 'kindle',
+                     '露营帐篷', '汉服', '吉他', '显示器', '降噪耳机', '电饭煲'],
+        'suffixes': ['白色', '95新', '带盒', '配件齐全', '低价出', '可小刀', '同城自提', ''],
+        'zipf': 1.2,
+    },
+    'keywords': None,  # 混入标题的关键词，默认使用 SEARCH_CONFIG['keywords']
+    'match_rate': 0.05,  # 标题包含关键词的比例
+    'duplicate_rate': 0.08,  # 重复发布（最近的商品换个说法再发一次）的比例
+    'price': (120, 1.0),  # 价格的 (中位数, sigma)
+    'items_per_screen': (4, 6),  # 每屏商品数的范围
+    'detail_pages': 3,  # 详情页滑动几次到底
+    'city_service_rate': 0.05,  # 从详情页返回时落到城市服务页的概率
+    'stall_rate': 0.05,  # 加载新内容时卡住的概率
+    'stall_seconds': (3.0, 0.6),  # 卡住时长的 (中位数, sigma)
+    'stale_rate': 0.005,  # 每个命令前界面重绘、已获取的元素失效的概率
+    'crash_rate': 0.0005,  # 每个命令后应用崩溃回到桌面的概率
+    'session_loss_rate': 0.0,  # 每个命令后 Appium 会话丢失的概率，之后所有命令都会失败
+    # 各类命令耗时的 (中位数, sigma)，单位为秒
+    'latency': {
+        'find': (0.08, 0.5),
+        'page_source': (0.35, 0.4),
+        'attribute': (0.03, 0.4),
+        'click': (0.15, 0.4),
+        'swipe': (0.8, 0.2),
+        'back': (0.2, 0.4),
+        'app': (1.5, 0.3),
+        'settings': (0.05, 0.3),
+        'other': (0.05, 0.5),
+    },
+    # 按采样耗时实际阻塞的比例；驱动接口是同步的，一个进程模拟多台设备时设为 0，只统计不等待
+    'latency_scale': 1.0,
+}
+
+# 浸泡测试配置：在虚拟时间下长时间运行完整任务栈，按处理的商品数检查内存增长
+SOAK_CONFIG = {
+    'hours': 12,  # 运行的虚拟时长（小时），等待被跳过，实际耗时取决于 CPU
+    'devices': 4,  # 模拟设备数
+    'sample_minutes': 10,  # 采样间隔（虚拟分钟）
+    'warmup_items': 5000,  # 处理这么多商品后取基线，之前缓存还在填充
+    'min_items': 10000,  # 基线之后至少处理这么多商品才计算增长
+    # 每处理一万个商品允许的增长
+    'rss_threshold_mb': 8,  # 常驻内存（MB）
+    'traced_threshold_mb': 4,  # tracemalloc 统计的 Python 分配（MB）
+    'object_threshold': 2000,  # 单个类型的存活对象数
+    'top': 10,  # 报告中列出增长最多的对象类型和分配位置数
+    'tracemalloc_frames': 1,  # 分配位置保留的调用栈深度，大于 1 时报告完整调用栈，但运行明显变慢
+}
+
+# 退出配置：收到停止信号后各清理步骤最多等待的时间（秒）
+SHUTDOWN_CONFIG = {
+    'task_timeout': 1,  # 取消任务后等待任务清理完成的时间
+    'step_timeout': 2,  # 写盘、关闭连接等清理步骤的超时时间
+    'quit_timeout': 1,  # 关闭 Appium 会话的超时时间，超时后不再等待服务器响应
+}
+
+# 结果输出配置
+SINK_CONFIG = {
+    'enabled': True,  # 是否保存浏览到的商品
+    # 输出格式：jsonl、sqlite 或 parquet（需要安装 pyarrow）
+    # parquet 只在正常关闭时写入文件尾，进程被强制结束后文件不可读，SIGTERM 时的刷新也无法补救
+    'format': 'jsonl',
+    'path': 'output/listings.jsonl',  # 输出文件路径
+    'batch_size': 200,  # 攒够多少条记录写一次
+    'flush_interval': 2.0,  # 最长多久写一次（秒）
+    'queue_size': 10000,  # 内存队列上限，写入跟不上时丢弃新记录而不是阻塞浏览
+}
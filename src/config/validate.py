@@ -0,0 +1,86 @@
+import os
+
+from config import app_config
+
+
+def _positive(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0
+
+
+def validate_config(config=app_config):
+    """检查配置中的常见错误，不连接设备
+
+    Args:
+        config: 可选，配置模块，默认为 config.app_config
+
+    Returns:
+        list: 问题描述列表，没有问题时为空列表
+    """
+    from core.rules import parse_rule, RuleSyntaxError, CARD_FIELDS
+
+    problems = []
+
+    search = config.SEARCH_CONFIG
+    if not search['keywords'] and not config.MATCH_RULES:
+        problems.append('SEARCH_CONFIG: 没有配置关键词，也没有配置 MATCH_RULES')
+    if not 0 <= search['fuzzy_threshold'] <= 1:
+        problems.append(f"SEARCH_CONFIG: fuzzy_threshold 应在 0-1 之间，实际为 {search['fuzzy_threshold']}")
+
+    names = set()
+    for index, rule in enumerate(config.MATCH_RULES):
+        name = rule.get('name') if isinstance(rule, dict) else None
+        if not name or 'rule' not in rule:
+            problems.append(f'MATCH_RULES[{index}]: 需要包含 name 和 rule 字段')
+            continue
+        if name in names:
+            problems.append(f'MATCH_RULES[{index}]: 规则名称重复: {name}')
+        names.add(name)
+        try:
+            parse_rule(rule['rule'], CARD_FIELDS)
+        except RuleSyntaxError as e:
+            problems.append(f'MATCH_RULES[{index}] ({name}): {e}')
+
+    try:
+        int(config.APPIUM_CONFIG['port'])
+    except (TypeError, ValueError):
+        problems.append(f"APPIUM_CONFIG: port 不是有效的端口: {config.APPIUM_CONFIG['port']!r}")
+
+    device_ids, system_ports = set(), set()
+    for index, device in enumerate(config.FLEET_CONFIG['devices']):
+        device_id = device.get('id')
+        if not device_id:
+            problems.append(f'FLEET_CONFIG.devices[{index}]: 缺少 id')
+        elif device_id in device_ids:
+            problems.append(f'FLEET_CONFIG.devices[{index}]: 设备 id 重复: {device_id}')
+        device_ids.add(device_id)
+        if device.get('replay'):
+            if not os.path.exists(device['replay']):
+                problems.append(f"FLEET_CONFIG.devices[{index}]: 回放文件不存在: {device['replay']}")
+            continue
+        if device.get('simulate'):
+            continue
+        port = device.get('system_port')
+        if port is not None:
+            if port in system_ports:
+                problems.append(f'FLEET_CONFIG.devices[{index}]: systemPort 重复: {port}')
+            system_ports.add(port)
+
+    if config.SINK_CONFIG['format'] not in ('jsonl', 'sqlite', 'parquet'):
+        problems.append(f"SINK_CONFIG: 未知的输出格式: {config.SINK_CONFIG['format']}")
+
+    for phase, seconds in config.DEADLINE_CONFIG['budgets'].items():
+        if not _positive(seconds):
+            problems.append(f'DEADLINE_CONFIG: 阶段 {phase} 的预算应为正数，实际为 {seconds!r}')
+    simulator = config.SIMULATOR_CONFIG
+    for key in ('match_rate', 'duplicate_rate', 'city_service_rate', 'stall_rate', 'stale_rate',
+                'crash_rate', 'session_loss_rate'):
+        if not 0 <= simulator[key] <= 1:
+            problems.append(f'SIMULATOR_CONFIG: {key} 应在 0-1 之间，实际为 {simulator[key]!r}')
+    if 'other' not in simulator['latency']:
+        problems.append("SIMULATOR_CONFIG: latency 需要包含 other，作为未单独配置的命令的耗时")
+
+    for key, seconds in config.SHUTDOWN_CONFIG.items():
+        if not _positive(seconds):
+            problems.append(f'SHUTDOWN_CONFIG: {key} 应为正数，实际为 {seconds!r}')
+
+    return problems
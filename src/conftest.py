@@ -0,0 +1,11 @@
+"""pytest 配置
+
+src 目录本身是一个包，从仓库根目录运行 python -m pytest src/... 时，pytest 只会把仓库根目录
+加入 Python 路径，测试里的 from core... 导入会失败。这里把 src 目录加入路径，与 test.py 相同。
+"""
+import sys
+from pathlib import Path
+
+src_path = str(Path(__file__).parent.absolute())
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
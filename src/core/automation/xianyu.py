@@ -1,45 +1,69 @@
-from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
-from appium.options.common.base import AppiumOptions
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import asyncio
 import os
 import random
 
 from utils.logger import Logger
-from config.app_config import XIANYU_PACKAGE, XIANYU_ACTIVITY, SEARCH_CONFIG, APPIUM_CONFIG
+from config.app_config import SEARCH_CONFIG, MATCH_RULES
 from core.home_page import HomePage
 from core.pages.detail_page import DetailPage
+from core.pages.page_factory import PageFactory
+from core.pages.home_page import HomePage as FeedHomePage
+from core.pages.city_service_page import CityServicePage
+from core.pages.search_page import SearchPage
+from core.tasks.snipe_items_task import SnipeItemsTask
+from core.sink import create_sink
+from core.dedup import create_deduper
+from core.seen import create_seen_client
+from core.throttle import get_limiter
+from core.pacing import get_pacer
+from core.tracing import span, trace_driver, finish_tracing
+from core.metrics import get_metrics
+from core.recorder import get_recorder
+from core import tracing
+from core.deadline import budget, wait_until
+from core.signal import bounded, quit_driver
+from core.drivers import create_driver
+from core.extract import ListingRecord
+from core.rules import RuleSet, CARD_FIELDS
+from core.matching import KeywordIndex
 
 class XianyuAutomation:
-    def __init__(self, driver=None):
+    def __init__(self, driver=None, device=None):
         """初始化闲鱼自动化
         
         Args:
             driver: 可选，Appium WebDriver 实例
+            device: 可选，没有传入 driver 时用于创建会话的设备配置，格式同 FLEET_CONFIG['devices']
         """
         self.driver = driver
         self.running = True
+        self.watch_task = None
+        self.sink = None
+        self.seen = None
         
         if not self.driver:
             try:
                 Logger.info('初始化 Appium...')
-                options = AppiumOptions()
-                for key, value in APPIUM_CONFIG['capabilities'].items():
-                    options.set_capability(key, value)
-                options.set_capability('appPackage', XIANYU_PACKAGE)
-                options.set_capability('appActivity', XIANYU_ACTIVITY)
-                
-                self.driver = webdriver.Remote(
-                    command_executor='http://localhost:4723',
-                    options=options
-                )
+                self.driver = create_driver(device)
                 Logger.success('Appium 连接成功')
                 
             except Exception as e:
                 Logger.error('初始化失败', e)
                 raise
+        self.driver = trace_driver(self.driver)
+        if device and device.get('account'):
+            get_limiter(self.driver, {'account': device['account']})
+        get_metrics(self.driver).track_queue('sink', lambda: self.sink.queue_depth if self.sink else 0)
+        
+        # 规则只在启动时编译一次
+        self.rules = RuleSet(MATCH_RULES, CARD_FIELDS) if MATCH_RULES else None
+        self.keyword_index = KeywordIndex(
+            SEARCH_CONFIG['keywords'], SEARCH_CONFIG['fuzzy_threshold'],
+            alias_groups=SEARCH_CONFIG['aliases']
+        )
+        self.dedup = create_deduper()
         
         # 初始化页面对象
         self.home_page = HomePage(self.driver)
@@ -48,30 +72,45 @@ class XianyuAutomation:
     def stop(self):
         """停止自动化任务"""
         self.running = False
+        if self.watch_task:
+            self.watch_task.stop()
         Logger.info('正在停止自动化任务...')
 
+    async def flush_results(self):
+        """立即把已浏览的商品记录写入磁盘"""
+        if self.sink:
+            await self.sink.flush()
+
     async def cleanup(self):
-        """清理资源"""
+        """清理资源，每一步都有超时，服务器无响应时也能很快退出"""
+        if self.sink:
+            await bounded('保存商品记录', self.sink.close())
+            self.sink = None
+        if self.seen:
+            get_limiter(self.driver).account_client = None
+            await bounded('关闭去重服务连接', self.seen.close())
+            self.seen = None
+        finish_tracing()
         if self.driver:
-            try:
-                Logger.info('正在关闭会话...')
-                self.driver.quit()
+            Logger.info('正在关闭会话...')
+            if await quit_driver(self.driver):
                 Logger.success('会话已关闭')
-            except Exception as e:
-                Logger.error('关闭会话时出错', e)
 
     def title_matcher(self, title: str) -> bool:
-        """标题匹配函数"""
-        if not SEARCH_CONFIG['case_sensitive']:
-            title = title.lower()
-            keywords = [k.lower() for k in SEARCH_CONFIG['keywords']]
-        else:
-            keywords = SEARCH_CONFIG['keywords']
+        """标题匹配函数，没有配置 MATCH_RULES 时使用；配置了规则时按屏批量评估"""
+        if SEARCH_CONFIG['case_sensitive']:
+            for keyword in SEARCH_CONFIG['keywords']:
+                if keyword in title:
+                    Logger.success(f'标题匹配成功: {title} (匹配关键词: {keyword})')
+                    return True
+            Logger.debug(f'标题不匹配: {title}')
+            return False
 
-        for keyword in keywords:
-            if keyword in title:
-                Logger.success(f'标题匹配成功: {title} (匹配关键词: {keyword})')
-                return True
+        # 归一化后模糊匹配，覆盖全半角、繁简、拼音和拆字写法
+        keyword, score = self.keyword_index.match(title)
+        if keyword:
+            Logger.success(f'标题匹配成功: {title} (匹配关键词: {keyword}, 相似度: {score:.2f})')
+            return True
         
         Logger.debug(f'标题不匹配: {title}')
         return False
@@ -80,17 +119,26 @@ class XianyuAutomation:
         """找到匹配商品时的回调函数"""
         if not self.running:
             return
-        item.click()
+        with span('tap'), budget('tap'):
+            async with get_limiter(self.driver).action('detail_open'):
+                item.click()
         await self.process_item_detail()
 
     async def run(self):
         """运行自动化任务"""
         try:
             Logger.info('=== 开始运行自动化任务 ===')
+            self.sink = create_sink()
+            self.seen = await create_seen_client()
+            get_limiter(self.driver).account_client = self.seen
             await self.home_page.browse_items(
                 title_matcher=self.title_matcher,
                 on_item_found=self.on_item_found,
-                should_continue=lambda: self.running
+                should_continue=lambda: self.running,
+                sink=self.sink,
+                dedup=self.dedup,
+                seen=self.seen,
+                rules=self.rules
             )
         except asyncio.CancelledError:
             Logger.info('任务被取消')
@@ -101,38 +149,87 @@ class XianyuAutomation:
         finally:
             await self.cleanup()
 
+    async def watch(self):
+        """运行新品捡漏监控
+
+        按关键词监控最新发布的商品，发现新商品后使用 on_item_found 处理。
+        """
+        try:
+            Logger.info('=== 开始新品捡漏监控 ===')
+            page_factory = PageFactory(self.driver)
+            page_factory.register_page(FeedHomePage, FeedHomePage.IDENTIFIERS)
+            page_factory.register_page(CityServicePage, CityServicePage.IDENTIFIERS)
+            page_factory.register_page(DetailPage, DetailPage.IDENTIFIERS)
+            page_factory.register_page(SearchPage, SearchPage.IDENTIFIERS)
+            page_factory.start_observer()
+            self.sink = create_sink()
+            self.seen = await create_seen_client()
+            get_limiter(self.driver).account_client = self.seen
+
+            self.watch_task = SnipeItemsTask(
+                self.driver,
+                page_factory,
+                title_matcher=self.title_matcher,
+                on_item_found=self.on_item_found,
+                rules=self.rules,
+                sink=self.sink,
+                dedup=self.dedup,
+                seen=self.seen
+            )
+            await self.watch_task.run()
+        except asyncio.CancelledError:
+            Logger.info('监控被取消')
+        except Exception as error:
+            Logger.error('监控执行出错', error)
+        finally:
+            self.watch_task = None
+            await bounded('停止页面观察器', page_factory.stop_observer())
+            await self.cleanup()
+
     async def wait_for_element(self, by, value: str, timeout: int = 10000):
         """等待元素加载"""
         Logger.debug(f'等待元素加载: {value}')
         try:
-            element = WebDriverWait(self.driver, timeout/1000).until(
-                EC.presence_of_element_located((by, value))
-            )
+            element = await wait_until(lambda: self.driver.find_element(by, value), timeout/1000)
+            if element is None:
+                raise TimeoutException(f'{timeout/1000:.1f} 秒内未找到元素')
             Logger.success(f'元素已加载: {value}')
             return element
         except Exception as error:
             Logger.error(f'等待元素超时: {value}', error)
+            get_recorder(self.driver).failure(f'等待元素超时: {value}')
             raise
 
     async def process_item_detail(self):
         """处理商品详情页"""
         try:
             Logger.debug('进入商品详情页')
-            await asyncio.sleep(2)  # 等待页面加载
+            get_metrics(self.driver).detail_visits.inc()
+            await tracing.sleep(2, 'wait_for_page')  # 等待页面加载
             
             # 使用DetailPage的浏览方法
-            success = await self.detail_page.browse_page()
+            with span('browse_detail_page'), budget('browse_detail_page'):
+                success = await self.detail_page.browse_page()
             if not success:
                 Logger.warn('详情页浏览异常')
+            if self.sink and self.detail_page.captured_fields:
+                record = ListingRecord.from_fields(self.detail_page.captured_fields)
+                data = record.to_dict()
+                if self.dedup:
+                    data['canonical_id'] = self.dedup.check_detail(record).canonical_id
+                self.sink.put('detail', data)
             
-            self.driver.back()
-            Logger.debug('返回列表页')
-            await asyncio.sleep(1)
+            with span('back'), budget('back'):
+                async with get_limiter(self.driver).action('back'):
+                    self.driver.back()
+                Logger.debug('返回列表页')
+                await tracing.sleep(1, 'wait_for_page')
+            await get_pacer(self.driver).view_done()
             
             return True
         except asyncio.CancelledError:
             Logger.info('详情页处理被取消')
-            return False
+            raise
         except Exception as error:
             Logger.error('处理商品详情页失败', error)
             return False 
\ No newline at end of file
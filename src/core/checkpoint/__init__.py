@@ -0,0 +1,3 @@
+from .store import CheckpointStore, open_checkpoint
+
+__all__ = ['CheckpointStore', 'open_checkpoint']
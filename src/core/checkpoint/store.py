@@ -0,0 +1,179 @@
+import json
+import os
+import re
+import time
+
+from config.app_config import CHECKPOINT_CONFIG
+from utils.logger import Logger
+
+
+def _apply(state: dict, entry: dict, limits: dict):
+    """把一条日志应用到状态上"""
+    if entry.get('set'):
+        state.update(entry['set'])
+    for field, values in (entry.get('extend') or {}).items():
+        items = state.get(field)
+        if not isinstance(items, list):
+            items = state[field] = []
+        items.extend(values)
+        limit = limits.get(field)
+        if limit and len(items) > limit:
+            del items[:-limit]
+
+
+class CheckpointStore:
+    """任务进度检查点
+
+    由两个文件组成：
+    - <name>.json：完整状态的快照，先写临时文件再 os.replace，崩溃时不会留下半个文件
+    - <name>.journal：快照之后的增量修改，每次只追加一行，开销很小
+
+    增量日志积累到一定时间后合并成新的快照并清空。每条日志带有递增的序号，
+    快照替换完成但日志还没清空时崩溃，重新加载时会跳过已经合并进快照的日志。
+    """
+
+    def __init__(self, path: str, interval: float = 30, limits: dict = None):
+        """初始化
+
+        Args:
+            path: 快照文件路径，日志文件为同名的 .journal 文件
+            interval: 合并快照的间隔（秒）
+            limits: 可选，列表字段 -> 最多保留的条数
+        """
+        self.path = path
+        self.journal_path = os.path.splitext(path)[0] + '.journal'
+        self.interval = interval
+        self.limits = dict(limits or {})
+        self.state = {}
+        self.seq = 0
+        self.saved_at = None
+        self._journal = None
+        self._compacted_at = time.monotonic()
+
+    def load(self, max_age: float = None):
+        """读取快照并重放增量日志
+
+        Args:
+            max_age: 可选，最后一次写入距今超过该秒数时视为过期，丢弃检查点
+
+        Returns:
+            dict: 恢复出的状态，没有检查点或已过期时返回 None
+        """
+        state, seq, updated_at = None, 0, None
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                snapshot = json.load(file)
+            state, seq, updated_at = snapshot['state'], snapshot['seq'], snapshot['saved_at']
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError) as e:
+            Logger.warn(f'检查点快照损坏，忽略: {self.path} ({e})')
+
+        try:
+            with open(self.journal_path, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # 崩溃时最后一行可能只写了一半
+                    if entry['seq'] <= seq:
+                        continue
+                    if state is None:
+                        state = {}
+                    _apply(state, entry, self.limits)
+                    seq, updated_at = entry['seq'], entry['at']
+        except FileNotFoundError:
+            pass
+
+        if state is None:
+            return None
+        if max_age is not None and time.time() - updated_at > max_age:
+            Logger.info(f'检查点已过期（{(time.time() - updated_at) / 60:.0f} 分钟前），从头开始')
+            self.clear()
+            return None
+        self.state, self.seq, self.saved_at = state, seq, updated_at
+        return state
+
+    def record(self, fields: dict = None, extend: dict = None):
+        """追加一条增量修改
+
+        Args:
+            fields: 可选，直接覆盖的字段
+            extend: 可选，列表字段 -> 追加的值列表
+        """
+        self.seq += 1
+        entry = {'seq': self.seq, 'at': time.time()}
+        if fields:
+            entry['set'] = fields
+        if extend:
+            entry['extend'] = extend
+        _apply(self.state, entry, self.limits)
+        if self._journal is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.journal_path)), exist_ok=True)
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._journal.flush()
+
+    def due(self) -> bool:
+        """是否到了合并快照的时间"""
+        return time.monotonic() - self._compacted_at >= self.interval
+
+    def save(self, state: dict = None):
+        """原子地写入完整快照，并清空增量日志
+
+        Args:
+            state: 可选，完整状态，默认使用由日志累积的状态
+        """
+        if state is not None:
+            self.state = state
+        self.saved_at = time.time()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'seq': self.seq, 'saved_at': self.saved_at, 'state': self.state}, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.path)
+
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, 'w', encoding='utf-8')
+        self._compacted_at = time.monotonic()
+
+    def clear(self):
+        """删除检查点"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        for path in (self.path, self.journal_path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.state, self.seq, self.saved_at = {}, 0, None
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+def open_checkpoint(name: str, limits: dict = None, config=None):
+    """按配置打开检查点
+
+    Args:
+        name: 检查点名称，例如 设备标识-任务类名
+        limits: 可选，列表字段 -> 最多保留的条数
+        config: 可选，覆盖 CHECKPOINT_CONFIG 中的配置
+
+    Returns:
+        CheckpointStore: 检查点，未启用时返回 None
+    """
+    settings = dict(CHECKPOINT_CONFIG)
+    if config:
+        settings.update(config)
+    if not settings['enabled']:
+        return None
+    filename = re.sub(r'[^\w.-]+', '_', name) + '.json'
+    return CheckpointStore(os.path.join(settings['directory'], filename), settings['interval'], limits)
@@ -0,0 +1,9 @@
+from .budget import (
+    Budget, DeadlineExceeded, bind_device, budget, remaining, expired, check, budget_stats, log_budget_stats,
+)
+from .wait import wait_until
+
+__all__ = [
+    'Budget', 'DeadlineExceeded', 'bind_device', 'budget', 'remaining', 'expired', 'check', 'budget_stats',
+    'log_budget_stats', 'wait_until',
+]
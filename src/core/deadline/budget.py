@@ -0,0 +1,160 @@
+import contextvars
+import time
+
+from config.app_config import DEADLINE_CONFIG
+from utils.logger import Logger
+from core.metrics.device import REGISTRY
+
+_deadline = contextvars.ContextVar('deadline', default=None)
+_device = contextvars.ContextVar('deadline_device', default='default')
+
+BUDGET_EXCEEDED = REGISTRY.counter('xianyu_budget_exceeded_total', '阶段耗时超出预算的次数', ('device', 'phase'))
+
+
+class DeadlineExceeded(TimeoutError):
+    """当前阶段的时间预算已经用完"""
+    pass
+
+
+class _NullBudget:
+    """没有配置预算时使用，不改变当前截止时间"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+_NULL_BUDGET = _NullBudget()
+
+# 阶段名 -> [次数, 超出次数, 最长耗时]
+_stats = {}
+
+
+class Budget:
+    """一个阶段的时间预算
+
+    进入时把截止时间设为 min(外层截止时间, 现在 + 预算)，通过 contextvars 传给其中所有的
+    页面对象调用；各处的等待只使用剩余时间，不再各自按固定超时累加。
+    """
+
+    __slots__ = ('name', 'seconds', 'deadline', 'start', '_token')
+
+    def __init__(self, name: str, seconds: float):
+        self.name = name
+        self.seconds = seconds
+
+    def __enter__(self):
+        self.start = time.monotonic()
+        parent = _deadline.get()
+        own = self.start + self.seconds
+        self.deadline = own if parent is None else min(parent, own)
+        self._token = _deadline.set(self.deadline)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        _deadline.reset(self._token)
+        elapsed = time.monotonic() - self.start
+        stats = _stats.get(self.name)
+        if stats is None:
+            stats = _stats[self.name] = [0, 0, 0.0]
+        stats[0] += 1
+        stats[2] = max(stats[2], elapsed)
+        # 只统计超出自己预算的阶段，外层预算用完导致的提前结束不算在内
+        if elapsed > self.seconds + DEADLINE_CONFIG['overrun_grace']:
+            stats[1] += 1
+            BUDGET_EXCEEDED.labels(_device.get(), self.name).inc()
+            Logger.warn(f'阶段 {self.name} 超出预算: {elapsed:.1f} 秒 / {self.seconds:.1f} 秒')
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        return self.__exit__(exc_type, exc, traceback)
+
+
+def bind_device(device_id: str):
+    """设置当前上下文的设备标识，超出预算的计数按设备区分
+
+    之后在当前上下文中创建的协程任务都会继承该设备标识，多台设备在同一进程中运行时互不影响。
+
+    Args:
+        device_id: 设备标识，与其他设备指标的 device 标签相同
+    """
+    _device.set(device_id)
+
+
+def budget(name: str, seconds: float = None):
+    """创建阶段预算
+
+    用法：
+        with budget('get_item_container'):
+            container = await home_page.get_item_container()
+
+    Args:
+        name: 阶段名
+        seconds: 可选，预算（秒），默认使用 DEADLINE_CONFIG['budgets'][name]
+
+    Returns:
+        预算上下文，未启用或没有配置该阶段时不限制
+    """
+    if not DEADLINE_CONFIG['enabled']:
+        return _NULL_BUDGET
+    if seconds is None:
+        seconds = DEADLINE_CONFIG['budgets'].get(name)
+    if seconds is None:
+        return _NULL_BUDGET
+    return Budget(name, seconds)
+
+
+def remaining(default: float = None):
+    """当前阶段剩余的时间
+
+    Args:
+        default: 可选，调用方原来的超时时间，返回值不超过它
+
+    Returns:
+        float: 剩余秒数（不小于 0）；没有预算时返回 default
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return default
+    left = max(0.0, deadline - time.monotonic())
+    return left if default is None else min(default, left)
+
+
+def expired() -> bool:
+    """当前阶段的预算是否已经用完"""
+    deadline = _deadline.get()
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def check():
+    """预算用完时抛出 DeadlineExceeded，用于长循环中途退出"""
+    if expired():
+        raise DeadlineExceeded('阶段预算已用完')
+
+
+def budget_stats() -> dict:
+    """各阶段的执行次数、超出预算次数和最长耗时"""
+    return {
+        name: {'count': count, 'exceeded': exceeded, 'max_seconds': round(longest, 3)}
+        for name, (count, exceeded, longest) in _stats.items()
+    }
+
+
+def log_budget_stats():
+    """在日志中输出超出过预算的阶段"""
+    for name, stats in budget_stats().items():
+        if stats['exceeded']:
+            Logger.warn(
+                f"阶段 {name}: {stats['count']} 次中超出预算 {stats['exceeded']} 次，最长 {stats['max_seconds']:.1f} 秒"
+            )
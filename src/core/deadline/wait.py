@@ -0,0 +1,38 @@
+import time
+
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+from core import tracing
+from .budget import remaining
+
+# 轮询时视为"条件暂未满足"的异常
+_IGNORED_EXCEPTIONS = (NoSuchElementException, StaleElementReferenceException)
+
+
+async def wait_until(condition, timeout: float, poll: float = 0.25, name: str = 'poll_wait'):
+    """轮询等待条件成立
+
+    代替 WebDriverWait：两次检查之间用 asyncio 等待而不是 time.sleep，不会阻塞事件循环，
+    停止任务时可以立即取消；超时时间同样受当前阶段预算限制。
+
+    Args:
+        condition: 无参函数，返回真值时结束等待，抛出找不到元素的异常视为暂未满足
+        timeout: 超时时间（秒）
+        poll: 检查间隔（秒）
+        name: 等待在追踪中显示的名称
+
+    Returns:
+        condition 的返回值，超时返回 None
+    """
+    end = time.monotonic() + remaining(timeout)
+    while True:
+        try:
+            result = condition()
+            if result:
+                return result
+        except _IGNORED_EXCEPTIONS:
+            pass
+        left = end - time.monotonic()
+        if left <= 0:
+            return None
+        await tracing.sleep(min(poll, left), name)
@@ -0,0 +1,7 @@
+from .simhash import simhash, hamming_distance, SimHashIndex
+from .deduper import DedupResult, ListingDeduper, create_deduper
+
+__all__ = [
+    'simhash', 'hamming_distance', 'SimHashIndex',
+    'DedupResult', 'ListingDeduper', 'create_deduper',
+]
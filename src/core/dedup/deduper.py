@@ -0,0 +1,97 @@
+from config.app_config import DEDUP_CONFIG
+from utils.logger import Logger
+from .simhash import simhash, SimHashIndex
+
+
+class DedupResult:
+    """去重结果"""
+
+    __slots__ = ('canonical_id', 'duplicate', 'distance')
+
+    def __init__(self, canonical_id: str, duplicate: bool, distance=None):
+        self.canonical_id = canonical_id
+        self.duplicate = duplicate
+        self.distance = distance
+
+    def __bool__(self):
+        return self.duplicate
+
+    def __repr__(self):
+        return f'DedupResult(canonical_id={self.canonical_id!r}, duplicate={self.duplicate!r}, distance={self.distance!r})'
+
+
+class ListingDeduper:
+    """重复发布商品识别
+
+    同一个卖家反复发布同一件商品时，标题只会略作修改。列表卡片在点击前按标题指纹判断，
+    详情页按标题和描述的指纹判断，重复的商品归并到第一次看到的规范商品上，
+    避免重复进入详情页。
+    """
+
+    def __init__(self, capacity: int = 1000000, max_distance: int = 3):
+        """初始化
+
+        Args:
+            capacity: 卡片和详情各自最多保存的指纹数量
+            max_distance: 视为重复的最大海明距离
+        """
+        self._cards = SimHashIndex(capacity, max_distance)
+        self._details = SimHashIndex(capacity, max_distance)
+
+    @staticmethod
+    def _result(canonical, distance):
+        return DedupResult(f'{canonical:016x}', distance is not None, distance)
+
+    def check_card(self, title: str, price: str = '') -> DedupResult:
+        """判断列表卡片是否为已见商品的重复发布
+
+        Args:
+            title: 卡片标题
+            price: 卡片价格文本，可选
+
+        Returns:
+            DedupResult: 去重结果，duplicate 为 True 时可以跳过点击
+        """
+        fingerprint = simhash(f'{title} {price}' if price else title)
+        canonical, distance = self._cards.check(fingerprint)
+        return self._result(canonical, distance)
+
+    def check_detail(self, record) -> DedupResult:
+        """判断详情页商品是否为已见商品的重复发布
+
+        Args:
+            record: ListingRecord 或包含 title、description 字段的字典
+
+        Returns:
+            DedupResult: 去重结果
+        """
+        if isinstance(record, dict):
+            text = f"{record.get('title', '')} {record.get('description', '')}"
+        else:
+            text = f'{record.title} {record.description}'
+        fingerprint = simhash(text)
+        canonical, distance = self._details.check(fingerprint)
+        return self._result(canonical, distance)
+
+    def clear(self):
+        """清空所有指纹"""
+        self._cards.clear()
+        self._details.clear()
+
+
+def create_deduper(config=None):
+    """按配置创建重复发布识别
+
+    Args:
+        config: 可选，覆盖 DEDUP_CONFIG 中的配置
+
+    Returns:
+        ListingDeduper: 去重实例，未启用时返回 None
+    """
+    settings = dict(DEDUP_CONFIG)
+    if config:
+        settings.update(config)
+    if not settings['enabled']:
+        return None
+    Logger.debug(f"启用重复发布识别，最大海明距离 {settings['max_distance']}")
+    return ListingDeduper(settings['capacity'], settings['max_distance'])
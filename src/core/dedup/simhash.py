@@ -0,0 +1,175 @@
+from array import array
+import hashlib
+
+from core.matching import normalize
+
+FINGERPRINT_BITS = 64
+_MASK = (1 << FINGERPRINT_BITS) - 1
+
+
+def _features(text: str, size: int = 2):
+    """切分字符 n-gram 作为特征，重复的片段按出现次数计权"""
+    if len(text) <= size:
+        return [text] if text else []
+    return [text[i:i + size] for i in range(len(text) - size + 1)]
+
+
+def simhash(text) -> int:
+    """计算文本的 64 位 SimHash 指纹
+
+    文本先归一化（全半角、大小写、繁简、分隔符），再按字符二元组计算，
+    只改动少量字词的标题得到的指纹只相差几个比特。
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        int: 64 位指纹，空文本返回 0
+    """
+    features = _features(normalize(text))
+    if not features:
+        return 0
+
+    hashes = [
+        int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+        for feature in features
+    ]
+    # 按比特位并行计数：counters[k] 保存每一位计数的第 k 个二进制位，
+    # 每个哈希只需几次整数位运算，不用逐位累加
+    counters = []
+    for value in hashes:
+        carry = value
+        for level, counter in enumerate(counters):
+            counters[level] = counter ^ carry
+            carry &= counter
+            if not carry:
+                break
+        if carry:
+            counters.append(carry)
+
+    # 同样按位并行比较，得到计数超过半数的比特
+    half = len(hashes) // 2
+    greater, equal = 0, _MASK
+    for level in range(len(counters) - 1, -1, -1):
+        counter = counters[level]
+        if (half >> level) & 1:
+            equal &= counter
+        else:
+            greater |= equal & counter
+            equal &= ~counter
+    return greater
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """计算两个指纹不同的比特数"""
+    return bin((a ^ b) & _MASK).count('1')
+
+
+class SimHashIndex:
+    """SimHash 近似重复索引
+
+    指纹按比特切成若干段（band），每段作为一个哈希桶的键。海明距离不超过
+    bands - 1 的两个指纹至少有一段完全相同，因此查询只需比对同桶的候选。
+
+    指纹保存在定长环形缓冲区里，写满后覆盖最早的记录，同时从桶中移除；
+    桶使用紧凑的整数数组，百万级指纹也只占几十 MB 内存。
+    """
+
+    def __init__(self, capacity: int = 1000000, max_distance: int = 3):
+        """初始化索引
+
+        Args:
+            capacity: 最多保存的指纹数量
+            max_distance: 视为重复的最大海明距离
+        """
+        self.capacity = capacity
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self._band_bits = FINGERPRINT_BITS // self.bands
+        self._band_mask = (1 << self._band_bits) - 1
+        self._fingerprints = array('Q')  # 位置 -> 指纹
+        self._canonical = array('Q')  # 位置 -> 规范指纹（首次出现的那条）
+        self._buckets = {}  # (段号, 段值) -> 位置数组
+        self._next = 0
+
+    def __len__(self):
+        return len(self._fingerprints)
+
+    def _keys(self, fingerprint):
+        for band in range(self.bands):
+            yield (band, (fingerprint >> (band * self._band_bits)) & self._band_mask)
+
+    def find(self, fingerprint: int):
+        """查找最相近的已有指纹
+
+        Args:
+            fingerprint: 待查询的指纹
+
+        Returns:
+            tuple: (规范指纹, 海明距离)，没有足够相近的指纹时返回 (None, None)
+        """
+        best_slot, best_distance = None, self.max_distance + 1
+        for key in self._keys(fingerprint):
+            for slot in self._buckets.get(key, ()):
+                distance = hamming_distance(fingerprint, self._fingerprints[slot])
+                if distance < best_distance:
+                    best_slot, best_distance = slot, distance
+                    if distance == 0:
+                        return self._canonical[slot], 0
+        if best_slot is None:
+            return None, None
+        return self._canonical[best_slot], best_distance
+
+    def add(self, fingerprint: int, canonical: int = None):
+        """加入一个指纹，容量已满时覆盖最早的记录
+
+        Args:
+            fingerprint: 指纹
+            canonical: 所属的规范指纹，默认为自身
+        """
+        canonical = fingerprint if canonical is None else canonical
+        slot = self._next
+        self._next = (self._next + 1) % self.capacity
+
+        if slot < len(self._fingerprints):
+            for key in self._keys(self._fingerprints[slot]):
+                bucket = self._buckets[key]
+                bucket.remove(slot)
+                if not bucket:
+                    del self._buckets[key]
+            self._fingerprints[slot] = fingerprint
+            self._canonical[slot] = canonical
+        else:
+            self._fingerprints.append(fingerprint)
+            self._canonical.append(canonical)
+
+        for key in self._keys(fingerprint):
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = array('I')
+            bucket.append(slot)
+
+    def check(self, fingerprint: int):
+        """查询并登记指纹
+
+        Args:
+            fingerprint: 指纹
+
+        Returns:
+            tuple: (规范指纹, 海明距离)，新指纹返回 (自身, None)
+        """
+        canonical, distance = self.find(fingerprint)
+        if canonical is None:
+            self.add(fingerprint)
+            return fingerprint, None
+        # 稍有改动的副本也登记进来，标题逐次小改时仍能追溯到同一规范商品
+        if distance:
+            self.add(fingerprint, canonical)
+        return canonical, distance
+
+    def clear(self):
+        """清空索引"""
+        self._fingerprints = array('Q')
+        self._canonical = array('Q')
+        self._buckets.clear()
+        self._next = 0
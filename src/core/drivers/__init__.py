@@ -0,0 +1,7 @@
+from .replay import HierarchyDriver, ReplayDriver, ReplayElement, compile_xpath
+from .session import appium_url, create_driver, create_page_factory
+
+__all__ = [
+    'HierarchyDriver', 'ReplayDriver', 'ReplayElement', 'compile_xpath',
+    'appium_url', 'create_driver', 'create_page_factory',
+]
@@ -0,0 +1,49 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+from utils.logger import Logger
+
+
+async def record_frames(driver, path: str, interval: float = 1.0, duration: float = None, max_frames: int = None):
+    """录制页面层级，供 ReplayDriver 回放
+
+    定期读取 page_source，页面没有变化时不重复保存。输出为 JSONL，每行包含 time 和 page_source 字段，
+    可以直接传给 ReplayDriver.from_path 或 FLEET_CONFIG['devices'] 中的 replay。
+
+    Args:
+        driver: Appium WebDriver 实例
+        path: 输出文件路径
+        interval: 读取间隔（秒）
+        duration: 可选，录制时长（秒），为 None 时一直录制到任务被取消
+        max_frames: 可选，最多保存的帧数
+
+    Returns:
+        int: 保存的帧数
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    end = time.monotonic() + duration if duration else None
+    last_digest = None
+    frames = 0
+    with open(path, 'a', encoding='utf-8') as file:
+        try:
+            while end is None or time.monotonic() < end:
+                source = driver.page_source
+                digest = hashlib.sha1(source.encode('utf-8')).digest()
+                if digest != last_digest:
+                    last_digest = digest
+                    file.write(json.dumps({'time': time.time(), 'page_source': source}, ensure_ascii=False) + '\n')
+                    file.flush()
+                    frames += 1
+                    Logger.debug(f'已录制 {frames} 帧')
+                    if max_frames and frames >= max_frames:
+                        break
+                await asyncio.sleep(interval)
+        finally:
+            Logger.info(f'录制结束，共 {frames} 帧: {path}')
+    return frames
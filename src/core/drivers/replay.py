@@ -0,0 +1,284 @@
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from collections import deque
+
+from selenium.common.exceptions import NoSuchElementException
+
+from core.snapshot.hierarchy import parse_bounds
+
+# 只支持本项目定位器用到的 XPath 子集：
+#   //*[@content-desc='扫一扫']
+#   //android.view.View[@content-desc='我想要, 我想要']
+#   //*[@text='筛选' or @content-desc='筛选']
+#   //*[starts-with(@content-desc,'收藏')]、contains(...)、//*[@content-desc]
+_XPATH_PATTERN = re.compile(r'^//([\w.*]+)(?:\[(.*)\])?$')
+_CONDITION_PATTERN = re.compile(
+    r"^\s*(?:@([\w-]+)\s*=\s*'([^']*)'|@([\w-]+)|(starts-with|contains)\(\s*@([\w-]+)\s*,\s*'([^']*)'\s*\))\s*$"
+)
+
+
+def _compile_condition(text):
+    match = _CONDITION_PATTERN.match(text)
+    if not match:
+        raise ValueError(f'不支持的 XPath 条件: {text}')
+    equal_name, equal_value, exists_name, function, function_name, function_value = match.groups()
+    if equal_name:
+        return lambda element: element.get(equal_name) == equal_value
+    if exists_name:
+        return lambda element: element.get(exists_name) is not None
+    if function == 'starts-with':
+        return lambda element: (element.get(function_name) or '').startswith(function_value)
+    return lambda element: function_value in (element.get(function_name) or '')
+
+
+def compile_xpath(xpath: str):
+    """把 XPath 编译为元素过滤函数
+
+    Args:
+        xpath: XPath 表达式
+
+    Returns:
+        callable: 接收 ElementTree 元素，返回是否匹配
+
+    Raises:
+        ValueError: 表达式超出支持范围
+    """
+    match = _XPATH_PATTERN.match(xpath.strip())
+    if not match:
+        raise ValueError(f'不支持的 XPath: {xpath}')
+    tag, predicate = match.groups()
+
+    groups = []
+    for alternative in re.split(r'\s+or\s+', predicate or ''):
+        if alternative.strip():
+            groups.append([_compile_condition(part) for part in re.split(r'\s+and\s+', alternative)])
+
+    def matches(element):
+        if tag != '*' and (element.get('class') or element.tag) != tag:
+            return False
+        if not groups:
+            return True
+        return any(all(condition(element) for condition in group) for group in groups)
+    return matches
+
+
+class ReplayElement:
+    """回放页面中的元素，接口与 Appium WebElement 的常用部分一致"""
+
+    def __init__(self, driver, node):
+        self._driver = driver
+        self._node = node
+
+    @property
+    def text(self):
+        return self._node.get('text') or ''
+
+    @property
+    def rect(self):
+        left, top, right, bottom = parse_bounds(self._node.get('bounds')) or (0, 0, 0, 0)
+        return {'x': left, 'y': top, 'width': right - left, 'height': bottom - top}
+
+    @property
+    def location(self):
+        rect = self.rect
+        return {'x': rect['x'], 'y': rect['y']}
+
+    @property
+    def size(self):
+        rect = self.rect
+        return {'width': rect['width'], 'height': rect['height']}
+
+    def get_attribute(self, name):
+        if name == 'contentDescription':
+            name = 'content-desc'
+        elif name == 'resourceId':
+            name = 'resource-id'
+        return self._node.get(name)
+
+    def is_displayed(self):
+        return self._node.get('displayed', 'true') == 'true'
+
+    def click(self):
+        self._driver.click(self)
+
+    def find_element(self, by, value):
+        return self._driver._find(by, value, self._node, single=True)
+
+    def find_elements(self, by, value):
+        return self._driver._find(by, value, self._node)
+
+
+class HierarchyDriver:
+    """基于页面层级 XML 的驱动基类
+
+    实现 Appium WebDriver 中本项目用到的查找、滑动、设置等接口，子类只需要提供当前页面的
+    层级（_tree）并处理页面切换（advance、click）。
+    """
+
+    element_class = ReplayElement
+
+    def __init__(self, window_size=(1080, 2400)):
+        self.window_size = window_size
+        self.actions = deque(maxlen=200)  # 最近收到的操作，便于检查，长时间运行时不会无限增长
+        self.action_count = 0  # 收到的操作总数
+        self.settings = {}  # 通过 update_settings 设置的 Appium 设置
+        self._compiled = {}
+
+    @property
+    def page_source(self):
+        return ET.tostring(self._tree(), encoding='unicode')
+
+    def _tree(self):
+        raise NotImplementedError
+
+    def advance(self):
+        """点击、滑动、返回等操作后切换页面"""
+
+    def _record(self, *action):
+        self.actions.append(action)
+        self.action_count += 1
+
+    def click(self, element):
+        """点击元素"""
+        self._record('click', element._node.get('bounds'))
+        self.advance()
+
+    def _matcher(self, by, value):
+        key = (by, value)
+        if key not in self._compiled:
+            if by == 'xpath':
+                self._compiled[key] = compile_xpath(value)
+            elif by == 'id':
+                self._compiled[key] = lambda element: (
+                    (element.get('resource-id') or '') == value
+                    or (element.get('resource-id') or '').endswith(f':id/{value}')
+                )
+            elif by == 'class name':
+                self._compiled[key] = lambda element: (element.get('class') or element.tag) == value
+            elif by == 'accessibility id':
+                self._compiled[key] = lambda element: element.get('content-desc') == value
+            else:
+                raise ValueError(f'不支持的定位方式: {by}')
+        return self._compiled[key]
+
+    def _find(self, by, value, root=None, single=False):
+        matcher = self._matcher(by, value)
+        root = self._tree() if root is None else root
+        elements = [self.element_class(self, node) for node in root.iter() if node is not root and matcher(node)]
+        if single:
+            if not elements:
+                raise NoSuchElementException(f'{by}={value}')
+            return elements[0]
+        return elements
+
+    def find_element(self, by, value):
+        return self._find(by, value, single=True)
+
+    def find_elements(self, by, value):
+        return self._find(by, value)
+
+    def get_window_size(self):
+        width, height = self.window_size
+        return {'width': width, 'height': height}
+
+    def swipe(self, start_x, start_y, end_x, end_y, duration=None):
+        self._record('swipe', start_x, start_y, end_x, end_y)
+        self.advance()
+
+    def back(self):
+        self._record('back')
+        self.advance()
+
+    def press_keycode(self, keycode):
+        self._record('keycode', keycode)
+
+    def execute_script(self, script, *args):
+        self._record('script', script)
+        return None
+
+    def activate_app(self, package):
+        self._record('activate', package)
+
+    def terminate_app(self, package):
+        self._record('terminate', package)
+        return True
+
+    def update_settings(self, settings):
+        self.settings.update(settings)
+
+    def get_settings(self):
+        return dict(self.settings)
+
+    def get_screenshot_as_file(self, path):
+        return False
+
+    def quit(self):
+        self._record('quit')
+
+
+class ReplayDriver(HierarchyDriver):
+    """回放驱动
+
+    按顺序回放录制好的 page_source，不需要真实设备，用于在本地复现问题和测试
+    多进程等与设备无关的逻辑。点击、滑动、返回等操作会切换到下一帧，
+    回放到最后一帧后从头循环。
+    """
+
+    def __init__(self, frames, window_size=(1080, 2400), loop=True):
+        """初始化
+
+        Args:
+            frames: page_source XML 字符串列表
+            window_size: (宽, 高) 屏幕尺寸
+            loop: 回放到最后一帧后是否从头循环
+        """
+        if not frames:
+            raise ValueError('回放帧不能为空')
+        super().__init__(window_size)
+        self.frames = list(frames)
+        self.loop = loop
+        self.position = 0
+        self._root = None
+
+    @classmethod
+    def from_path(cls, path, **kwargs):
+        """从录制文件创建回放驱动
+
+        Args:
+            path: 目录（按文件名顺序读取其中的 .xml 文件），
+                或 JSONL 文件（每行包含 page_source 字段）
+
+        Returns:
+            ReplayDriver: 回放驱动
+        """
+        frames = []
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.xml'):
+                    with open(os.path.join(path, name), encoding='utf-8') as file:
+                        frames.append(file.read())
+        else:
+            with open(path, encoding='utf-8') as file:
+                for line in file:
+                    if line.strip():
+                        frames.append(json.loads(line)['page_source'])
+        return cls(frames, **kwargs)
+
+    @property
+    def page_source(self):
+        return self.frames[self.position]
+
+    def _tree(self):
+        if self._root is None:
+            self._root = ET.fromstring(self.page_source)
+        return self._root
+
+    def advance(self):
+        """切换到下一帧"""
+        if self.position + 1 < len(self.frames):
+            self.position += 1
+        elif self.loop:
+            self.position = 0
+        self._root = None
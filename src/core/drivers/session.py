@@ -0,0 +1,69 @@
+import os
+
+from config.app_config import XIANYU_PACKAGE, XIANYU_ACTIVITY, APPIUM_CONFIG
+
+
+def appium_url(device: dict = None) -> str:
+    """Appium 服务器地址
+
+    优先使用设备配置中的 appium_url，其次是环境变量 APPIUM_HOST、APPIUM_PORT，最后是 APPIUM_CONFIG。
+    """
+    if device and device.get('appium_url'):
+        return device['appium_url']
+    host = os.getenv('APPIUM_HOST', APPIUM_CONFIG['host'])
+    port = int(os.getenv('APPIUM_PORT', APPIUM_CONFIG['port']))
+    return f'http://{host}:{port}'
+
+
+def create_driver(device: dict = None, launch_app: bool = True):
+    """创建驱动，所有入口共用
+
+    Appium 在这里才导入，不需要设备的命令不会加载它。
+
+    Args:
+        device: 可选，设备配置，包含 udid、system_port、appium_url、replay 或 simulate，格式同 FLEET_CONFIG['devices']
+        launch_app: 是否启动闲鱼，为 False 时只连接设备，不切换当前应用
+
+    Returns:
+        WebDriver: Appium 驱动，配置了 replay 时返回 ReplayDriver，配置了 simulate 时返回 SimulatedDriver
+    """
+    device = device or {}
+    if device.get('replay'):
+        from .replay import ReplayDriver
+        return ReplayDriver.from_path(device['replay'])
+    if device.get('simulate'):
+        from core.simulator import SimulatedDriver
+        # simulate 为 True 时使用 SIMULATOR_CONFIG，为字典时覆盖其中的配置
+        config = device['simulate'] if isinstance(device['simulate'], dict) else None
+        return SimulatedDriver(device.get('id') or 'sim', config)
+
+    from appium import webdriver
+    from appium.options.common.base import AppiumOptions
+
+    options = AppiumOptions()
+    for key, value in APPIUM_CONFIG['capabilities'].items():
+        options.set_capability(key, value)
+    if launch_app:
+        options.set_capability('appPackage', XIANYU_PACKAGE)
+        options.set_capability('appActivity', XIANYU_ACTIVITY)
+    if device.get('udid'):
+        options.set_capability('udid', device['udid'])
+    # 同一台 Appium 服务器驱动多台设备时，每台设备需要不同的 systemPort
+    if device.get('system_port'):
+        options.set_capability('systemPort', device['system_port'])
+
+    return webdriver.Remote(command_executor=appium_url(device), options=options)
+
+
+def create_page_factory(driver):
+    """创建注册了所有页面的页面工厂"""
+    from core.pages.page_factory import PageFactory
+    from core.pages.home_page import HomePage
+    from core.pages.city_service_page import CityServicePage
+    from core.pages.detail_page import DetailPage
+    from core.pages.search_page import SearchPage
+
+    page_factory = PageFactory(driver)
+    for page_class in (HomePage, CityServicePage, DetailPage, SearchPage):
+        page_factory.register_page(page_class, page_class.IDENTIFIERS)
+    return page_factory
@@ -0,0 +1,4 @@
+from .detail import capture_detail_fields
+from .listing import ListingRecord, extract_listing
+
+__all__ = ['capture_detail_fields', 'ListingRecord', 'extract_listing']
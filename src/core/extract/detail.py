@@ -0,0 +1,91 @@
+import re
+
+PRICE_PATTERN = re.compile(r'^[¥￥]\s*(\d+(?:\.\d+)?)')
+NUMBER_PATTERN = re.compile(r'^\d+(?:\.\d+)?$')
+WANT_PATTERN = re.compile(r'(\d+)\s*人想要')
+ORIGINAL_PRICE_PATTERN = re.compile(r'原价\s*[¥￥]?\s*(\d+(?:\.\d+)?)')
+POST_TIME_PATTERN = re.compile(r'(刚刚|\d+\s*(?:秒|分钟|小时|天|周|个月)前|昨天|\d{1,2}月\d{1,2}日)\s*(?:发布)?')
+ITEM_ID_PATTERN = re.compile(r'(?:itemId|id)=(\d{6,})')
+LOCATION_PATTERN = re.compile(r'^(?:发布于|来自)?\s*([\u4e00-\u9fa5]{2,12})$')
+SELLER_HINTS = ('信用', '实名认证', '回复率')
+
+# 详情页文本的最短长度，短于此长度的文本不会被当作商品描述
+MIN_DESCRIPTION_LENGTH = 8
+
+
+def capture_detail_fields(snapshot, fields=None):
+    """从详情页快照中提取商品字段，并合并到已提取的结果中
+
+    详情页需要滑动才能看完，每次滑动后调用一次，逐步补全字段：
+    - title: 商品标题（描述的第一行）
+    - price: 价格文本
+    - description: 商品描述（取看到过的最长文本）
+    - seller: 卖家昵称
+    - want_count: 想要人数
+    - original_price: 原价文本
+    - post_time: 发布时间文本，例如 "3天前"
+    - location: 发布地区
+    - item_id: 商品ID（页面上有分享链接等信息时）
+
+    Args:
+        snapshot: HierarchySnapshot 实例
+        fields: 可选，之前已提取的字段
+
+    Returns:
+        dict: 合并后的字段
+    """
+    fields = fields if fields is not None else {}
+    texts = snapshot.texts()
+
+    for index, text in enumerate(texts):
+        text = text.strip()
+        if not text:
+            continue
+
+        if 'price' not in fields:
+            match = PRICE_PATTERN.match(text)
+            if match:
+                fields['price'] = match.group(1)
+            elif text in ('¥', '￥') and index + 1 < len(texts) and NUMBER_PATTERN.match(texts[index + 1].strip()):
+                fields['price'] = texts[index + 1].strip()
+
+        if 'want_count' not in fields:
+            match = WANT_PATTERN.search(text)
+            if match:
+                fields['want_count'] = int(match.group(1))
+
+        if 'original_price' not in fields:
+            match = ORIGINAL_PRICE_PATTERN.search(text)
+            if match:
+                fields['original_price'] = match.group(1)
+                continue
+
+        if 'post_time' not in fields:
+            match = POST_TIME_PATTERN.search(text)
+            if match and len(text) <= 30:
+                fields['post_time'] = match.group(1)
+                # 发布时间和地区通常在同一行，例如 "3天前发布 · 广东深圳"
+                rest = POST_TIME_PATTERN.sub('', text).strip(' ·|')
+                location = LOCATION_PATTERN.match(rest)
+                if location and 'location' not in fields:
+                    fields['location'] = location.group(1)
+                continue
+
+        if 'item_id' not in fields:
+            match = ITEM_ID_PATTERN.search(text)
+            if match:
+                fields['item_id'] = match.group(1)
+
+        if 'seller' not in fields and index > 0 and any(hint in text for hint in SELLER_HINTS):
+            candidate = texts[index - 1].strip()
+            if candidate and len(candidate) <= 20 and not NUMBER_PATTERN.match(candidate):
+                fields['seller'] = candidate
+
+        if len(text) >= MIN_DESCRIPTION_LENGTH and len(text) > len(fields.get('description', '')):
+            is_post_line = len(text) <= 30 and POST_TIME_PATTERN.search(text)
+            if not WANT_PATTERN.search(text) and not PRICE_PATTERN.match(text) and not is_post_line:
+                fields['description'] = text
+
+    if fields.get('description'):
+        fields['title'] = fields['description'].splitlines()[0][:30]
+    return fields
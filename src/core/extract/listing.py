@@ -0,0 +1,84 @@
+from typing import Optional
+
+from core.seen import item_key
+from .detail import capture_detail_fields
+
+
+def _to_number(value) -> Optional[float]:
+    """把价格文本转换为数字，无法转换时返回 None"""
+    if value is None or value == '':
+        return None
+    try:
+        return float(str(value).replace(',', '').lstrip('¥￥').strip())
+    except ValueError:
+        return None
+
+
+class ListingRecord:
+    """商品记录
+
+    使用 __slots__ 保存详情页提取到的商品信息，内存占用小，便于大量缓存和批量写出。
+    """
+
+    __slots__ = (
+        'item_id', 'title', 'price', 'original_price', 'location',
+        'seller', 'want_count', 'post_time', 'description',
+    )
+
+    def __init__(self, item_id: str, title: str = '', price: Optional[float] = None,
+                 original_price: Optional[float] = None, location: str = '', seller: str = '',
+                 want_count: Optional[int] = None, post_time: str = '', description: str = ''):
+        self.item_id = item_id
+        self.title = title
+        self.price = price
+        self.original_price = original_price
+        self.location = location
+        self.seller = seller
+        self.want_count = want_count
+        self.post_time = post_time
+        self.description = description
+
+    @classmethod
+    def from_fields(cls, fields):
+        """从提取到的字段字典创建商品记录
+
+        页面上没有商品ID时，使用标题和价格生成稳定的标识。
+
+        Args:
+            fields: capture_detail_fields 返回的字段字典
+
+        Returns:
+            ListingRecord: 商品记录
+        """
+        title = fields.get('title', '')
+        price = fields.get('price', '')
+        return cls(
+            item_id=fields.get('item_id') or item_key(title, price),
+            title=title,
+            price=_to_number(price),
+            original_price=_to_number(fields.get('original_price')),
+            location=fields.get('location', ''),
+            seller=fields.get('seller', ''),
+            want_count=fields.get('want_count'),
+            post_time=fields.get('post_time', ''),
+            description=fields.get('description', ''),
+        )
+
+    def to_dict(self):
+        """转换为字典"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f'ListingRecord(item_id={self.item_id!r}, title={self.title!r}, price={self.price!r})'
+
+
+def extract_listing(snapshot) -> ListingRecord:
+    """从一次详情页快照中提取完整的商品记录
+
+    Args:
+        snapshot: HierarchySnapshot 实例
+
+    Returns:
+        ListingRecord: 商品记录
+    """
+    return ListingRecord.from_fields(capture_detail_fields(snapshot))
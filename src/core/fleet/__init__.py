@@ -0,0 +1,7 @@
+from .supervisor import FleetSupervisor, WorkerHandle
+from .worker import QueueSink, create_driver, create_page_factory, run_worker
+
+__all__ = [
+    'FleetSupervisor', 'WorkerHandle',
+    'QueueSink', 'create_driver', 'create_page_factory', 'run_worker',
+]
@@ -0,0 +1,200 @@
+import asyncio
+import multiprocessing
+import queue
+import time
+
+from config.app_config import FLEET_CONFIG
+from utils.logger import Logger
+from core.metrics import REGISTRY
+from core.metrics.device import QUEUE_DEPTH, SESSION_RESTARTS
+from .worker import run_worker
+
+
+class WorkerHandle:
+    """一个设备工作进程的状态"""
+
+    def __init__(self, device: dict):
+        self.device = device
+        self.process = None
+        self.commands = None
+        self.restarts = 0
+        self.next_start = 0.0
+        self.started_at = None
+        self.status = 'pending'
+        self.metrics = {}
+        self.prometheus = None
+
+    @property
+    def device_id(self) -> str:
+        return self.device['id']
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+class FleetSupervisor:
+    """多设备控制进程
+
+    每台设备运行在独立的工作进程中，各自拥有事件循环、驱动和页面工厂，
+    解析、匹配和去重等计算可以分散到多个 CPU 核心。控制进程只负责转发命令、
+    汇总结果和指标，并在工作进程异常退出时按指数退避重启，不影响其他设备。
+    """
+
+    def __init__(self, devices=None, task_id: str = None, sink=None, config=None):
+        """初始化
+
+        Args:
+            devices: 设备配置列表，默认使用 FLEET_CONFIG['devices']
+            task_id: 工作进程运行的任务ID，默认使用 FLEET_CONFIG['task']
+            sink: 可选，ResultSink 实例，汇总所有设备的商品记录
+            config: 可选，覆盖 FLEET_CONFIG 中的配置
+        """
+        self.config = dict(FLEET_CONFIG)
+        if config:
+            self.config.update(config)
+        self.task_id = task_id or self.config['task']
+        self.sink = sink
+        self.workers = [WorkerHandle(device) for device in (devices or self.config['devices'])]
+        self.running = False
+        # 使用 spawn 启动，子进程不继承父进程的事件循环和连接
+        self._context = multiprocessing.get_context('spawn')
+        self._events = self._context.Queue()
+        QUEUE_DEPTH.labels('supervisor', 'events').set_function(self._events.qsize)
+        if self.sink is not None and hasattr(self.sink, 'queue_depth'):
+            QUEUE_DEPTH.labels('supervisor', 'sink').set_function(lambda: self.sink.queue_depth)
+
+    def _spawn(self, worker: WorkerHandle):
+        parent_conn, child_conn = self._context.Pipe()
+        worker.commands = parent_conn
+        worker.process = self._context.Process(
+            target=run_worker,
+            args=(worker.device, self.task_id, child_conn, self._events),
+            name=f'xianyu-worker-{worker.device_id}',
+            daemon=True
+        )
+        worker.process.start()
+        child_conn.close()
+        worker.started_at = time.monotonic()
+        worker.status = 'starting'
+        Logger.info(f'[{worker.device_id}] 工作进程已启动 (pid {worker.process.pid})')
+
+    def _check_workers(self):
+        """检查工作进程，异常退出的按退避时间重启"""
+        now = time.monotonic()
+        for worker in self.workers:
+            if worker.alive or worker.status == 'failed':
+                continue
+            if worker.process is not None:
+                exitcode = worker.process.exitcode
+                worker.process = None
+                # 稳定运行一段时间后退出，重新计算退避
+                if now - worker.started_at > self.config['max_restart_delay']:
+                    worker.restarts = 0
+                if worker.restarts >= self.config['max_restarts']:
+                    worker.status = 'failed'
+                    Logger.error(f'[{worker.device_id}] 工作进程连续重启 {worker.restarts} 次仍然退出，不再重启')
+                    continue
+                delay = min(self.config['restart_delay'] * 2 ** worker.restarts, self.config['max_restart_delay'])
+                worker.restarts += 1
+                SESSION_RESTARTS.labels(worker.device_id, 'worker').inc()
+                worker.next_start = now + delay
+                worker.status = 'restarting'
+                Logger.warn(f'[{worker.device_id}] 工作进程退出 (exitcode {exitcode})，{delay:.0f} 秒后重启')
+            if now >= worker.next_start:
+                self._spawn(worker)
+
+    def _handle_event(self, event):
+        kind, device_id = event[0], event[1]
+        worker = next((item for item in self.workers if item.device_id == device_id), None)
+        if kind == 'result':
+            _, _, record_kind, record = event
+            record.setdefault('device', device_id)
+            if self.sink:
+                self.sink.put(record_kind, record)
+        elif kind == 'metrics' and worker:
+            worker.prometheus = event[2].pop('prometheus', None)
+            worker.metrics = event[2]
+        elif kind == 'status' and worker:
+            worker.status = event[2]
+            Logger.debug(f'[{device_id}] 状态: {event[2]}')
+
+    def _drain_events(self, limit: int = 1000) -> int:
+        count = 0
+        while count < limit:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                break
+            self._handle_event(event)
+            count += 1
+        return count
+
+    def stats(self) -> dict:
+        """各设备的运行状态和最近一次上报的指标"""
+        return {
+            worker.device_id: {
+                'status': worker.status,
+                'pid': worker.process.pid if worker.process else None,
+                'restarts': worker.restarts,
+                'metrics': worker.metrics,
+            }
+            for worker in self.workers
+        }
+
+    def collect_metrics(self) -> list:
+        """控制进程和各工作进程最近一次上报的指标快照，供指标接口导出"""
+        return [REGISTRY.snapshot()] + [worker.prometheus for worker in self.workers if worker.prometheus]
+
+    async def run(self):
+        """启动所有工作进程并持续监控，直到调用 stop"""
+        if not self.workers:
+            Logger.warn('没有配置设备，请在 FLEET_CONFIG 中添加 devices')
+            return
+        self.running = True
+        Logger.info(f'=== 启动 {len(self.workers)} 个设备工作进程 ===')
+        try:
+            while self.running:
+                self._check_workers()
+                if not self._drain_events():
+                    await asyncio.sleep(0.05)
+        finally:
+            await self._shutdown()
+
+    def stop(self):
+        """停止所有工作进程"""
+        self.running = False
+        Logger.info('正在停止所有设备...')
+
+    async def flush_results(self):
+        """立即把已汇总的商品记录写入磁盘"""
+        self._drain_events()
+        if self.sink:
+            await self.sink.flush()
+
+    async def _shutdown(self):
+        for worker in self.workers:
+            if worker.alive:
+                try:
+                    worker.commands.send('stop')
+                except (BrokenPipeError, OSError):
+                    pass
+
+        deadline = time.monotonic() + self.config['stop_timeout'] + 2
+        while any(worker.alive for worker in self.workers) and time.monotonic() < deadline:
+            self._drain_events()
+            await asyncio.sleep(0.1)
+
+        for worker in self.workers:
+            if worker.alive:
+                Logger.warn(f'[{worker.device_id}] 工作进程未按时退出，强制结束')
+                worker.process.terminate()
+            if worker.process is not None:
+                worker.process.join(timeout=1)
+            if worker.commands is not None:
+                worker.commands.close()
+            worker.status = 'stopped'
+        self._drain_events()
+        if self.sink:
+            await self.sink.flush()
+        Logger.info('所有设备已停止')
@@ -0,0 +1,144 @@
+import asyncio
+import os
+import signal
+import socket
+import time
+
+from config.app_config import FLEET_CONFIG, SHUTDOWN_CONFIG
+from core.throttle import get_limiter
+from core.pacing import get_pacer
+from core.tracing import trace_driver, finish_tracing
+from core.deadline import budget_stats, log_budget_stats
+from core.metrics import REGISTRY, get_metrics
+from core.recorder import get_recorder
+from core.signal import bounded, quit_driver
+from core.drivers import create_driver, create_page_factory
+
+# 工作进程与控制进程之间的消息（通过 multiprocessing 队列和管道传递）：
+#   工作进程 -> 控制进程：('result', 设备, 记录类型, 记录)
+#                         ('metrics', 设备, 指标字典)
+#                         ('status', 设备, 状态文本)
+#   控制进程 -> 工作进程：'stop'
+
+
+class QueueSink:
+    """工作进程中的结果输出
+
+    与 ResultSink 接口相同，记录通过队列交给控制进程统一写盘。
+    """
+
+    def __init__(self, events, device_id: str):
+        self.events = events
+        self.device_id = device_id
+        self.count = 0
+
+    def put(self, kind: str, record: dict) -> bool:
+        self.events.put(('result', self.device_id, kind, record))
+        self.count += 1
+        return True
+
+    async def flush(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+async def _send_metrics(events, device_id, sink, task_manager, interval):
+    while True:
+        await asyncio.sleep(interval)
+        metrics = {
+            'pid': os.getpid(),
+            'records': sink.count,
+            'cpu_seconds': time.process_time(),
+        }
+        task = task_manager.current_task
+        if task is not None and callable(getattr(task, 'stats', None)):
+            metrics['task'] = task.stats()
+        metrics['throttle'] = get_limiter(task_manager.driver).stats()
+        metrics['pacing'] = get_pacer(task_manager.driver).report()
+        metrics['budgets'] = budget_stats()
+        metrics['prometheus'] = REGISTRY.snapshot()
+        events.put(('metrics', device_id, metrics))
+
+
+async def _worker_main(device: dict, task_id: str, commands, events):
+    from core.tasks.task_manager import TaskManager
+    from core.dedup import create_deduper
+    from core.seen import create_seen_client
+    from core.jobs import JobWorker, create_job_queue
+
+    device_id = device['id']
+    loop = asyncio.get_running_loop()
+    driver = trace_driver(create_driver(device))
+    get_metrics(driver, device_id)
+    # 限速器要在页面对象创建之前按设备的账号创建
+    limiter = get_limiter(driver, {'account': device['account']} if device.get('account') else None)
+    page_factory = create_page_factory(driver)
+    sink = QueueSink(events, device_id)
+    task_manager = TaskManager(driver, page_factory, sink=sink, dedup=create_deduper(),
+                               seen=await create_seen_client())
+    # 同一账号的设备分布在不同进程中，通过已处理商品服务共享账号限额
+    limiter.account_client = task_manager.seen
+
+    task_id = device.get('task') or task_id
+    job_worker = None
+    if task_id == 'jobs':
+        job_worker = JobWorker(create_job_queue(), task_manager, worker_id=f'{socket.gethostname()}:{device_id}')
+
+    # 控制命令通过管道到达，注册到事件循环上，不占用额外线程
+    stopped = asyncio.Event()
+
+    def on_command():
+        try:
+            command = commands.recv()
+        except EOFError:
+            command = 'stop'
+        if command == 'stop':
+            if job_worker:
+                job_worker.stop()
+            task_manager.stop_current_task()
+            stopped.set()
+    loop.add_reader(commands.fileno(), on_command)
+
+    page_factory.start_observer()
+    metrics_task = asyncio.create_task(
+        _send_metrics(events, device_id, sink, task_manager, FLEET_CONFIG['metrics_interval'])
+    )
+    events.put(('status', device_id, 'running'))
+    try:
+        run_task = asyncio.create_task(job_worker.run() if job_worker else task_manager.run_task(task_id))
+        await asyncio.wait([run_task, asyncio.create_task(stopped.wait())], return_when=asyncio.FIRST_COMPLETED)
+        if not run_task.done():
+            # 直接取消任务，不等当前的浏览、等待结束，只给任务留出清理的时间
+            run_task.cancel()
+            await asyncio.wait([run_task], timeout=SHUTDOWN_CONFIG['task_timeout'])
+        elif run_task.exception():
+            get_recorder(driver).session_lost(f'任务异常退出: {run_task.exception()!r}')
+            raise run_task.exception()
+    finally:
+        loop.remove_reader(commands.fileno())
+        metrics_task.cancel()
+        await bounded(f'[{device_id}] 停止页面观察器', page_factory.stop_observer())
+        if task_manager.seen:
+            await bounded(f'[{device_id}] 关闭去重服务连接', task_manager.seen.close())
+        if job_worker:
+            await bounded(f'[{device_id}] 关闭任务队列', job_worker.queue.close())
+        await quit_driver(driver)
+        finish_tracing(device_id)
+        log_budget_stats()
+        events.put(('status', device_id, 'stopped'))
+
+
+def run_worker(device: dict, task_id: str, commands, events):
+    """工作进程入口，每个设备一个进程，各自拥有事件循环、驱动和页面工厂
+
+    Args:
+        device: 设备配置
+        task_id: 要运行的任务ID
+        commands: 接收控制命令的管道
+        events: 发送结果、指标和状态的队列
+    """
+    # Ctrl+C 会同时发给所有子进程，忽略后由控制进程统一发送停止命令
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_worker_main(device, task_id, commands, events))
@@ -1,35 +1,40 @@
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from datetime import datetime
 import asyncio
-import time
 
 from utils.logger import Logger
 from config.selectors import SELECTORS
+from core.seen import SeenItemStore, item_key
+from core.pages.search_page import SearchPage
+from core.throttle import get_limiter
+from core.tracing import span
+from core.metrics import get_metrics
+from core.recorder import get_recorder
+from core import tracing
+from core.deadline import budget, wait_until
 
 class HomePage:
     def __init__(self, driver):
         self.driver = driver
-        self.processed_items = set()
+        self.processed_items = SeenItemStore(capacity=500)  # 当前屏已处理的卡片位置
+        self.sink = None
+        self.dedup = None
+        self.seen = None
 
     async def wait_for_element(self, by, value: str, timeout: int = 10000):
         """等待元素加载"""
         Logger.debug(f'等待元素加载: {value}')
         try:
-            element = WebDriverWait(self.driver, timeout/1000).until(
-                EC.presence_of_element_located((by, value))
-            )
+            element = await wait_until(lambda: self.driver.find_element(by, value), timeout/1000)
+            if element is None:
+                raise TimeoutException(f'{timeout/1000:.1f} 秒内未找到元素')
             Logger.success(f'元素已加载: {value}')
             return element
         except Exception as error:
             Logger.error(f'等待元素超时: {value}', error)
-            try:
-                screenshot_path = f'error_screenshot_{int(time.time())}.png'
-                self.driver.get_screenshot_as_file(screenshot_path)
-                Logger.info(f'错误截图已保存: {screenshot_path}')
-            except:
-                pass
+            # 只在内存中记一次失败，连续失败时才连同截图写入磁盘
+            get_recorder(self.driver).failure(f'等待元素超时: {value}')
             raise
 
     async def get_item_container(self):
@@ -64,23 +69,32 @@ class HomePage:
 
     async def get_item_title(self, item_element):
         """获取商品标题"""
+        return (await self.get_item_card(item_element))['title']
+
+    async def get_item_card(self, item_element):
+        """读取商品卡片的标题和价格
+
+        Returns:
+            dict: 包含 title、price 字段，没有标题时 title 为空字符串
+        """
         try:
-            Logger.debug('尝试获取商品标题')
-            title_elements = item_element.find_elements(
-                by=AppiumBy.CLASS_NAME, 
-                value=SELECTORS['ITEM_TITLE']['class']
-            )
-            for title_element in title_elements:
-                if title_element.is_displayed():
-                    title = title_element.text
-                    if title:
-                        Logger.success(f'成功获取商品标题: {title}')
-                        return title
-            Logger.warn('未找到有效的商品标题')
-            return ''
+            texts = [
+                element.text for element in item_element.find_elements(
+                    by=AppiumBy.CLASS_NAME,
+                    value=SELECTORS['ITEM_TITLE']['class']
+                ) if element.is_displayed() and element.text
+            ]
+            if not texts:
+                Logger.warn('未找到有效的商品标题')
+                return {'title': '', 'price': ''}
+            Logger.success(f'成功获取商品标题: {texts[0]}')
+            return {
+                'title': texts[0],
+                'price': next((text for text in texts[1:] if SearchPage.PRICE_PATTERN.match(text)), ''),
+            }
         except Exception as error:
             Logger.error('获取商品标题失败', error)
-            return ''
+            return {'title': '', 'price': ''}
 
     async def scroll_page(self):
         """滚动页面"""
@@ -95,55 +109,80 @@ class HomePage:
             end_x = width * 0.5
             end_y = height * 0.3
             
-            self.driver.swipe(start_x, start_y, end_x, end_y, 1000)
+            async with get_limiter(self.driver).action('scroll'):
+                self.driver.swipe(start_x, start_y, end_x, end_y, 1000)
             Logger.success('页面滑动完成')
-            await asyncio.sleep(1.5)
+            await tracing.sleep(1.5, 'wait_load')
             
         except Exception as error:
             Logger.error('页面滑动失败', error)
             raise
 
-    async def browse_items(self, title_matcher, on_item_found=None, should_continue=lambda: True):
+    async def browse_items(self, title_matcher, on_item_found=None, should_continue=lambda: True, sink=None, dedup=None,
+                           seen=None, rules=None):
         """
         浏览商品列表
         
         Args:
-            title_matcher: 标题匹配函数
+            title_matcher: 标题匹配函数，没有配置规则时使用
             on_item_found: 找到匹配商品时的回调函数
             should_continue: 控制是否继续执行的函数
+            sink: 可选，ResultSink 实例，用于保存浏览到的商品
+            dedup: 可选，ListingDeduper 实例，用于跳过重复发布的商品
+            seen: 可选，SeenClient 实例，多个进程共享已处理的商品
+            rules: 可选，RuleSet 实例，配置后每屏商品的标题和价格读取完后一次性评估，代替 title_matcher
         """
+        self.sink = sink
+        self.dedup = dedup
+        self.seen = seen
         try:
             # 等待商品列表加载
-            container = await self.get_item_container()
+            with span('get_item_container'), budget('get_item_container'):
+                container = await self.get_item_container()
             Logger.success('商品列表已加载，开始处理商品')
 
             total_processed = 0
             while should_continue():
                 try:
                     # 获取当前页面的商品
-                    items = await self.get_items(container)
+                    with span('get_items'), budget('get_items'):
+                        items = await self.get_items(container)
                     if not items:
                         Logger.warn('未找到商品，准备滚动页面')
-                        await self.scroll_page()
+                        with span('scroll_page'), budget('scroll_page'):
+                            await self.scroll_page()
                         continue
 
+                    # 先读取当前页面所有新商品的标题和价格，有规则时整屏一次性评估
+                    with span('get_item_title'):
+                        cards = await self._read_cards(items)
+                    if rules:
+                        matches = rules.evaluate([card for _, _, card in cards])
+                    else:
+                        matches = [title_matcher(card['title']) for _, _, card in cards]
+
                     # 处理当前页面的商品
                     found_new_item = False
-                    for item in items:
+                    for (item, bounds, card), matched in zip(cards, matches):
                         if not should_continue():
                             return
-                        processed, total_processed = await self._process_item(
-                            item, 
-                            total_processed, 
-                            title_matcher,
-                            on_item_found
-                        )
+                        # 点击、浏览详情和返回共用一个商品的总预算
+                        with budget('item'):
+                            processed, total_processed = await self._process_item(
+                                item,
+                                bounds,
+                                card,
+                                matched,
+                                total_processed,
+                                on_item_found
+                            )
                         found_new_item = found_new_item or processed
 
                     # 如果当前页面没有新商品，滚动到下一页
                     if not found_new_item:
                         Logger.info('当前页面处理完毕，准备滚动到下一页')
-                        await self.scroll_page()
+                        with span('scroll_page'), budget('scroll_page'):
+                            await self.scroll_page()
                         self.processed_items.clear()
                         Logger.info(f'当前已处理商品数: {total_processed}')
 
@@ -162,30 +201,73 @@ class HomePage:
             Logger.error('浏览商品失败', error)
             raise
 
-    async def _process_item(self, item, total_processed: int, title_matcher, on_item_found=None):
-        """处理单个商品"""
+    async def _read_cards(self, items):
+        """读取当前屏尚未处理的商品卡片
+
+        Returns:
+            list: (商品元素, 位置, 卡片) 列表，卡片包含 title、price 字段
+        """
+        cards = []
+        for item in items:
+            try:
+                bounds = item.get_attribute('bounds')
+                if bounds in self.processed_items or not item.is_displayed():
+                    continue
+                with budget('get_item_title'):
+                    card = await self.get_item_card(item)
+                if card['title']:
+                    cards.append((item, bounds, card))
+            except Exception as error:
+                Logger.error('读取商品卡片时出错', error)
+        return cards
+
+    async def _process_item(self, item, bounds, card, matched, total_processed: int, on_item_found=None):
+        """处理单个商品
+
+        Args:
+            item: 商品元素
+            bounds: 商品元素的位置，用于识别当前屏已处理的商品
+            card: 卡片，包含 title、price 字段
+            matched: 匹配结果，规则名称或 title_matcher 的返回值
+            total_processed: 已处理的商品数
+            on_item_found: 可选，匹配成功时的回调函数
+        """
         try:
-            bounds = item.get_attribute('bounds')
-            if bounds in self.processed_items:
-                return False, total_processed
-            
-            if not item.is_displayed():
-                return False, total_processed
-            
-            title = await self.get_item_title(item)
-            if not title:
-                return False, total_processed
-                
+            title = card['title']
             total_processed += 1
+            metrics = get_metrics(self.driver)
+            metrics.items_scanned.inc()
             Logger.info(f'[{total_processed}] 处理商品: {title}')
             
-            if title_matcher(title):
+            self.processed_items.add(bounds)
+            
+            # 其他进程（设备）已经处理过的商品直接跳过
+            key = item_key(title)
+            if self.seen and not await self.seen.add(key):
+                Logger.info(f'商品已被处理过，跳过: {title}')
+                return True, total_processed
+            
+            # 点击前识别重复发布，重复的商品不再进入详情页
+            duplicate = self.dedup.check_card(title) if self.dedup else None
+            if self.sink:
+                record = {'item_id': key, 'title': title, 'price': card['price'], 'matched': bool(matched)}
+                if duplicate is not None:
+                    record['canonical_id'] = duplicate.canonical_id
+                self.sink.put('card', record)
+            
+            if duplicate:
+                Logger.info(f'跳过重复发布的商品: {title} (规范商品: {duplicate.canonical_id})')
+                return True, total_processed
+            
+            if matched:
+                if isinstance(matched, str):
+                    Logger.success(f'标题匹配成功: {title} (命中规则: {matched})')
+                metrics.matches.inc()
                 Logger.success(f'=== 匹配成功 [{total_processed}] ===')
                 if on_item_found:
                     await on_item_found(item, title)
             
-            self.processed_items.add(bounds)
             return True, total_processed
         except Exception as error:
             Logger.error('处理商品时出错', error)
-            return False, total_processed 
\ No newline at end of file
+            return False, total_processed
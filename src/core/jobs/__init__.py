@@ -0,0 +1,10 @@
+from .job import Job
+from .backends import JobQueue, MemoryJobQueue, SqliteJobQueue
+from .remote import JobServer, RemoteJobQueue, create_job_queue
+from .worker import DedupSink, JobWorker
+
+__all__ = [
+    'Job', 'JobQueue', 'MemoryJobQueue', 'SqliteJobQueue',
+    'JobServer', 'RemoteJobQueue', 'create_job_queue',
+    'DedupSink', 'JobWorker',
+]
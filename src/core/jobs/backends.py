@@ -0,0 +1,254 @@
+from abc import ABC, abstractmethod
+from collections import deque
+import json
+import os
+import sqlite3
+import time
+
+from .job import Job
+
+
+class JobQueue(ABC):
+    """任务队列接口
+
+    工作进程通过租约领取任务：领取后需要在租约到期前发送心跳续约，
+    完成后提交结果。工作进程崩溃或失联时租约过期，任务重新回到队列，
+    由其他工作进程再次执行（至少执行一次）。超过最大尝试次数的任务标记为失败。
+    """
+
+    @abstractmethod
+    async def submit(self, job: Job) -> str:
+        """提交任务，返回任务ID"""
+
+    @abstractmethod
+    async def lease(self, worker_id: str, lease_seconds: float):
+        """领取一个任务
+
+        Returns:
+            Job: 领取到的任务，没有待执行的任务时返回 None
+        """
+
+    @abstractmethod
+    async def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """续约，租约已经不属于该工作进程时返回 False"""
+
+    @abstractmethod
+    async def complete(self, job_id: str, worker_id: str, result=None) -> bool:
+        """提交任务结果，租约已经不属于该工作进程时返回 False"""
+
+    @abstractmethod
+    async def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """报告任务失败，未超过最大尝试次数时重新排队"""
+
+    @abstractmethod
+    async def get(self, job_id: str):
+        """查询任务，不存在时返回 None"""
+
+    @abstractmethod
+    async def stats(self) -> dict:
+        """各状态的任务数量"""
+
+    async def close(self):
+        """释放资源"""
+
+
+class MemoryJobQueue(JobQueue):
+    """进程内任务队列，用于测试和单机运行"""
+
+    def __init__(self, clock=time.time):
+        self._clock = clock
+        self._jobs = {}
+        self._pending = deque()
+
+    def _requeue_expired(self, now):
+        for job in self._jobs.values():
+            if job.status == Job.LEASED and job.lease_expires <= now:
+                self._release(job, 'lease expired')
+
+    def _release(self, job, error):
+        job.owner = None
+        job.lease_expires = None
+        job.error = error
+        if job.attempts >= job.max_attempts:
+            job.status = Job.FAILED
+        else:
+            job.status = Job.PENDING
+            self._pending.append(job.job_id)
+
+    def _owned(self, job_id, worker_id):
+        job = self._jobs.get(job_id)
+        if job is None or job.status != Job.LEASED or job.owner != worker_id:
+            return None
+        return job
+
+    async def submit(self, job: Job) -> str:
+        job.created_at = job.created_at or self._clock()
+        self._jobs[job.job_id] = job
+        self._pending.append(job.job_id)
+        return job.job_id
+
+    async def lease(self, worker_id: str, lease_seconds: float):
+        now = self._clock()
+        self._requeue_expired(now)
+        while self._pending:
+            job = self._jobs[self._pending.popleft()]
+            if job.status != Job.PENDING:
+                continue
+            job.status = Job.LEASED
+            job.owner = worker_id
+            job.lease_expires = now + lease_seconds
+            job.attempts += 1
+            return Job.from_dict(job.to_dict())
+        return None
+
+    async def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        job = self._owned(job_id, worker_id)
+        if job is None:
+            return False
+        job.lease_expires = self._clock() + lease_seconds
+        return True
+
+    async def complete(self, job_id: str, worker_id: str, result=None) -> bool:
+        job = self._owned(job_id, worker_id)
+        if job is None:
+            return False
+        job.status = Job.DONE
+        job.owner = None
+        job.lease_expires = None
+        job.result = result
+        return True
+
+    async def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        job = self._owned(job_id, worker_id)
+        if job is None:
+            return False
+        self._release(job, error)
+        return True
+
+    async def get(self, job_id: str):
+        job = self._jobs.get(job_id)
+        return Job.from_dict(job.to_dict()) if job else None
+
+    async def stats(self) -> dict:
+        self._requeue_expired(self._clock())
+        counts = {Job.PENDING: 0, Job.LEASED: 0, Job.DONE: 0, Job.FAILED: 0}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return counts
+
+
+class SqliteJobQueue(JobQueue):
+    """SQLite 任务队列
+
+    同一台机器上的多个进程可以共享同一个数据库文件，领取任务在写事务中进行，
+    不会重复领取。数据持久化在磁盘上，控制进程重启后任务不会丢失。
+    """
+
+    _COLUMNS = Job.__slots__
+
+    def __init__(self, path: str, clock=time.time):
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._clock = clock
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'job_id TEXT PRIMARY KEY, task_id TEXT, options TEXT, timeout REAL, status TEXT, '
+            'attempts INTEGER, max_attempts INTEGER, owner TEXT, lease_expires REAL, '
+            'created_at REAL, result TEXT, error TEXT)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)')
+
+    def _row_to_job(self, row):
+        data = dict(zip(self._COLUMNS, row))
+        data['options'] = json.loads(data['options'] or '{}')
+        data['result'] = json.loads(data['result']) if data['result'] else None
+        return Job.from_dict(data)
+
+    def _requeue_expired(self, now):
+        self._conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+            "owner = NULL, lease_expires = NULL, error = 'lease expired' "
+            "WHERE status = 'leased' AND lease_expires <= ?",
+            (now,)
+        )
+
+    async def submit(self, job: Job) -> str:
+        job.created_at = job.created_at or self._clock()
+        data = job.to_dict()
+        data['options'] = json.dumps(job.options, ensure_ascii=False)
+        data['result'] = json.dumps(job.result, ensure_ascii=False) if job.result is not None else None
+        self._conn.execute(
+            f"INSERT INTO jobs ({', '.join(self._COLUMNS)}) VALUES ({', '.join('?' * len(self._COLUMNS))})",
+            [data[name] for name in self._COLUMNS]
+        )
+        return job.job_id
+
+    async def lease(self, worker_id: str, lease_seconds: float):
+        now = self._clock()
+        # 写事务保证多个进程不会领取到同一个任务
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._requeue_expired(now)
+            row = self._conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE status = 'pending' "
+                "ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                self._conn.execute('COMMIT')
+                return None
+            job = self._row_to_job(row)
+            job.status = Job.LEASED
+            job.owner = worker_id
+            job.lease_expires = now + lease_seconds
+            job.attempts += 1
+            self._conn.execute(
+                'UPDATE jobs SET status = ?, owner = ?, lease_expires = ?, attempts = ? WHERE job_id = ?',
+                (job.status, job.owner, job.lease_expires, job.attempts, job.job_id)
+            )
+            self._conn.execute('COMMIT')
+            return job
+        except Exception:
+            self._conn.execute('ROLLBACK')
+            raise
+
+    async def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        cursor = self._conn.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE job_id = ? AND owner = ? AND status = 'leased'",
+            (self._clock() + lease_seconds, job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    async def complete(self, job_id: str, worker_id: str, result=None) -> bool:
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = 'done', owner = NULL, lease_expires = NULL, result = ? "
+            "WHERE job_id = ? AND owner = ? AND status = 'leased'",
+            (json.dumps(result, ensure_ascii=False) if result is not None else None, job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    async def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        cursor = self._conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+            "owner = NULL, lease_expires = NULL, error = ? "
+            "WHERE job_id = ? AND owner = ? AND status = 'leased'",
+            (error, job_id, worker_id)
+        )
+        return cursor.rowcount == 1
+
+    async def get(self, job_id: str):
+        row = self._conn.execute(
+            f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    async def stats(self) -> dict:
+        self._requeue_expired(self._clock())
+        counts = {Job.PENDING: 0, Job.LEASED: 0, Job.DONE: 0, Job.FAILED: 0}
+        for status, count in self._conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status'):
+            counts[status] = count
+        return counts
+
+    async def close(self):
+        self._conn.close()
@@ -0,0 +1,47 @@
+import uuid
+
+
+class Job:
+    """工作单元
+
+    对应 TaskManager 中注册的一个任务ID及其参数，例如一次关键词扫描或一段首页浏览。
+    参数需要能序列化为 JSON，才能交给其他机器上的工作进程执行。
+    """
+
+    __slots__ = (
+        'job_id', 'task_id', 'options', 'timeout', 'status', 'attempts', 'max_attempts',
+        'owner', 'lease_expires', 'created_at', 'result', 'error',
+    )
+
+    PENDING = 'pending'
+    LEASED = 'leased'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, task_id: str, options: dict = None, timeout: float = None, job_id: str = None,
+                 max_attempts: int = 3, status: str = PENDING, attempts: int = 0, owner: str = None,
+                 lease_expires: float = None, created_at: float = 0.0, result=None, error: str = None):
+        self.job_id = job_id or uuid.uuid4().hex
+        self.task_id = task_id
+        self.options = options or {}
+        self.timeout = timeout  # 任务最长运行时间（秒），为 None 时运行到任务自行结束
+        self.status = status
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+        self.owner = owner
+        self.lease_expires = lease_expires
+        self.created_at = created_at
+        self.result = result
+        self.error = error
+
+    def to_dict(self):
+        """转换为字典"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        """从字典创建"""
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+    def __repr__(self):
+        return f'Job(job_id={self.job_id!r}, task_id={self.task_id!r}, status={self.status!r})'
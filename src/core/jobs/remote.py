@@ -0,0 +1,168 @@
+import asyncio
+import json
+
+from config.app_config import JOBS_CONFIG
+from utils.logger import Logger
+from .backends import JobQueue, MemoryJobQueue, SqliteJobQueue
+from .job import Job
+
+# 远程任务队列协议（TCP，每行一个 JSON）：
+#   请求：{"op": "lease", "worker_id": "...", "lease_seconds": 60}
+#   响应：{"ok": true, "value": ...} 或 {"ok": false, "error": "..."}
+# op 与 JobQueue 的方法一一对应：submit、lease、heartbeat、complete、fail、get、stats
+
+
+class JobServer:
+    """任务队列服务
+
+    把任意 JobQueue 后端通过 TCP 提供给其他机器上的工作进程使用，
+    租约的过期判断只使用服务端的时钟，各机器之间不需要对时。
+    """
+
+    def __init__(self, queue: JobQueue, host: str = '0.0.0.0', port: int = 8765):
+        self.queue = queue
+        self.host = host
+        self.port = port
+        self._server = None
+
+    async def _dispatch(self, request: dict):
+        op = request.get('op')
+        if op == 'submit':
+            return await self.queue.submit(Job.from_dict(request['job']))
+        if op == 'lease':
+            job = await self.queue.lease(request['worker_id'], request['lease_seconds'])
+            return job.to_dict() if job else None
+        if op == 'heartbeat':
+            return await self.queue.heartbeat(request['job_id'], request['worker_id'], request['lease_seconds'])
+        if op == 'complete':
+            return await self.queue.complete(request['job_id'], request['worker_id'], request.get('result'))
+        if op == 'fail':
+            return await self.queue.fail(request['job_id'], request['worker_id'], request.get('error', ''))
+        if op == 'get':
+            job = await self.queue.get(request['job_id'])
+            return job.to_dict() if job else None
+        if op == 'stats':
+            return await self.queue.stats()
+        raise ValueError(f'未知的操作: {op}')
+
+    async def _handle_client(self, reader, writer):
+        peer = writer.get_extra_info('peername')
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = {'ok': True, 'value': await self._dispatch(json.loads(line))}
+                except Exception as e:
+                    Logger.warn(f'处理任务队列请求失败 {peer}: {e}')
+                    response = {'ok': False, 'error': str(e)}
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        """启动服务"""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        Logger.success(f'任务队列服务已启动: {self.host}:{self.port}')
+
+    async def serve_forever(self):
+        """启动服务并一直运行"""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """停止服务"""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.queue.close()
+        Logger.info('任务队列服务已停止')
+
+
+class RemoteJobQueue(JobQueue):
+    """远程任务队列客户端，连接 JobServer"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+
+    async def _call(self, op: str, **params):
+        request = dict(params, op=op)
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+                self._writer.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+                await self._writer.drain()
+                line = await self._reader.readline()
+                if not line:
+                    raise ConnectionError('任务队列服务连接已断开')
+            except OSError:
+                # 下次请求时重新连接
+                self._writer = None
+                raise
+        response = json.loads(line)
+        if not response['ok']:
+            raise RuntimeError(response['error'])
+        return response['value']
+
+    async def submit(self, job: Job) -> str:
+        return await self._call('submit', job=job.to_dict())
+
+    async def lease(self, worker_id: str, lease_seconds: float):
+        data = await self._call('lease', worker_id=worker_id, lease_seconds=lease_seconds)
+        return Job.from_dict(data) if data else None
+
+    async def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        return await self._call('heartbeat', job_id=job_id, worker_id=worker_id, lease_seconds=lease_seconds)
+
+    async def complete(self, job_id: str, worker_id: str, result=None) -> bool:
+        return await self._call('complete', job_id=job_id, worker_id=worker_id, result=result)
+
+    async def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        return await self._call('fail', job_id=job_id, worker_id=worker_id, error=error)
+
+    async def get(self, job_id: str):
+        data = await self._call('get', job_id=job_id)
+        return Job.from_dict(data) if data else None
+
+    async def stats(self) -> dict:
+        return await self._call('stats')
+
+    async def close(self):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+
+def create_job_queue(config=None) -> JobQueue:
+    """按配置创建任务队列
+
+    Args:
+        config: 可选，覆盖 JOBS_CONFIG 中的配置
+
+    Returns:
+        JobQueue: memory（进程内）、sqlite（本机共享）或 remote（连接 JobServer）
+    """
+    settings = dict(JOBS_CONFIG)
+    if config:
+        settings.update(config)
+    backend = settings['backend']
+    if backend == 'memory':
+        return MemoryJobQueue()
+    if backend == 'sqlite':
+        return SqliteJobQueue(settings['path'])
+    if backend == 'remote':
+        return RemoteJobQueue(settings['host'], settings['port'])
+    raise ValueError(f'未知的任务队列后端: {backend}')
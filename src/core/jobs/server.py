@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""任务队列服务
+
+在控制主机的 src 目录下运行：python -m core.jobs.server
+其他机器把 JOBS_CONFIG['backend'] 设为 remote，并以 FLEET_CONFIG['task'] = 'jobs' 运行多设备模式。
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# 将 src 目录添加到 Python 路径
+src_path = str(Path(__file__).parents[2].absolute())
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from config.app_config import JOBS_CONFIG
+from utils.logger import Logger
+from core.jobs.backends import SqliteJobQueue
+from core.jobs.remote import JobServer
+
+
+async def main():
+    server = JobServer(SqliteJobQueue(JOBS_CONFIG['path']), JOBS_CONFIG['bind'], JOBS_CONFIG['port'])
+    try:
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        Logger.info('用户中断')
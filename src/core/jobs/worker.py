@@ -0,0 +1,178 @@
+import asyncio
+import os
+import socket
+import time
+
+from config.app_config import JOBS_CONFIG
+from core.seen import SeenItemStore
+from utils.logger import Logger
+
+
+class DedupSink:
+    """按商品标识去重的结果输出
+
+    任务至少执行一次，租约过期重新执行时会再次输出同样的商品，
+    这里按 (记录类型, item_id) 过滤掉已经输出过的记录。
+    配置了已处理商品服务（SeenClient）时通过它去重，任务换到其他主机重新执行时也能过滤；
+    否则只在本进程内去重。
+    """
+
+    def __init__(self, sink, capacity: int = 100000, seen=None):
+        """初始化
+
+        Args:
+            sink: 实际的结果输出，可以为 None
+            capacity: 本进程内记住的记录数
+            seen: 可选，SeenClient 实例，在所有工作进程之间共享去重
+        """
+        self.sink = sink
+        self.recent = SeenItemStore(capacity)
+        self.seen = seen
+        self.accepted = 0
+        self.dropped = 0
+        self._pending = set()
+
+    def put(self, kind: str, record: dict) -> bool:
+        item_id = record.get('item_id')
+        if not item_id:
+            return self._accept(kind, record)
+        key = f'{kind}:{item_id}'
+        if not self.recent.add(key):
+            self.dropped += 1
+            return False
+        if self.seen is None:
+            return self._accept(kind, record)
+
+        # put 不能阻塞，向共享服务登记在后台完成，drain 时等待
+        task = asyncio.ensure_future(self._put_shared(key, kind, record))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return True
+
+    def _accept(self, kind: str, record: dict) -> bool:
+        self.accepted += 1
+        return self.sink.put(kind, record) if self.sink else True
+
+    async def _put_shared(self, key: str, kind: str, record: dict):
+        """通过共享服务去重后输出，服务不可用时 SeenClient 按新记录处理"""
+        if await self.seen.add(key):
+            self._accept(kind, record)
+        else:
+            self.dropped += 1
+
+    async def drain(self):
+        """等待正在向共享服务登记的记录"""
+        while self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    async def flush(self):
+        await self.drain()
+        if self.sink:
+            await self.sink.flush()
+
+    async def close(self):
+        await self.drain()
+        if self.sink:
+            await self.sink.close()
+
+
+class JobWorker:
+    """任务队列工作进程
+
+    从任务队列领取工作单元，用 TaskManager 按任务ID运行，运行期间定期心跳续约。
+    任务超时或租约被收回时停止任务；正常结束后提交结果，出错时报告失败并由队列决定是否重试。
+    """
+
+    def __init__(self, queue, task_manager, worker_id: str = None, config=None):
+        """初始化
+
+        Args:
+            queue: JobQueue 实例
+            task_manager: TaskManager 实例，其 sink 会被替换为去重后的输出，
+                配置了 seen 时通过它在所有工作进程之间去重
+            worker_id: 工作进程标识，默认为 主机名:进程号
+            config: 可选，覆盖 JOBS_CONFIG 中的配置
+        """
+        self.config = dict(JOBS_CONFIG)
+        if config:
+            self.config.update(config)
+        self.queue = queue
+        self.task_manager = task_manager
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+        self.sink = DedupSink(task_manager.sink, seen=task_manager.seen)
+        self.task_manager.sink = self.sink
+        self.running = True
+        self.completed = 0
+        self.failed = 0
+
+    def stop(self):
+        """停止领取任务，并停止正在运行的任务"""
+        self.running = False
+        self.task_manager.stop_current_task()
+
+    async def _keep_lease(self, job):
+        """定期续约，租约丢失时返回"""
+        while True:
+            await asyncio.sleep(self.config['heartbeat_interval'])
+            try:
+                if not await self.queue.heartbeat(job.job_id, self.worker_id, self.config['lease_seconds']):
+                    return
+            except Exception as e:
+                Logger.warn(f'任务心跳失败: {e}')
+
+    async def _execute(self, job):
+        Logger.info(f'领取任务 {job.job_id}: {job.task_id} {job.options} (第 {job.attempts} 次)')
+        accepted_before = self.sink.accepted
+        started = time.monotonic()
+        lease_task = asyncio.create_task(self._keep_lease(job))
+        run_task = asyncio.create_task(self.task_manager.run_task(job.task_id, **job.options))
+        try:
+            await asyncio.wait([run_task, lease_task], timeout=job.timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not run_task.done():
+                # 超时、租约丢失或工作进程停止：让任务在下一次检查运行状态时退出
+                self.task_manager.stop_current_task()
+                try:
+                    await asyncio.wait_for(run_task, self.config['stop_timeout'])
+                except asyncio.TimeoutError:
+                    pass
+            if run_task.done() and not run_task.cancelled() and run_task.exception():
+                raise run_task.exception()
+
+            if lease_task.done():
+                Logger.warn(f'任务 {job.job_id} 的租约已被收回，结果交由新的执行者提交')
+                return
+            await self.sink.drain()
+            result = {
+                'worker_id': self.worker_id,
+                'records': self.sink.accepted - accepted_before,
+                'seconds': round(time.monotonic() - started, 3),
+            }
+            if await self.queue.complete(job.job_id, self.worker_id, result):
+                self.completed += 1
+                Logger.success(f"任务 {job.job_id} 完成，输出 {result['records']} 条记录")
+            else:
+                Logger.warn(f'任务 {job.job_id} 提交结果失败，租约已过期')
+        except Exception as e:
+            self.failed += 1
+            Logger.error(f'任务 {job.job_id} 执行失败', e)
+            try:
+                await self.queue.fail(job.job_id, self.worker_id, f'{type(e).__name__}: {e}')
+            except Exception as report_error:
+                Logger.error('报告任务失败时出错', report_error)
+        finally:
+            lease_task.cancel()
+
+    async def run(self):
+        """持续领取并执行任务，直到调用 stop"""
+        Logger.info(f'=== 任务队列工作进程 {self.worker_id} 已启动 ===')
+        while self.running:
+            try:
+                job = await self.queue.lease(self.worker_id, self.config['lease_seconds'])
+            except Exception as e:
+                Logger.warn(f'领取任务失败: {e}')
+                job = None
+            if job is None:
+                await asyncio.sleep(self.config['poll_interval'])
+                continue
+            await self._execute(job)
+        Logger.info(f'=== 任务队列工作进程 {self.worker_id} 已停止 (完成 {self.completed}，失败 {self.failed}) ===')
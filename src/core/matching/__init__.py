@@ -0,0 +1,5 @@
+from .normalize import normalize, to_pinyin, syllables, variants
+from .aliases import ALIAS_GROUPS, aliases
+from .keyword_index import KeywordIndex
+
+__all__ = ['normalize', 'to_pinyin', 'syllables', 'variants', 'ALIAS_GROUPS', 'aliases', 'KeywordIndex']
@@ -0,0 +1,29 @@
+from .normalize import normalize
+
+# 常见角色名的译名和写法，同一组内互为别名
+# 拉丁字母拼写的关键词靠拼音匹配不到中文和日文译名，需要在这里列出
+ALIAS_GROUPS = (
+    ('chiikawa', '吉伊卡哇', 'ちいかわ', 'チイカワ'),
+    ('hachiware', '小八', 'ハチワレ'),
+    ('usagi', '乌萨奇', 'うさぎ', 'ウサギ'),
+    ('momonga', '小飞鼠', 'モモンガ'),
+)
+
+
+def aliases(keyword, groups=()) -> list:
+    """查找关键词的其他写法
+
+    Args:
+        keyword: 关键词
+        groups: 可选，内置别名表之外的别名组
+
+    Returns:
+        list: 与关键词同组的其他写法（已归一化），没有别名时为空列表
+    """
+    normalized = normalize(keyword)
+    found = []
+    for group in (*ALIAS_GROUPS, *groups):
+        forms = [normalize(alias) for alias in group]
+        if normalized in forms:
+            found.extend(form for form in forms if form != normalized and form not in found)
+    return found
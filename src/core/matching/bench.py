@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""关键词匹配性能测试
+
+在 src 目录下运行：python -m core.matching.bench
+"""
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+# 将 src 目录添加到 Python 路径
+src_path = str(Path(__file__).parents[2].absolute())
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from utils.logger import Logger
+from core.matching import KeywordIndex
+
+_CJK_START, _CJK_END = 0x4e00, 0x9fa5
+
+
+def _random_word(rng):
+    if rng.random() < 0.5:
+        return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+    return ''.join(chr(rng.randint(_CJK_START, _CJK_END)) for _ in range(rng.randint(2, 6)))
+
+
+def _random_title(rng, keywords):
+    """生成随机标题，返回 (标题, 插入的关键词)，没有插入关键词时为 None"""
+    words = [_random_word(rng) for _ in range(rng.randint(3, 6))]
+    keyword = None
+    if rng.random() < 0.1:
+        keyword = rng.choice(keywords)
+        words.insert(rng.randrange(len(words)), keyword)
+    return ' '.join(words), keyword
+
+
+def run_benchmark(keyword_count=10000, title_count=5000, seed=42):
+    """测试建立索引和批量匹配的耗时，并以插入的关键词为准统计准确率和召回率
+
+    Args:
+        keyword_count: 关键词数量
+        title_count: 标题数量
+        seed: 随机种子
+
+    Returns:
+        dict: 建索引耗时（秒）、每秒匹配的标题数、命中数、准确率和召回率
+    """
+    rng = random.Random(seed)
+    keywords = [_random_word(rng) for _ in range(keyword_count)]
+    titles, expected = zip(*(_random_title(rng, keywords) for _ in range(title_count)))
+
+    start = time.perf_counter()
+    index = KeywordIndex(keywords)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = index.match_many(titles)
+    match_seconds = time.perf_counter() - start
+
+    matched = sum(1 for keyword, _ in results if keyword)
+    correct = sum(1 for (keyword, _), truth in zip(results, expected) if keyword and keyword == truth)
+    inserted = sum(1 for truth in expected if truth)
+    report = {
+        'keywords': keyword_count,
+        'titles': title_count,
+        'build_seconds': build_seconds,
+        'titles_per_second': title_count / match_seconds if match_seconds else float('inf'),
+        'matched': matched,
+        'precision': correct / matched if matched else 1.0,
+        'recall': correct / inserted if inserted else 1.0,
+    }
+    Logger.info(
+        f"关键词 {keyword_count} 个，建索引 {build_seconds:.2f} 秒；"
+        f"匹配 {title_count} 个标题，{report['titles_per_second']:.0f} 个/秒，命中 {matched} 个，"
+        f"准确率 {report['precision']:.1%}，召回率 {report['recall']:.1%}"
+    )
+    return report
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,177 @@
+from .aliases import aliases
+from .normalize import normalize, syllables
+
+# 短于该长度的关键词（包括拼音形式）只做精确包含匹配，避免误判
+# 例如 奇卡瓦 的拼音 qikawa 允许一个错误时，可爱卡哇伊（keaikawayi）也会命中
+MIN_FUZZY_LENGTH = 8
+
+# 拼音形式至少这么多个字母才作为拼写形式匹配，例如 猫 的 mao 会出现在 maozi、xiaomao 等各种拼写里
+MIN_PINYIN_LENGTH = 5
+
+
+def _grams(text: str, size: int = 2):
+    """切分字符 n-gram"""
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def _window_distance(pattern: str, text: str) -> int:
+    """pattern 与 text 中任意连续片段之间的最小编辑距离
+
+    使用 Myers 的位并行算法，每个标题字符只需要几次整数运算。
+    """
+    length = len(pattern)
+    positions = {}
+    for i, char in enumerate(pattern):
+        positions[char] = positions.get(char, 0) | (1 << i)
+    mask = (1 << length) - 1
+    high = 1 << (length - 1)
+    plus, minus, score = mask, 0, length
+    best = length
+    for char in text:
+        equal = positions.get(char, 0)
+        vertical = equal | minus
+        horizontal = (((equal & plus) + plus) ^ plus) | equal
+        horizontal_plus = (minus | ~(horizontal | plus)) & mask
+        horizontal_minus = plus & horizontal
+        if horizontal_plus & high:
+            score += 1
+        elif horizontal_minus & high:
+            score -= 1
+        # 不在最低位补 1：匹配可以从 text 的任意位置开始
+        horizontal_plus = (horizontal_plus << 1) & mask
+        horizontal_minus = (horizontal_minus << 1) & mask
+        plus = (horizontal_minus | ~(vertical | horizontal_plus)) & mask
+        minus = horizontal_plus & vertical
+        best = min(best, score)
+    return best
+
+
+class KeywordIndex:
+    """关键词模糊匹配索引
+
+    关键词在创建时归一化（全半角、大小写、繁简、分隔符），加上别名表中的译名，
+    并生成拼音形式，再建立字符 n-gram 倒排索引。查询时先做精确包含匹配，
+    再取 n-gram 命中比例超过阈值的候选，计算与标题中连续片段的编辑距离，
+    相似度超过阈值即视为匹配，可以覆盖错别字、拼音和故意拆开的写法，
+    又不会把散落在标题各处的片段拼成关键词。
+
+    同音字按标题逐字的拼音对齐匹配，不会跨字拼出关键词的拼音，
+    并且超过一半的字要与关键词相同，例如 奇卡哇 能匹配 奇卡瓦，旗卡袜 和 帽 不会匹配 奇卡瓦 和 猫。
+    """
+
+    def __init__(self, keywords, threshold: float = 0.7, gram_size: int = 2, alias_groups=()):
+        """建立索引
+
+        Args:
+            keywords: 关键词列表
+            threshold: 相似度阈值（0-1），1 - 编辑距离 / 关键词长度
+            gram_size: n-gram 长度
+            alias_groups: 可选，内置别名表之外的别名组，每组是互为别名的写法
+        """
+        self.threshold = threshold
+        self.gram_size = gram_size
+        self._forms = []  # (关键词, 匹配形式, n-gram 数量)
+        self._postings = {}  # n-gram -> 匹配形式编号列表
+        self._short_forms = {}  # 短关键词的匹配形式 -> 关键词
+        self._max_short_length = 0
+        self._sounds = {}  # 拼音音节元组 -> [(关键词, 汉字形式)]
+        self._sound_lengths = set()
+
+        for keyword in keywords:
+            for form in [normalize(keyword), *aliases(keyword, alias_groups)]:
+                if not form:
+                    continue
+                self._add_form(keyword, form)
+                sounds = syllables(form)
+                if any(sound != char for sound, char in zip(sounds, form)):
+                    self._sounds.setdefault(tuple(sounds), []).append((keyword, form))
+                    self._sound_lengths.add(len(sounds))
+                    pinyin = ''.join(sounds)
+                    if len(pinyin) >= MIN_PINYIN_LENGTH:
+                        self._add_form(keyword, pinyin)
+
+    def _add_form(self, keyword, form):
+        """加入一个匹配形式，短的只做精确匹配，长的进入 n-gram 索引"""
+        if len(form) < MIN_FUZZY_LENGTH:
+            self._short_forms.setdefault(form, keyword)
+            self._max_short_length = max(self._max_short_length, len(form))
+            return
+        form_id = len(self._forms)
+        grams = _grams(form, self.gram_size)
+        self._forms.append((keyword, form, len(grams)))
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(form_id)
+
+    def __len__(self):
+        return len(self._forms) + len(self._short_forms)
+
+    def _match_sounds(self, text):
+        """按逐字拼音匹配同音字，返回 (关键词, 相似度)
+
+        相似度为 0.5 + 相同的字数 / (2 * 关键词字数)，相同的字没有超过一半时不算匹配。
+        """
+        if not self._sounds:
+            return None, 0.0
+        sounds = syllables(text)
+        best_keyword, best_score = None, 0.0
+        for length in self._sound_lengths:
+            for start in range(len(sounds) - length + 1):
+                for keyword, form in self._sounds.get(tuple(sounds[start:start + length]), ()):
+                    same = sum(1 for a, b in zip(form, text[start:start + length]) if a == b)
+                    if same * 2 <= length:
+                        continue
+                    score = 0.5 + same / (2 * length)
+                    if score > best_score:
+                        best_keyword, best_score = keyword, score
+        return best_keyword, best_score
+
+    def match(self, title):
+        """匹配单个标题
+
+        Args:
+            title: 商品标题
+
+        Returns:
+            tuple: (关键词, 相似度)，没有超过阈值的关键词时返回 (None, 0.0)
+        """
+        text = normalize(title)
+
+        # 短关键词只做精确包含匹配，逐个查找标题的短子串
+        for length in range(1, min(self._max_short_length, len(text)) + 1):
+            for start in range(len(text) - length + 1):
+                keyword = self._short_forms.get(text[start:start + length])
+                if keyword is not None:
+                    return keyword, 1.0
+
+        best_keyword, best_score = self._match_sounds(text)
+
+        # 长关键词按与标题连续片段的编辑距离计算相似度，完全包含时为 1.0
+        hits = {}
+        for gram in _grams(text, self.gram_size):
+            for form_id in self._postings.get(gram, ()):
+                hits[form_id] = hits.get(form_id, 0) + 1
+        for form_id, count in hits.items():
+            keyword, form, gram_count = self._forms[form_id]
+            # n-gram 命中比例只用来筛选候选，命中的片段可能分散在标题各处
+            if count < gram_count * self.threshold:
+                continue
+            score = 1 - _window_distance(form, text) / len(form)
+            if score > best_score:
+                best_keyword, best_score = keyword, score
+
+        if best_score >= self.threshold:
+            return best_keyword, best_score
+        return None, 0.0
+
+    def match_many(self, titles):
+        """批量匹配标题
+
+        Args:
+            titles: 商品标题列表
+
+        Returns:
+            list: 与 titles 一一对应的 (关键词, 相似度) 列表
+        """
+        return [self.match(title) for title in titles]
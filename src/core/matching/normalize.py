@@ -0,0 +1,100 @@
+import unicodedata
+
+from utils.logger import Logger
+
+# 常见繁体字对照表，没有安装 opencc 时使用
+_TRADITIONAL_PAIRS = (
+    '機机價价賣卖買买開开關关車车書书號号電电腦脑錶表鐘钟頭头絲丝線线紅红綠绿藍蓝黃黄'
+    '貓猫龍龙鳥鸟魚鱼馬马東东國国個个們们來来時时會会說说對对這这還还點点發发現现學学'
+    '實实體体當当種种間间長长門门問问聽听見见覺觉讓让邊边過过無无與与為为從从動动畫画'
+    '圖图裝装掛挂飾饰貼贴紙纸級级質质舊旧優优產产廠厂專专賽赛襪袜衛卫視视聲声樂乐戲戏'
+    '遊游錢钱郵邮寶宝貝贝夥伙兒儿愛爱夢梦戀恋熱热燈灯鐵铁鋼钢銀银鑽钻週周隻只張张團团'
+    '網网絨绒織织鑰钥盤盘禮礼盜盗闆板隊队際际標标簽签證证據据盡尽壞坏補补'
+)
+_TRADITIONAL_TABLE = {
+    ord(_TRADITIONAL_PAIRS[i]): _TRADITIONAL_PAIRS[i + 1]
+    for i in range(0, len(_TRADITIONAL_PAIRS), 2)
+}
+
+_converter = None
+_pinyin = None
+
+
+def _to_simplified(text: str) -> str:
+    """繁体转简体，优先使用 opencc"""
+    global _converter
+    if _converter is None:
+        try:
+            import opencc
+            _converter = opencc.OpenCC('t2s').convert
+        except Exception:
+            _converter = lambda value: value.translate(_TRADITIONAL_TABLE)
+    return _converter(text)
+
+
+def _is_kept(char: str) -> bool:
+    """只保留汉字、字母和数字，空格、标点、表情等分隔符全部去掉"""
+    category = unicodedata.category(char)
+    return category[0] in ('L', 'N')
+
+
+def normalize(text) -> str:
+    """文本归一化
+
+    - 全角转半角（NFKC），例如 ｃｈｉｉ -> chii
+    - 忽略大小写
+    - 繁体转简体
+    - 去掉空格、标点、表情等分隔符，例如 "c h i i🌟k a w a" -> chiikawa
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        str: 归一化后的文本
+    """
+    text = unicodedata.normalize('NFKC', str(text or '')).lower()
+    text = ''.join(char for char in text if _is_kept(char))
+    return _to_simplified(text)
+
+
+def _load_pinyin():
+    """加载 pypinyin，未安装时返回 False"""
+    global _pinyin
+    if _pinyin is None:
+        try:
+            from pypinyin import lazy_pinyin
+            _pinyin = lazy_pinyin
+        except ImportError:
+            Logger.debug('未安装 pypinyin，跳过拼音匹配')
+            _pinyin = False
+    return _pinyin
+
+
+def to_pinyin(text: str) -> str:
+    """把汉字转换为不带声调的拼音，其他字符保持不变
+
+    需要安装 pypinyin，未安装时返回空字符串。
+    """
+    if not _load_pinyin():
+        return ''
+    return ''.join(_pinyin(text))
+
+
+def syllables(text: str) -> list:
+    """逐字转换为不带声调的拼音，与 text 的字符一一对应，非汉字保持原样
+
+    需要安装 pypinyin，未安装时返回空列表。
+    """
+    if not _load_pinyin():
+        return []
+    return _pinyin(text, errors=list)
+
+
+def variants(text) -> set:
+    """生成文本的匹配形式：归一化文本及其拼音"""
+    normalized = normalize(text)
+    forms = {normalized} if normalized else set()
+    pinyin = to_pinyin(normalized)
+    if pinyin:
+        forms.add(pinyin)
+    return forms
@@ -0,0 +1,9 @@
+from .registry import Counter, Gauge, Histogram, MetricsRegistry, render
+from .device import REGISTRY, DeviceMetrics, get_metrics, device_id_of
+from .server import MetricsServer, start_metrics_server
+
+__all__ = [
+    'Counter', 'Gauge', 'Histogram', 'MetricsRegistry', 'render',
+    'REGISTRY', 'DeviceMetrics', 'get_metrics', 'device_id_of',
+    'MetricsServer', 'start_metrics_server',
+]
@@ -0,0 +1,84 @@
+import weakref
+
+from .registry import MetricsRegistry
+
+REGISTRY = MetricsRegistry()
+
+ITEMS_SCANNED = REGISTRY.counter('xianyu_items_scanned_total', '读取到标题的商品卡片数', ('device',))
+MATCHES = REGISTRY.counter('xianyu_matches_total', '标题匹配成功的商品数', ('device',))
+DETAIL_VISITS = REGISTRY.counter('xianyu_detail_visits_total', '浏览的商品详情页数', ('device',))
+PAGE_IDENTIFY_SECONDS = REGISTRY.histogram(
+    'xianyu_page_identify_seconds', '识别当前页面的耗时', ('device', 'page')
+)
+COMMAND_SECONDS = REGISTRY.histogram(
+    'xianyu_appium_command_seconds', 'Appium 动作命令耗时（点击、滑动、返回等）', ('device', 'command')
+)
+COMMAND_ERRORS = REGISTRY.counter('xianyu_appium_command_errors_total', 'Appium 动作命令出错次数', ('device', 'command'))
+SESSION_RESTARTS = REGISTRY.counter('xianyu_session_restarts_total', '应用或工作进程重启次数', ('device', 'kind'))
+QUEUE_DEPTH = REGISTRY.gauge('xianyu_queue_depth', '队列中等待处理的条目数', ('device', 'queue'))
+
+
+def device_id_of(driver) -> str:
+    """从驱动的 capabilities 中取设备标识"""
+    capabilities = getattr(driver, 'capabilities', None) or {}
+    return capabilities.get('udid') or capabilities.get('deviceName') or 'default'
+
+
+class DeviceMetrics:
+    """一台设备的指标
+
+    创建时绑定好 device 标签，热路径上只是对缓存的子指标做加法。
+    """
+
+    def __init__(self, device_id: str):
+        self.device_id = device_id
+        self.items_scanned = ITEMS_SCANNED.labels(device_id)
+        self.matches = MATCHES.labels(device_id)
+        self.detail_visits = DETAIL_VISITS.labels(device_id)
+        self._identify = {}
+        self._commands = {}
+
+    def observe_identify(self, page: str, seconds: float):
+        """记录一次页面识别耗时"""
+        child = self._identify.get(page)
+        if child is None:
+            child = self._identify[page] = PAGE_IDENTIFY_SECONDS.labels(self.device_id, page)
+        child.observe(seconds)
+
+    def observe_command(self, command: str, seconds: float, error: bool = False):
+        """记录一次 Appium 命令耗时，出错时同时计数"""
+        children = self._commands.get(command)
+        if children is None:
+            children = self._commands[command] = (
+                COMMAND_SECONDS.labels(self.device_id, command),
+                COMMAND_ERRORS.labels(self.device_id, command),
+            )
+        children[0].observe(seconds)
+        if error:
+            children[1].inc()
+
+    def session_restarted(self, kind: str = 'app'):
+        SESSION_RESTARTS.labels(self.device_id, kind).inc()
+
+    def track_queue(self, queue: str, function):
+        """登记队列长度，采集时调用 function 读取"""
+        QUEUE_DEPTH.labels(self.device_id, queue).set_function(function)
+
+
+_device_metrics = weakref.WeakKeyDictionary()
+
+
+def get_metrics(driver, device_id: str = None) -> DeviceMetrics:
+    """获取驱动对应设备的指标，同一个驱动的所有页面和任务共享一个
+
+    Args:
+        driver: Appium WebDriver 实例
+        device_id: 可选，首次获取时使用的设备标识，默认从 capabilities 中读取
+
+    Returns:
+        DeviceMetrics: 设备指标
+    """
+    metrics = _device_metrics.get(driver)
+    if metrics is None:
+        metrics = _device_metrics[driver] = DeviceMetrics(device_id or device_id_of(driver))
+    return metrics
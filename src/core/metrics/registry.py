@@ -0,0 +1,222 @@
+from bisect import bisect_left
+
+# 默认的耗时直方图分桶（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ('value', 'function')
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.value -= amount
+
+    def set_function(self, function):
+        """采集时调用 function 获取当前值，适合队列长度这类随时可以读取的值"""
+        self.function = function
+
+    def get(self) -> float:
+        if self.function is None:
+            return self.value
+        try:
+            return float(self.function())
+        except Exception:
+            return float('nan')
+
+
+class _HistogramChild:
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    """带标签的指标
+
+    labels() 返回的子指标可以缓存下来重复使用。更新只是普通的属性加法，不加锁：
+    所有更新都发生在事件循环线程中，导出时在同一线程读取，每次更新只有几十纳秒。
+    """
+
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        """获取指定标签值的子指标"""
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f'{self.name} 需要标签 {self.labelnames}，实际为 {values}')
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def snapshot(self) -> dict:
+        """导出为可以跨进程传递的普通字典"""
+        return {
+            'name': self.name,
+            'type': self.kind,
+            'help': self.documentation,
+            'samples': self._samples(),
+        }
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def _samples(self):
+        return [
+            (self.name, dict(zip(self.labelnames, values)), child.value)
+            for values, child in list(self._children.items())
+        ]
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def _samples(self):
+        return [
+            (self.name, dict(zip(self.labelnames, values)), child.get())
+            for values, child in list(self._children.items())
+        ]
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def _samples(self):
+        samples = []
+        for values, child in list(self._children.items()):
+            labels = dict(zip(self.labelnames, values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), list(child.counts)):
+                cumulative += count
+                samples.append((f'{self.name}_bucket', dict(labels, le=_format_value(bound)), cumulative))
+            samples.append((f'{self.name}_sum', labels, child.sum))
+            samples.append((f'{self.name}_count', labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> list:
+        """所有指标的快照，工作进程通过它把指标上报给控制进程"""
+        return [metric.snapshot() for metric in list(self._metrics.values())]
+
+
+def _format_value(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if value == float('-inf'):
+        return '-Inf'
+    if value != value:
+        return 'NaN'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render(snapshots) -> str:
+    """把一个或多个快照渲染为 Prometheus 文本格式
+
+    多个进程的快照中同名指标会合并到一起（标签中包含 device，不会冲突）。
+
+    Args:
+        snapshots: MetricsRegistry.snapshot() 的结果列表
+
+    Returns:
+        str: text/plain; version=0.0.4 格式的指标文本
+    """
+    merged = {}
+    for snapshot in snapshots:
+        for metric in snapshot or ():
+            entry = merged.setdefault(metric['name'], {'type': metric['type'], 'help': metric['help'], 'samples': []})
+            entry['samples'].extend(metric['samples'])
+
+    lines = []
+    for name, entry in merged.items():
+        lines.append(f"# HELP {name} {_escape(entry['help'])}")
+        lines.append(f"# TYPE {name} {entry['type']}")
+        for sample_name, labels, value in entry['samples']:
+            if labels:
+                label_text = ','.join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+                lines.append(f'{sample_name}{{{label_text}}} {_format_value(value)}')
+            else:
+                lines.append(f'{sample_name} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,91 @@
+import asyncio
+
+from config.app_config import METRICS_CONFIG
+from utils.logger import Logger
+from .device import REGISTRY
+from .registry import render
+
+_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsServer:
+    """内嵌的 Prometheus 指标接口
+
+    只实现 GET /metrics，运行在程序自己的事件循环中，与指标更新在同一线程，
+    不需要加锁。collect 返回要导出的快照列表，多设备模式下控制进程把各工作进程
+    上报的快照一起导出。
+    """
+
+    def __init__(self, host: str, port: int, collect=None):
+        """初始化
+
+        Args:
+            host: 监听地址
+            port: 监听端口
+            collect: 可选，返回快照列表的函数，默认只导出本进程的指标
+        """
+        self.host = host
+        self.port = port
+        self.collect = collect or (lambda: [REGISTRY.snapshot()])
+        self._server = None
+
+    async def _handle_client(self, reader, writer):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+            # 读完请求头，忽略内容
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5)
+                if not line or line in (b'\r\n', b'\n'):
+                    break
+            parts = request_line.decode('latin-1').split()
+            if len(parts) >= 2 and parts[0] == 'GET' and parts[1].split('?')[0] == '/metrics':
+                status, content_type, body = '200 OK', _CONTENT_TYPE, render(self.collect()).encode('utf-8')
+            else:
+                status, content_type, body = '404 Not Found', 'text/plain; charset=utf-8', b'not found\n'
+            writer.write(
+                f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n'
+                f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode('latin-1') + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionResetError, BrokenPipeError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            Logger.error('处理指标请求时出错', e)
+        finally:
+            writer.close()
+
+    async def start(self):
+        """启动服务"""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        Logger.success(f'指标接口已启动: http://{self.host}:{self.port}/metrics')
+
+    async def stop(self):
+        """停止服务"""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def start_metrics_server(collect=None, config=None):
+    """按配置启动指标接口
+
+    Args:
+        collect: 可选，返回快照列表的函数
+        config: 可选，覆盖 METRICS_CONFIG 中的配置
+
+    Returns:
+        MetricsServer: 服务实例，未启用或端口被占用时返回 None
+    """
+    settings = dict(METRICS_CONFIG)
+    if config:
+        settings.update(config)
+    if not settings['enabled']:
+        return None
+    server = MetricsServer(settings['host'], settings['port'], collect)
+    try:
+        await server.start()
+    except OSError as e:
+        Logger.error(f"指标接口启动失败: {settings['host']}:{settings['port']}", e)
+        return None
+    return server
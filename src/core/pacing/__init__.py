@@ -0,0 +1,3 @@
+from .engine import PacingEngine, get_pacer, lognormal_mean
+
+__all__ = ['PacingEngine', 'get_pacer', 'lognormal_mean']
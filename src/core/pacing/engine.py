@@ -0,0 +1,170 @@
+import math
+import random
+import time
+import weakref
+
+from config.app_config import PACING_CONFIG
+from utils.logger import Logger
+from core import tracing
+
+
+def lognormal_mean(median: float, sigma: float) -> float:
+    """对数正态分布的期望"""
+    return median * math.exp(sigma * sigma / 2)
+
+
+class PacingEngine:
+    """浏览节奏
+
+    停留和滑动间隔从对数正态分布中采样（大部分停留较短，偶尔停留很久，比均匀分布更像真人）。
+    详情浏览按会话进行：每个会话连续浏览若干商品后休息一段时间，会话长度和休息时长同样随机。
+
+    按目标吞吐量（每小时浏览的详情数）推算停留时间的缩放比例，但不低于 min_median 规定的
+    最短停留，目标过高时以最短停留运行并给出提示。
+    """
+
+    KINDS = ('initial', 'scroll', 'final')
+
+    def __init__(self, config=None, rng=None, clock=None):
+        """初始化
+
+        Args:
+            config: 可选，覆盖 PACING_CONFIG 中的配置
+            rng: 可选，random.Random 实例，便于复现
+            clock: 可选，时钟函数，默认为 time.monotonic
+        """
+        self.config = dict(PACING_CONFIG)
+        if config:
+            self.config.update(config)
+        self.rng = rng or random.Random()
+        self._clock = clock or time.monotonic
+        self.scale = self._solve_scale()
+        self.views = 0
+        self.session_views = 0
+        self.session_target = self._sample_session_views()
+        self.breaks = 0
+        self._started = self._clock()
+
+    def _dwell_mean(self, scale: float = 1.0) -> float:
+        """单个详情页的期望停留时间"""
+        dwell = self.config['dwell']
+        scroll_median, scroll_sigma = self.config['scrolls']
+        expected_scrolls = min(lognormal_mean(scroll_median, scroll_sigma), self.config['max_scrolls'])
+        return scale * (
+            lognormal_mean(*dwell['initial'])
+            + expected_scrolls * lognormal_mean(*dwell['scroll'])
+            + lognormal_mean(*dwell['final'])
+        )
+
+    def _break_share(self) -> float:
+        """分摊到每个详情页的休息时间"""
+        return lognormal_mean(*self.config['break_seconds']) / lognormal_mean(*self.config['session_views'])
+
+    def _floor_scale(self) -> float:
+        """最短停留限制下的最小缩放比例"""
+        dwell = self.config['dwell']
+        return max(self.config['min_median'][kind] / dwell[kind][0] for kind in self.KINDS)
+
+    def _solve_scale(self) -> float:
+        """按目标吞吐量求停留时间的缩放比例"""
+        budget = 3600.0 / self.config['target_views_per_hour']
+        spare = budget - self.config['overhead_seconds'] - self._break_share()
+        scale = spare / self._dwell_mean() if spare > 0 else 0.0
+        floor = self._floor_scale()
+        if scale < floor:
+            Logger.warn(
+                f"目标每小时 {self.config['target_views_per_hour']} 个详情无法在最短停留限制下达到，"
+                f"预计最多 {self.expected_per_hour(floor):.0f} 个"
+            )
+            return floor
+        return min(scale, self.config['max_scale'])
+
+    def expected_per_hour(self, scale: float = None) -> float:
+        """按当前参数预计每小时浏览的详情数"""
+        scale = self.scale if scale is None else scale
+        per_view = self.config['overhead_seconds'] + self._dwell_mean(scale) + self._break_share()
+        return 3600.0 / per_view
+
+    def _sample(self, median: float, sigma: float) -> float:
+        return median * math.exp(self.rng.gauss(0, max(sigma, self.config['min_sigma'])))
+
+    def _sample_session_views(self) -> int:
+        return max(1, round(self._sample(*self.config['session_views'])))
+
+    def dwell(self, kind: str) -> float:
+        """采样一次停留时间（秒）
+
+        Args:
+            kind: initial（进入页面后）、scroll（每次滑动后）或 final（离开前）
+        """
+        median, sigma = self.config['dwell'][kind]
+        return self._sample(median * self.scale, sigma)
+
+    def scroll_count(self) -> int:
+        """采样一个页面的滑动次数"""
+        return min(self.config['max_scrolls'], max(1, round(self._sample(*self.config['scrolls']))))
+
+    async def pause(self, kind: str) -> float:
+        """按采样的停留时间等待，返回等待的秒数"""
+        seconds = self.dwell(kind)
+        await tracing.sleep(seconds, 'dwell')
+        return seconds
+
+    async def view_done(self):
+        """记录完成一次详情浏览，会话结束时休息一段时间"""
+        self.views += 1
+        self.session_views += 1
+        if self.session_views < self.session_target:
+            return
+        report = self.report()
+        Logger.info(
+            f"本轮浏览 {self.session_views} 个详情，目标 {report['target_per_hour']:.0f}/小时，"
+            f"预计 {report['expected_per_hour']:.0f}/小时，实际 {report['achieved_per_hour']:.0f}/小时"
+        )
+        seconds = self._sample(*self.config['break_seconds'])
+        Logger.info(f'休息 {seconds:.0f} 秒后开始下一轮')
+        self.breaks += 1
+        self.session_views = 0
+        self.session_target = self._sample_session_views()
+        await tracing.sleep(seconds, 'session_break')
+
+    def state(self) -> dict:
+        """可以写入检查点的会话进度"""
+        return {
+            'views': self.views,
+            'session_views': self.session_views,
+            'session_target': self.session_target,
+            'breaks': self.breaks,
+            'elapsed': self._clock() - self._started,
+        }
+
+    def restore(self, state: dict):
+        """从检查点恢复会话进度，重启后不会马上重新开始一轮会话"""
+        self.views = state.get('views', self.views)
+        self.session_views = state.get('session_views', self.session_views)
+        self.session_target = state.get('session_target', self.session_target)
+        self.breaks = state.get('breaks', self.breaks)
+        self._started = self._clock() - state.get('elapsed', 0.0)
+
+    def report(self) -> dict:
+        """预计与实际吞吐量"""
+        hours = (self._clock() - self._started) / 3600.0
+        return {
+            'target_per_hour': self.config['target_views_per_hour'],
+            'expected_per_hour': self.expected_per_hour(),
+            'achieved_per_hour': self.views / hours if hours > 0 else 0.0,
+            'views': self.views,
+            'breaks': self.breaks,
+            'scale': self.scale,
+        }
+
+
+_engines = weakref.WeakKeyDictionary()
+
+
+def get_pacer(driver) -> PacingEngine:
+    """获取驱动（设备）对应的浏览节奏，同一设备的页面和任务共享一个"""
+    engine = _engines.get(driver)
+    if engine is None:
+        engine = _engines[driver] = PacingEngine()
+    return engine
@@ -1,32 +1,45 @@
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import WebDriverException
 import asyncio
 import re
 import random
+import time
 
 from utils.logger import Logger
+from core.snapshot import HierarchySnapshot
+from core.throttle import get_limiter
+from core.pacing import get_pacer
+from core import tracing
+from core import deadline
+from core.recorder import get_recorder
 
 class BasePage:
+    # 切换到该页面时由 PageFactory 应用的 Appium 设置，子类只需声明不同的项
+    # implicitWait 为隐式等待（毫秒），其他项见 UiAutomator2 的 settings 文档
+    PERFORMANCE_PROFILE = {
+        'waitForIdleTimeout': 1000,
+        'waitForSelectorTimeout': 1000,
+        'actionAcknowledgmentTimeout': 1000,
+        'ignoreUnimportantViews': False,
+        'implicitWait': 0,
+    }
+
     def __init__(self, driver):
         self.driver = driver
         self.timeout = 10  # 默认超时时间（秒）
+        self.limiter = get_limiter(driver)  # 同一设备的所有页面共享限速器
 
     async def wait_for_element(self, locator, timeout=None):
         """等待元素出现"""
-        timeout = timeout or self.timeout
+        # 只使用当前阶段剩余的时间
+        timeout = deadline.remaining(timeout or self.timeout)
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(locator)
-            )
-            return element
-        except TimeoutException:
-            # 元素未找到时不记录错误，这是正常情况
-            return None
+            # 元素未找到时返回 None，不记录错误，这是正常情况
+            return await deadline.wait_until(lambda: self.driver.find_element(*locator), timeout)
         except Exception as e:
             # 其他异常才记录错误
             Logger.error(f"查找元素时出错: {locator}", e)
+            get_recorder(self.driver).failure(f'查找元素时出错: {locator}')
             return None
 
     async def find_element_by_content_desc_pattern(self, pattern, timeout=3):
@@ -63,6 +76,8 @@ class BasePage:
                 except:
                     pass
             return is_displayed
+        except asyncio.CancelledError:
+            raise  # 不能吞掉取消，否则页面观察器停不下来
         except:
             return False
 
@@ -79,7 +94,8 @@ class BasePage:
             element = await self.wait_for_element(locator, timeout)
         
         if element:
-            element.click()
+            async with self.limiter.action('tap'):
+                element.click()
             return True
         return False
 
@@ -118,13 +134,14 @@ class BasePage:
             duration = random.randint(500, 1500)  # 500-1500毫秒
             
             Logger.debug(f'向上滑动: ({start_x:.0f}, {start_y:.0f}) -> ({end_x:.0f}, {end_y:.0f}), 持续{duration}ms')
-            self.driver.swipe(
-                start_x=start_x,
-                start_y=start_y,
-                end_x=end_x,
-                end_y=end_y,
-                duration=duration
-            )
+            async with self.limiter.action('scroll'):
+                self.driver.swipe(
+                    start_x=start_x,
+                    start_y=start_y,
+                    end_x=end_x,
+                    end_y=end_y,
+                    duration=duration
+                )
             return True
             
         except WebDriverException as e:
@@ -155,13 +172,14 @@ class BasePage:
             duration = random.randint(500, 1500)  # 500-1500毫秒
             
             Logger.debug(f'向下滑动: ({start_x:.0f}, {start_y:.0f}) -> ({end_x:.0f}, {end_y:.0f}), 持续{duration}ms')
-            self.driver.swipe(
-                start_x=start_x,
-                start_y=start_y,
-                end_x=end_x,
-                end_y=end_y,
-                duration=duration
-            )
+            async with self.limiter.action('scroll'):
+                self.driver.swipe(
+                    start_x=start_x,
+                    start_y=start_y,
+                    end_x=end_x,
+                    end_y=end_y,
+                    duration=duration
+                )
             return True
             
         except WebDriverException as e:
@@ -177,47 +195,54 @@ class BasePage:
         模拟人工浏览页面的行为，包括：
         - 随机次数的滑动
         - 随机的滑动方向
-        - 随机的等待时间
+        - 按浏览节奏（PacingEngine）采样的停留时间
+        - 页面内容不再变化时提前结束（需要配置 stable_rounds）
         
         Args:
             scroll_config: 滑动配置，可选，包含以下字段：
-                - min_times: 最少滑动次数，默认3
-                - max_times: 最多滑动次数，默认5
                 - up_probability: 向上滑动的概率，默认0.8
-                - initial_wait: (min, max) 初始等待时间范围，默认(2, 4)
-                - scroll_wait: (min, max) 每次滑动后等待时间范围，默认(1, 3)
-                - final_wait: (min, max) 最终等待时间范围，默认(2, 4)
+                - min_dwell: 最短停留时间（秒），提前结束时补足，默认0
+                - stable_rounds: 连续多少次向上滑动后页面指纹不变视为到底，默认0（不检测）
+                - on_snapshot: 每次获取页面快照后的回调，参数为 HierarchySnapshot
         
         Returns:
-            bool: 是否成功完成所有滑动
+            bool: 是否成功完成浏览
         """
         try:
             Logger.debug('===== 开始模拟浏览 =====')
             
             # 默认配置
             config = {
-                'min_times': 3,
-                'max_times': 5,
                 'up_probability': 0.8,
-                'initial_wait': (2, 4),
-                'scroll_wait': (1, 3),
-                'final_wait': (2, 4)
+                'min_dwell': 0,
+                'stable_rounds': 0,
+                'on_snapshot': None
             }
             
             # 更新配置
             if scroll_config:
                 config.update(scroll_config)
             
+            pacer = get_pacer(self.driver)
+            start_time = time.monotonic()
+            use_snapshot = config['stable_rounds'] > 0 or config['on_snapshot'] is not None
+            
             # 先等待页面加载
-            initial_wait = random.uniform(*config['initial_wait'])
+            initial_wait = pacer.dwell('initial')
             Logger.debug(f'初始等待 {initial_wait:.1f} 秒...')
-            await asyncio.sleep(initial_wait)
+            await tracing.sleep(deadline.remaining(initial_wait), 'dwell')
+            
+            last_fingerprint = self._take_snapshot(config['on_snapshot']) if use_snapshot else None
+            stable_count = 0
             
             # 执行随机次数的滑动
-            scroll_times = random.randint(config['min_times'], config['max_times'])
+            scroll_times = pacer.scroll_count()
             Logger.info(f'计划滑动 {scroll_times} 次')
             
             for i in range(scroll_times):
+                if deadline.expired():
+                    Logger.debug(f'阶段预算已用完，第 {i+1} 次滑动前结束浏览')
+                    break
                 try:
                     # 随机决定滑动方向
                     is_scroll_up = random.random() < config['up_probability']
@@ -235,22 +260,57 @@ class BasePage:
                         return False
                     
                     # 随机等待
-                    wait_time = random.uniform(*config['scroll_wait'])
+                    wait_time = pacer.dwell('scroll')
                     Logger.debug(f'等待 {wait_time:.1f} 秒...')
-                    await asyncio.sleep(wait_time)
+                    await tracing.sleep(deadline.remaining(wait_time), 'dwell')
+                    
+                    if not use_snapshot:
+                        continue
+                    
+                    # 向上滑动后页面指纹不再变化说明已经到底，提前结束；
+                    # 在页面顶部向下滑动本来就不会有变化，不能算作到底
+                    fingerprint = self._take_snapshot(config['on_snapshot'])
+                    if is_scroll_up and fingerprint and fingerprint == last_fingerprint:
+                        stable_count += 1
+                    else:
+                        stable_count = 0
+                    last_fingerprint = fingerprint
+                    
+                    if config['stable_rounds'] and stable_count >= config['stable_rounds']:
+                        Logger.debug(f'页面内容不再变化，第 {i+1} 次滑动后结束浏览')
+                        break
                     
                 except Exception as e:
                     Logger.error(f'第 {i+1} 次滑动失败', e)
                     continue
             
-            # 最后停留一会
-            final_wait = random.uniform(*config['final_wait'])
+            # 最后停留一会，不足最短停留时间时补足
+            final_wait = pacer.dwell('final')
+            final_wait = max(final_wait, config['min_dwell'] - (time.monotonic() - start_time))
             Logger.debug(f'最后停留 {final_wait:.1f} 秒...')
-            await asyncio.sleep(final_wait)
+            await tracing.sleep(deadline.remaining(final_wait), 'dwell')
             
-            Logger.debug('===== 模拟浏览完成 =====')
+            Logger.debug(f'===== 模拟浏览完成，共停留 {time.monotonic() - start_time:.1f} 秒 =====')
             return True
             
         except Exception as e:
             Logger.error('模拟浏览失败', e)
-            return False 
\ No newline at end of file
+            return False
+
+    def _take_snapshot(self, on_snapshot=None):
+        """获取页面快照并返回指纹
+
+        Args:
+            on_snapshot: 可选，获取快照后的回调
+
+        Returns:
+            str: 页面指纹，获取失败时返回 None
+        """
+        try:
+            snapshot = HierarchySnapshot.capture(self.driver)
+            if on_snapshot:
+                on_snapshot(snapshot)
+            return snapshot.fingerprint()
+        except Exception as e:
+            Logger.debug(f'获取页面快照失败: {str(e)}')
+            return None
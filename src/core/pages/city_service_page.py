@@ -25,4 +25,8 @@ class CityServicePage(BasePage):
 
     async def click_scan(self):
         """点击扫一扫按钮"""
-        return await self.click_element(self.LOCATORS['scan_button']) 
\ No newline at end of file
+        return await self.click_element(self.LOCATORS['scan_button']) 
+
+    async def click_home_tab(self):
+        """点击底部导航栏的闲鱼tab，回到首页"""
+        return await self.click_element(self.LOCATORS['home_tab'])
@@ -2,6 +2,9 @@ from appium.webdriver.common.appiumby import AppiumBy
 from .base_page import BasePage
 import asyncio
 from utils.logger import Logger
+from config.app_config import DETAIL_BROWSE_CONFIG
+from core.extract import capture_detail_fields, extract_listing
+from core.snapshot import HierarchySnapshot
 
 class DetailPage(BasePage):
     # 页面特征元素 - 只使用已确认的元素
@@ -10,41 +13,56 @@ class DetailPage(BasePage):
         (AppiumBy.XPATH, "//android.view.View[@content-desc='我想要, 我想要']")
     ]
 
+    # 详情页基本是静态的，短暂等待空闲即可
+    # 不打开 ignoreUnimportantViews：它会改变元素查找结果，下一次识别页面时仍然生效，
+    # 只在 HierarchySnapshot 获取快照期间临时打开
+    PERFORMANCE_PROFILE = {
+        'waitForIdleTimeout': 500,
+    }
+
     # 页面元素定位器 - 只保留已确认的元素
     LOCATORS = {
         'sell_similar': (AppiumBy.XPATH, "//android.view.View[@content-desc='卖同款, 卖同款']"),
-        'want_item': (AppiumBy.XPATH, "//android.view.View[@content-desc='我想要, 我想要']")
+        'want_item': (AppiumBy.XPATH, "//android.view.View[@content-desc='我想要, 我想要']"),
+        # 收藏按钮（待确认），content-desc 会带上收藏数，例如 "收藏, 12"
+        'favorite_button': (AppiumBy.XPATH, "//*[starts-with(@content-desc,'收藏')]"),
     }
 
+    def __init__(self, driver):
+        super().__init__(driver)
+        self.captured_fields = {}  # 最近一次浏览时提取的商品信息
+
     async def browse_page(self):
-        """浏览详情页"""
-        # 配置详情页的浏览参数
-        scroll_config = {
-            'min_times': 3,      # 最少滑动3次
-            'max_times': 5,      # 最多滑动5次
-            'up_probability': 0.8,  # 80%概率向上滑动
-            'initial_wait': (2, 4),  # 初始等待2-4秒
-            'scroll_wait': (1, 3),   # 每次滑动后等待1-3秒
-            'final_wait': (2, 4)     # 最后等待2-4秒
-        }
+        """浏览详情页
+
+        页面滑到底后提前结束，浏览过程中逐步提取商品信息，结果保存在 captured_fields 中。
+
+        Returns:
+            bool: 是否成功完成浏览
+        """
+        self.captured_fields = {}
+        scroll_config = dict(DETAIL_BROWSE_CONFIG)
+        scroll_config['on_snapshot'] = lambda snapshot: capture_detail_fields(snapshot, self.captured_fields)
         
         return await self.simulate_browse(scroll_config)
 
     async def get_item_info(self):
-        """获取商品信息"""
-        title = await self.get_element_text(self.LOCATORS['title'])
-        price = await self.get_element_text(self.LOCATORS['price'])
-        description = await self.get_element_text(self.LOCATORS['description'])
-        
-        return {
-            'title': title,
-            'price': price,
-            'description': description
-        }
+        """获取商品信息
+
+        只请求一次页面层级，在本地解析出所有字段。
+
+        Returns:
+            ListingRecord: 商品记录，获取失败时返回 None
+        """
+        try:
+            return extract_listing(HierarchySnapshot.capture(self.driver))
+        except Exception as e:
+            Logger.error('获取商品信息失败', e)
+            return None
 
     async def contact_seller(self):
-        """联系卖家"""
-        return await self.click_element(self.LOCATORS['contact_button'])
+        """联系卖家（点击"我想要"进入聊天）"""
+        return await self.click_element(self.LOCATORS['want_item'])
 
     async def add_to_favorite(self):
         """收藏商品"""
@@ -52,7 +70,13 @@ class DetailPage(BasePage):
 
     async def go_back(self):
         """返回上一页"""
-        return await self.click_element(self.LOCATORS['back_button'])
+        try:
+            async with self.limiter.action('back'):
+                self.driver.back()
+            return True
+        except Exception as e:
+            Logger.error('返回上一页失败', e)
+            return False
     
     async def sell_similar_item(self):
         """点击卖同款"""
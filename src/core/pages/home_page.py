@@ -1,6 +1,10 @@
 from appium.webdriver.common.appiumby import AppiumBy
 from selenium.common.exceptions import StaleElementReferenceException
 from .base_page import BasePage
+from utils.logger import Logger
+from config.app_config import SNAPSHOT_CONFIG
+from core.snapshot import HierarchySnapshot
+from core import deadline
 import asyncio
 
 class HomePage(BasePage):
@@ -12,6 +16,13 @@ class HomePage(BasePage):
         ("content-desc-pattern", r"^闲鱼，未读消息数\d*，选中状态$"),
     ]
 
+    # 首页商品流一直有动画，等待空闲只会白白耗到超时
+    PERFORMANCE_PROFILE = {
+        'waitForIdleTimeout': 0,
+        'actionAcknowledgmentTimeout': 500,
+        'scrollAcknowledgmentTimeout': 100,
+    }
+
     # 页面元素定位器
     LOCATORS = {
         'scan_button': (AppiumBy.XPATH, "//*[@content-desc='扫一扫']"),
@@ -67,7 +78,7 @@ class HomePage(BasePage):
                 return visible_items
                 
             except StaleElementReferenceException:
-                if attempt < max_retries - 1:
+                if attempt < max_retries - 1 and not deadline.expired():
                     await asyncio.sleep(1)
                     # 重新获取容器
                     container = await self.wait_for_element(self.LOCATORS['item_container'])
@@ -88,7 +99,7 @@ class HomePage(BasePage):
                 if container and container.is_displayed():
                     return container
             except Exception as e:
-                if attempt < max_retries - 1:
+                if attempt < max_retries - 1 and not deadline.expired():
                     await asyncio.sleep(1)
                 continue
         return None
@@ -113,11 +124,27 @@ class HomePage(BasePage):
                 return None
                 
             except StaleElementReferenceException:
-                if attempt < max_retries - 1:
+                if attempt < max_retries - 1 and not deadline.expired():
                     await asyncio.sleep(1)
                 continue
             except Exception as e:
                 self.logger.error('获取商品标题失败', e)
                 return None
         
-        return None 
\ No newline at end of file
+        return None
+
+    async def scroll_page(self):
+        """滚动商品列表，加载下一屏商品"""
+        return await self.scroll_up()
+
+    def get_feed_snapshot(self):
+        """一次请求获取商品流的快照，只解析商品列表容器内的节点
+
+        Returns:
+            HierarchySnapshot: 快照，获取失败时返回 None
+        """
+        try:
+            return HierarchySnapshot.capture(self.driver, scope=SNAPSHOT_CONFIG['feed_scope'])
+        except Exception as e:
+            Logger.error('获取商品流快照失败', e)
+            return None
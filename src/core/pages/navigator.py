@@ -0,0 +1,210 @@
+import heapq
+import itertools
+import time
+
+from utils.logger import Logger
+from config.app_config import XIANYU_PACKAGE, NAVIGATION_CONFIG
+from core.throttle import get_limiter
+from core.metrics import get_metrics
+from core.recorder import get_recorder
+from core.deadline import remaining
+from .page_graph import PAGE_EDGES, ANY_PAGE
+
+class Navigator:
+    """页面导航器
+
+    根据页面跳转图规划到目标页面的最低代价路线并执行。每条边的代价由实测耗时
+    和成功率共同决定：代价 = 平均耗时 / 成功率。路线走不通时，最后依次尝试
+    激活应用和重启应用，且重启次数有上限。
+    """
+
+    def __init__(self, driver, page_factory, edges=None, config=None):
+        """初始化导航器
+
+        Args:
+            driver: Appium WebDriver 实例
+            page_factory: 页面工厂实例
+            edges: 可选，页面跳转边列表，默认使用 PAGE_EDGES
+            config: 可选，覆盖 NAVIGATION_CONFIG 中的配置
+        """
+        self.driver = driver
+        self.page_factory = page_factory
+        self.limiter = get_limiter(driver)
+        self.edges = list(edges or PAGE_EDGES)
+        self.config = dict(NAVIGATION_CONFIG)
+        if config:
+            self.config.update(config)
+        self._stats = {
+            edge: {'time': edge.cost, 'attempts': 0, 'successes': 0}
+            for edge in self.edges
+        }
+
+    def edge_cost(self, edge):
+        """计算边的当前代价（秒）"""
+        stats = self._stats[edge]
+        success_rate = (stats['successes'] + 1) / (stats['attempts'] + 2)
+        return stats['time'] / success_rate
+
+    def _record(self, edge, duration, success):
+        """记录一次跳转的实测耗时和结果"""
+        stats = self._stats[edge]
+        stats['attempts'] += 1
+        if success:
+            stats['successes'] += 1
+        stats['time'] = 0.3 * duration + 0.7 * stats['time']
+
+    def plan(self, source, target, excluded=()):
+        """规划从 source 到 target 的最低代价路线
+
+        Args:
+            source: 起始页面类，None 表示无法识别的页面
+            target: 目标页面类
+            excluded: 本次导航中需要跳过的边
+
+        Returns:
+            list: 按顺序执行的边列表，无法到达时返回 None
+        """
+        if source is target:
+            return []
+
+        counter = itertools.count()
+        queue = [(0.0, next(counter), source, [])]
+        visited = set()
+        while queue:
+            cost, _, page_class, route = heapq.heappop(queue)
+            if page_class is target:
+                return route
+            if page_class in visited:
+                continue
+            visited.add(page_class)
+
+            for edge in self.edges:
+                if edge in excluded:
+                    continue
+                if edge.source is not page_class and edge.source != ANY_PAGE:
+                    continue
+                if edge.target in visited:
+                    continue
+                heapq.heappush(queue, (
+                    cost + self.edge_cost(edge),
+                    next(counter),
+                    edge.target,
+                    route + [edge]
+                ))
+        return None
+
+    async def _current_class(self):
+        page = await self.page_factory.get_current_page()
+        return type(page) if page else None
+
+    async def _observe(self, from_class, target, timeout):
+        """等待页面跳转完成
+
+        Returns:
+            type: 跳转后所在的页面类，无法识别时返回 None
+        """
+        def landed(page):
+            page_class = type(page) if page else None
+            return page_class is target or (page_class is not None and page_class is not from_class)
+
+        # 交给页面工厂等待：后台采样运行时共享它的采样结果，不再单独轮询
+        _, page = await self.page_factory.wait_for(landed, remaining(timeout))
+        return type(page) if page else None
+
+    async def _perform(self, edge, from_class):
+        """执行一条边对应的动作"""
+        try:
+            if edge.action == 'back':
+                async with self.limiter.action('back'):
+                    self.driver.back()
+                return True
+            if edge.action == 'tap_home_tab':
+                page = self.page_factory._get_page_instance(from_class)
+                return await page.click_home_tab()
+            if edge.action == 'click_search':
+                page = self.page_factory._get_page_instance(from_class)
+                return await page.click_search()
+            if edge.action == 'deep_link':
+                url = self.config['deep_links'].get(edge.target.__name__)
+                if not url:
+                    return False
+                async with self.limiter.action('navigate'):
+                    self.driver.execute_script('mobile: deepLink', {
+                        'url': url,
+                        'package': XIANYU_PACKAGE
+                    })
+                return True
+            Logger.warn(f'未知的跳转动作: {edge.action}')
+            return False
+        except Exception as e:
+            Logger.debug(f'跳转动作 {edge.action} 执行失败: {str(e)}')
+            return False
+
+    async def _relaunch(self, target):
+        """激活或重启应用，作为最后手段"""
+        for attempt in range(self.config['relaunch_limit']):
+            try:
+                Logger.warn('导航失败，尝试激活应用...')
+                async with self.limiter.action('navigate'):
+                    self.driver.activate_app(XIANYU_PACKAGE)
+                self.page_factory.notify_action()
+                if await self._observe(None, target, self.config['verify_timeout']) is target:
+                    return True
+
+                Logger.warn(f'重启应用 ({attempt + 1}/{self.config["relaunch_limit"]})...')
+                get_metrics(self.driver).session_restarted('app')
+                get_recorder(self.driver).session_lost('导航失败，重启应用')
+                async with self.limiter.action('navigate'):
+                    self.driver.terminate_app(XIANYU_PACKAGE)
+                    self.driver.activate_app(XIANYU_PACKAGE)
+                self.page_factory.notify_action()
+                landed = await self._observe(None, target, self.config['verify_timeout'] * 3)
+                if landed is target:
+                    return True
+                if landed is not None and await self.navigate_to(target, allow_relaunch=False):
+                    return True
+            except Exception as e:
+                Logger.error('重启应用失败', e)
+        return False
+
+    async def navigate_to(self, target, allow_relaunch=True):
+        """导航到目标页面
+
+        Args:
+            target: 目标页面类
+            allow_relaunch: 路线走不通时是否允许激活或重启应用
+
+        Returns:
+            bool: 是否成功到达目标页面
+        """
+        current = await self._current_class()
+        if current is target:
+            return True
+
+        excluded = set()
+        for _ in range(self.config['max_steps']):
+            route = self.plan(current, target, excluded)
+            if not route:
+                break
+
+            edge = route[0]
+            source_name = current.__name__ if current else '未知页面'
+            Logger.debug(f'导航: {source_name} -> {edge.target.__name__} ({edge.action})')
+
+            start = time.monotonic()
+            landed = current
+            if await self._perform(edge, current):
+                self.page_factory.notify_action()
+                landed = await self._observe(current, edge.target, self.config['verify_timeout'])
+            self._record(edge, time.monotonic() - start, landed is edge.target)
+
+            if landed is target:
+                return True
+            if landed is current:
+                # 动作没有带来页面变化，本次导航不再尝试这条边
+                excluded.add(edge)
+            current = landed
+
+        if allow_relaunch:
+            return await self._relaunch(target)
+        return False
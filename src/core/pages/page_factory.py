@@ -1,5 +1,14 @@
 import asyncio
+import time
 from utils.logger import Logger
+from core import tracing
+from core import deadline
+from core.metrics import get_metrics
+from core.recorder import get_recorder
+from core.profiles import get_settings_state, resolve_profile
+from config.app_config import PROFILE_CONFIG
+from .navigator import Navigator
+from .page_observer import PageObserver
 
 class PageFactory:
     def __init__(self, driver):
@@ -7,6 +16,15 @@ class PageFactory:
         self.current_page = None
         self._pages = {}  # 页面实例缓存
         self._page_identifiers = {}  # 页面标识符配置
+        self._navigator = None
+        self.observer = None
+
+    @property
+    def navigator(self):
+        """页面导航器，首次使用时创建"""
+        if self._navigator is None:
+            self._navigator = Navigator(self.driver, self)
+        return self._navigator
 
     def register_page(self, page_class, identifiers):
         """
@@ -19,8 +37,53 @@ class PageFactory:
         self._page_identifiers[page_class] = identifiers
         Logger.debug(f"注册页面类: {page_class.__name__}")
 
+    def start_observer(self, config=None):
+        """启动页面观察器，之后的页面等待共享同一个后台采样
+
+        Args:
+            config: 可选，覆盖 OBSERVER_CONFIG 中的配置
+
+        Returns:
+            PageObserver: 页面观察器实例
+        """
+        if self.observer is None:
+            self.observer = PageObserver(self, config)
+        self.observer.start()
+        return self.observer
+
+    async def stop_observer(self):
+        """停止页面观察器"""
+        if self.observer:
+            await self.observer.stop()
+            self.observer = None
+
+    def notify_action(self):
+        """通知页面观察器刚刚执行了可能切换页面的操作"""
+        if self.observer:
+            self.observer.notify_action()
+
     async def get_current_page(self):
-        """识别当前页面并返回对应的页面对象"""
+        """获取当前页面对象
+
+        页面观察器运行中且最近一次采样仍然有效时直接使用采样结果，
+        否则立即识别一次。
+        """
+        observer = self.observer
+        if observer and observer.running and not observer.stale:
+            if time.monotonic() - observer.last_sample_time <= observer.config['fast_interval']:
+                return observer.current_page
+        return await self.identify_page()
+
+    async def identify_page(self):
+        """识别当前页面并返回对应的页面对象，同时记录识别耗时"""
+        start = time.monotonic()
+        page = await self._identify_page()
+        name, seconds = type(page).__name__ if page else 'unknown', time.monotonic() - start
+        get_metrics(self.driver).observe_identify(name, seconds)
+        get_recorder(self.driver).record_command(f'identify_page:{name}', seconds)
+        return page
+
+    async def _identify_page(self):
         # 首先检查当前页面是否仍然有效
         if self.current_page:
             page = self._get_page_instance(self.current_page.__class__)
@@ -56,6 +119,7 @@ class PageFactory:
                         if self.current_page != page:
                             Logger.info(f"页面切换: {page_class.__name__}")
                             self.current_page = page
+                            self.apply_profile(page_class)
                         return page
             except Exception as e:
                 Logger.debug(f"检查页面 {page_class.__name__} 时出错: {str(e)}")
@@ -65,12 +129,43 @@ class PageFactory:
         Logger.debug("无法识别当前页面")
         return None
 
+    def apply_profile(self, page_class):
+        """应用页面类声明的 Appium 设置，只发送与当前值不同的项"""
+        if not PROFILE_CONFIG['enabled']:
+            return
+        changed = get_settings_state(self.driver).apply(resolve_profile(page_class))
+        if changed:
+            Logger.debug(f'{page_class.__name__} 设置已更新: {sorted(changed)}')
+
     def _get_page_instance(self, page_class):
         """获取或创建页面实例"""
         if page_class not in self._pages:
             self._pages[page_class] = page_class(self.driver)
         return self._pages[page_class]
 
+    async def wait_for(self, predicate, timeout=10):
+        """等待当前页面满足条件，后台采样运行时等待共享的采样结果，否则轮询
+
+        Args:
+            predicate: 接收当前页面对象（可能为 None），返回是否满足条件
+            timeout: 超时时间（秒）
+
+        Returns:
+            tuple: (是否满足条件, 最后一次识别到的页面对象)
+        """
+        timeout = deadline.remaining(timeout)
+        if self.observer and self.observer.running:
+            return await self.observer.wait_for(predicate, timeout)
+
+        current_page = None
+        start_time = asyncio.get_event_loop().time()
+        while (asyncio.get_event_loop().time() - start_time) < timeout:
+            current_page = await self.get_current_page()
+            if predicate(current_page):
+                return True, current_page
+            await tracing.sleep(deadline.remaining(0.5), 'poll_wait')
+        return False, current_page
+
     async def wait_for_page(self, expected_page_class, timeout=10):
         """
         等待直到出现指定页面
@@ -82,10 +177,5 @@ class PageFactory:
         Returns:
             bool: 是否成功等待到指定页面
         """
-        start_time = asyncio.get_event_loop().time()
-        while (asyncio.get_event_loop().time() - start_time) < timeout:
-            current_page = await self.get_current_page()
-            if isinstance(current_page, expected_page_class):
-                return True
-            await asyncio.sleep(0.5)
-        return False 
\ No newline at end of file
+        matched, _ = await self.wait_for(lambda page: isinstance(page, expected_page_class), timeout)
+        return matched
@@ -0,0 +1,36 @@
+from typing import NamedTuple, Optional
+
+from .home_page import HomePage
+from .city_service_page import CityServicePage
+from .detail_page import DetailPage
+from .search_page import SearchPage
+
+# 任意页面（包括无法识别的页面）
+ANY_PAGE = '*'
+
+
+class PageEdge(NamedTuple):
+    """页面跳转边
+
+    Attributes:
+        source: 起始页面类，None 表示无法识别的页面，ANY_PAGE 表示任意页面
+        target: 目标页面类
+        action: 跳转动作：back（返回键）、tap_home_tab（点击闲鱼tab）、
+            click_search（点击首页搜索框）、deep_link（深度链接）
+        cost: 预估耗时（秒），运行时会根据实测耗时和成功率修正
+    """
+    source: Optional[object]
+    target: type
+    action: str
+    cost: float
+
+
+# 页面跳转图
+PAGE_EDGES = [
+    PageEdge(DetailPage, HomePage, 'back', 2.0),
+    PageEdge(SearchPage, HomePage, 'back', 2.0),
+    PageEdge(CityServicePage, HomePage, 'tap_home_tab', 1.5),
+    PageEdge(HomePage, SearchPage, 'click_search', 1.5),
+    PageEdge(None, HomePage, 'back', 2.5),
+    PageEdge(ANY_PAGE, HomePage, 'deep_link', 4.0),
+]
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from typing import NamedTuple, Optional
+
+from utils.logger import Logger
+from config.app_config import OBSERVER_CONFIG
+from core.deadline import remaining as budget_remaining
+
+
+class PageChange(NamedTuple):
+    """页面切换事件"""
+    previous: Optional[object]
+    current: Optional[object]
+    timestamp: float
+
+
+class PageObserver:
+    """页面观察器
+
+    每个会话只运行一个后台采样协程，识别当前页面并发布页面切换事件。
+    采样间隔自适应：操作之后立即加快采样，页面长时间不变则逐步放慢。
+    任意数量的 wait_for_page 调用共享同一次采样结果，不会各自轮询。
+    """
+
+    def __init__(self, page_factory, config=None):
+        """初始化页面观察器
+
+        Args:
+            page_factory: 页面工厂实例
+            config: 可选，覆盖 OBSERVER_CONFIG 中的配置
+        """
+        self.page_factory = page_factory
+        self.config = dict(OBSERVER_CONFIG)
+        if config:
+            self.config.update(config)
+
+        self.current_page = None
+        self.last_sample_time = None
+        self.stale = True  # 操作之后、下一次采样之前，当前结果视为过期
+        self._interval = self.config['fast_interval']
+        self._wake = asyncio.Event()
+        self._observation = None
+        self._subscribers = set()
+        self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """启动后台采样"""
+        if not self.running:
+            self._task = asyncio.ensure_future(self._run())
+            Logger.debug('页面观察器已启动')
+
+    async def stop(self):
+        """停止后台采样"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            Logger.debug('页面观察器已停止')
+
+    def notify_action(self):
+        """通知观察器刚刚执行了操作，立即切换到快速采样"""
+        self.stale = True
+        self._interval = self.config['fast_interval']
+        self._wake.set()
+
+    def subscribe(self):
+        """订阅页面切换事件
+
+        Returns:
+            asyncio.Queue: 接收 PageChange 事件的队列
+        """
+        queue = asyncio.Queue()
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        """取消订阅页面切换事件"""
+        self._subscribers.discard(queue)
+
+    def _next_observation(self):
+        """获取下一次采样结果的共享 Future"""
+        if self._observation is None or self._observation.done():
+            self._observation = asyncio.get_event_loop().create_future()
+        return self._observation
+
+    def _publish(self, page):
+        """发布一次采样结果"""
+        previous = self.current_page
+        self.current_page = page
+        self.last_sample_time = time.monotonic()
+        self.stale = False
+
+        observation, self._observation = self._observation, None
+        if observation and not observation.done():
+            observation.set_result(page)
+
+        changed = type(previous) is not type(page)
+        if changed:
+            event = PageChange(previous, page, time.time())
+            for queue in self._subscribers:
+                queue.put_nowait(event)
+        return changed
+
+    async def _run(self):
+        """后台采样循环"""
+        while True:
+            try:
+                page = await self.page_factory.identify_page()
+                if self._publish(page):
+                    self._interval = self.config['fast_interval']
+                else:
+                    self._interval = min(
+                        self.config['idle_interval'],
+                        self._interval * self.config['backoff']
+                    )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                Logger.debug(f'页面采样出错: {str(e)}')
+                self._interval = self.config['idle_interval']
+
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def wait_for(self, predicate, timeout=10):
+        """等待采样结果满足条件
+
+        Args:
+            predicate: 接收采样到的页面对象（可能为 None），返回是否满足条件
+            timeout: 超时时间（秒）
+
+        Returns:
+            tuple: (是否满足条件, 最后一次采样到的页面对象)
+        """
+        self.notify_action()
+        deadline = time.monotonic() + budget_remaining(timeout)
+        page = self.current_page
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False, page
+            try:
+                page = await asyncio.wait_for(
+                    asyncio.shield(self._next_observation()),
+                    remaining
+                )
+            except asyncio.TimeoutError:
+                return False, page
+            if predicate(page):
+                return True, page
+
+    async def wait_for_page(self, expected_page_class, timeout=10):
+        """等待直到出现指定页面
+
+        Args:
+            expected_page_class: 期望的页面类
+            timeout: 超时时间（秒）
+
+        Returns:
+            bool: 是否成功等待到指定页面
+        """
+        matched, _ = await self.wait_for(lambda page: isinstance(page, expected_page_class), timeout)
+        return matched
@@ -0,0 +1,124 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import StaleElementReferenceException
+from .base_page import BasePage
+import asyncio
+import re
+
+from utils.logger import Logger
+
+class SearchPage(BasePage):
+    # 页面特征元素（待在更多机型上确认）
+    # 点击首页搜索框后进入的输入页和搜索结果页都有输入框和"搜索"按钮，导航图的 click_search 边据此确认到达。
+    # 只看输入框会把聊天页等带输入框的页面也认成搜索页；筛选、排序标签只在结果页出现，不能用作标识。
+    # 首页搜索栏也有"搜索"字样但不是输入框，因此输入框放在第一个（停留在当前页面时只检查第一个标识符）
+    IDENTIFIERS = [
+        (AppiumBy.CLASS_NAME, "android.widget.EditText"),
+        (AppiumBy.XPATH, "//*[@text='搜索' or @content-desc='搜索']"),
+    ]
+
+    # 搜索结果刷新后列表会有加载动画
+    PERFORMANCE_PROFILE = {
+        'waitForIdleTimeout': 100,
+    }
+
+    # 页面元素定位器
+    LOCATORS = {
+        'search_input': (AppiumBy.CLASS_NAME, "android.widget.EditText"),
+        'search_button': (AppiumBy.XPATH, "//*[@text='搜索' or @content-desc='搜索']"),
+        'sort_button': (AppiumBy.XPATH, "//*[@text='综合' or @content-desc='综合']"),
+        'sort_newest': (AppiumBy.XPATH, "//*[@text='最新发布' or @content-desc='最新发布']"),
+        'result_container': (AppiumBy.CLASS_NAME, "androidx.recyclerview.widget.RecyclerView"),
+    }
+
+    PRICE_PATTERN = re.compile(r'^[¥￥]?\s*\d+(\.\d+)?$')
+    AGE_PATTERN = re.compile(r'刚刚|\d+\s*(秒|分钟|小时|天)前')
+
+    async def search(self, keyword):
+        """输入关键词并搜索
+
+        Args:
+            keyword: 搜索关键词
+
+        Returns:
+            bool: 是否成功提交搜索
+        """
+        search_input = await self.wait_for_element(self.LOCATORS['search_input'], timeout=5)
+        if not search_input:
+            Logger.warn('未找到搜索输入框')
+            return False
+
+        async with self.limiter.action('tap'):
+            search_input.click()
+        async with self.limiter.action('search'):
+            search_input.clear()
+            search_input.send_keys(keyword)
+
+        if not await self.click_element(self.LOCATORS['search_button'], timeout=2):
+            # 没有搜索按钮时使用回车键提交
+            async with self.limiter.action('tap'):
+                self.driver.press_keycode(66)
+        Logger.debug(f'已提交搜索: {keyword}')
+        await asyncio.sleep(1)
+        return True
+
+    async def sort_by_newest(self):
+        """将搜索结果切换为按最新发布排序"""
+        if not await self.click_element(self.LOCATORS['sort_button'], timeout=3):
+            Logger.warn('未找到排序按钮')
+            return False
+        await asyncio.sleep(0.5)
+        if not await self.click_element(self.LOCATORS['sort_newest'], timeout=3):
+            Logger.warn('未找到"最新发布"排序选项')
+            return False
+        await asyncio.sleep(1)
+        return True
+
+    async def pull_to_refresh(self):
+        """下拉刷新搜索结果"""
+        return await self.scroll_down()
+
+    async def get_top_cards(self, top_n=10):
+        """读取结果列表前 N 个商品卡片
+
+        Args:
+            top_n: 读取的卡片数量
+
+        Returns:
+            list: 卡片字典列表，包含 element、title、price、age_text 字段
+        """
+        container = await self.wait_for_element(self.LOCATORS['result_container'], timeout=5)
+        if not container:
+            return []
+
+        cards = []
+        try:
+            items = container.find_elements(
+                by=AppiumBy.CLASS_NAME,
+                value="android.widget.FrameLayout"
+            )
+            for item in items:
+                if len(cards) >= top_n:
+                    break
+                if not item.is_displayed():
+                    continue
+
+                texts = [
+                    element.text for element in item.find_elements(
+                        by=AppiumBy.CLASS_NAME,
+                        value="android.widget.TextView"
+                    ) if element.text
+                ]
+                if not texts:
+                    continue
+
+                cards.append({
+                    'element': item,
+                    'title': texts[0],
+                    'price': next((t for t in texts if self.PRICE_PATTERN.match(t)), ''),
+                    'age_text': next((t for t in texts if self.AGE_PATTERN.search(t)), ''),
+                })
+        except StaleElementReferenceException:
+            Logger.debug('结果列表已刷新，本轮卡片读取中断')
+        except Exception as e:
+            Logger.error('读取搜索结果失败', e)
+        return cards
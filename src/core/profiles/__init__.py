@@ -0,0 +1,7 @@
+from .settings import DriverSettings, get_settings_state, UIAUTOMATOR2_DEFAULTS
+from .profile import resolve_profile, reset_profiles, load_bench_results
+
+__all__ = [
+    'DriverSettings', 'get_settings_state', 'UIAUTOMATOR2_DEFAULTS',
+    'resolve_profile', 'reset_profiles', 'load_bench_results',
+]
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""页面 Appium 设置性能测试
+
+逐页尝试 PROFILE_CONFIG['bench_candidates'] 中的候选值，测量识别页面和查找元素的耗时，
+为每个页面选出最快且不影响识别结果的设置，保存到 PROFILE_CONFIG['bench_path']，
+之后 PageFactory 切换页面时会自动使用。
+
+在 src 目录下运行：
+    python -m core.profiles.bench                        # 测试所有页面
+    python -m core.profiles.bench --page HomePage        # 只测试首页
+    python -m core.profiles.bench --replay /path/to/dir  # 使用录制的页面回放，检查流程
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 将 src 目录添加到 Python 路径
+src_path = str(Path(__file__).parents[2].absolute())
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from utils.logger import Logger
+from config.app_config import PROFILE_CONFIG
+from core.profiles import get_settings_state, resolve_profile, load_bench_results
+
+
+async def _probe(page, locators):
+    """执行一轮识别和查找，返回 (耗时, 特征元素是否全部找到)"""
+    start = time.perf_counter()
+    found = True
+    for locator in page.IDENTIFIERS:
+        if not await page.is_element_present(locator, timeout=1):
+            found = False
+    for locator in locators:
+        try:
+            page.driver.find_elements(*locator)
+        except Exception:
+            pass
+    return time.perf_counter() - start, found
+
+
+async def bench_page(page_factory, page_class, candidates=None, rounds=None):
+    """为一个页面选出最快的设置
+
+    按坐标下降逐项尝试候选值：固定其他项，只改变当前项，取耗时中位数最小且
+    每一轮都能识别出页面的值，比当前值快不到 5% 时保留当前值。
+
+    Args:
+        page_factory: 页面工厂
+        page_class: 页面类
+        candidates: 可选，候选值，默认使用 PROFILE_CONFIG['bench_candidates']
+        rounds: 可选，每个候选值的测试次数
+
+    Returns:
+        dict: 选出的设置，无法进入该页面时返回 None
+    """
+    candidates = candidates or PROFILE_CONFIG['bench_candidates']
+    rounds = rounds or PROFILE_CONFIG['bench_rounds']
+    if not await page_factory.navigator.navigate_to(page_class):
+        Logger.warn(f'无法进入 {page_class.__name__}，跳过')
+        return None
+
+    page = page_factory._get_page_instance(page_class)
+    locators = [locator for locator in page.LOCATORS.values() if locator[0] != 'content-desc-pattern']
+    state = get_settings_state(page_factory.driver)
+    best = dict(resolve_profile(page_class))
+    Logger.info(f'===== {page_class.__name__} =====')
+
+    for key, values in candidates.items():
+        timings = {}
+        for value in values:
+            state.apply(dict(best, **{key: value}))
+            samples = []
+            for _ in range(rounds):
+                seconds, found = await _probe(page, locators)
+                if not found:
+                    samples = None
+                    break
+                samples.append(seconds)
+            if samples is None:
+                Logger.info(f'{key:<28} = {value!s:<6} 无法识别页面，排除')
+                continue
+            timings[value] = statistics.median(samples)
+            Logger.info(f'{key:<28} = {value!s:<6} {timings[value] * 1000:>8.1f} 毫秒')
+        if timings:
+            # 与当前值相差不到 5% 时保留当前值，避免被测量噪声带偏
+            choice = min(timings, key=timings.get)
+            current = best.get(key)
+            if current not in timings or timings[choice] < timings[current] * 0.95:
+                best[key] = choice
+    state.apply(best)
+    Logger.success(f'{page_class.__name__} 最佳设置: {best}')
+    return best
+
+
+def save_results(results: dict, path: str = None):
+    """合并保存测试结果"""
+    path = path or PROFILE_CONFIG['bench_path']
+    merged = load_bench_results(path)
+    merged.update(results)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(merged, file, ensure_ascii=False, indent=2)
+    Logger.info(f'测试结果已保存: {path}')
+
+
+async def run_benchmark(page_names=None, device=None, save=True):
+    """测试各页面并保存结果
+
+    Args:
+        page_names: 可选，只测试这些页面类名
+        device: 可选，设备配置，格式同 FLEET_CONFIG['devices']
+        save: 是否保存结果
+
+    Returns:
+        dict: 页面类名 -> 选出的设置
+    """
+    from core.drivers import create_driver, create_page_factory
+
+    driver = create_driver(device or {'id': 'bench'})
+    page_factory = create_page_factory(driver)
+    results = {}
+    try:
+        for page_class in list(page_factory._page_identifiers):
+            if page_names and page_class.__name__ not in page_names:
+                continue
+            best = await bench_page(page_factory, page_class)
+            if best is not None:
+                results[page_class.__name__] = best
+    finally:
+        try:
+            driver.quit()
+        except Exception as e:
+            Logger.error('关闭会话时出错', e)
+    if save and results:
+        save_results(results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='页面 Appium 设置性能测试')
+    parser.add_argument('--page', action='append', help='只测试指定的页面类，可以重复')
+    parser.add_argument('--udid', help='设备 udid')
+    parser.add_argument('--replay', help='使用录制的页面回放代替真实设备')
+    parser.add_argument('--dry-run', action='store_true', help='不保存结果')
+    args = parser.parse_args()
+
+    device = {'id': args.udid or 'bench', 'udid': args.udid, 'replay': args.replay}
+    asyncio.run(run_benchmark(args.page, device, save=not args.dry_run))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import json
+import os
+
+from config.app_config import PROFILE_CONFIG
+from utils.logger import Logger
+
+_bench_results = None
+_resolved = {}
+
+
+def load_bench_results(path: str = None) -> dict:
+    """读取性能测试得到的各页面设置
+
+    Returns:
+        dict: 页面类名 -> 设置，文件不存在时为空字典
+    """
+    path = path or PROFILE_CONFIG['bench_path']
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except Exception as e:
+        Logger.error(f'读取页面设置测试结果失败: {path}', e)
+        return {}
+
+
+def resolve_profile(page_class) -> dict:
+    """计算页面类最终使用的 Appium 设置
+
+    按继承顺序合并各页面类声明的 PERFORMANCE_PROFILE，再依次用 PROFILE_CONFIG['overrides']
+    和性能测试结果中 bench_candidates 包含的项覆盖。
+
+    Args:
+        page_class: 页面类
+
+    Returns:
+        dict: 设置项
+    """
+    global _bench_results
+    profile = _resolved.get(page_class)
+    if profile is not None:
+        return profile
+    if _bench_results is None:
+        _bench_results = load_bench_results() if PROFILE_CONFIG['use_bench_results'] else {}
+
+    profile = {}
+    for klass in reversed(page_class.__mro__):
+        profile.update(klass.__dict__.get('PERFORMANCE_PROFILE') or {})
+    profile.update(PROFILE_CONFIG['overrides'].get(page_class.__name__, {}))
+    # 只采用仍在测试范围内的项，旧的测试结果中可能还保存着已经不再测试的设置
+    candidates = PROFILE_CONFIG['bench_candidates']
+    profile.update({
+        key: value for key, value in _bench_results.get(page_class.__name__, {}).items()
+        if key in candidates
+    })
+    _resolved[page_class] = profile
+    return profile
+
+
+def reset_profiles():
+    """清空缓存，重新读取配置和测试结果"""
+    global _bench_results
+    _bench_results = None
+    _resolved.clear()
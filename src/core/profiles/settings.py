@@ -0,0 +1,110 @@
+import weakref
+
+from utils.logger import Logger
+
+# UiAutomator2 的默认设置值，还没有设置过的项按这些值计算差异
+UIAUTOMATOR2_DEFAULTS = {
+    'waitForIdleTimeout': 10000,
+    'waitForSelectorTimeout': 10000,
+    'actionAcknowledgmentTimeout': 3000,
+    'scrollAcknowledgmentTimeout': 200,
+    'ignoreUnimportantViews': False,
+    'snapshotMaxDepth': 70,
+    'implicitWait': 0,
+}
+
+# 不是 Appium 设置，通过 WebDriver 接口单独设置的项（毫秒）
+IMPLICIT_WAIT = 'implicitWait'
+
+
+class DriverSettings:
+    """记录驱动当前的 Appium 设置
+
+    每次只发送与当前值不同的项，切换页面时通常只需要一两项，甚至不需要请求。
+    驱动不支持的设置记录下来，之后不再发送。
+    """
+
+    def __init__(self, driver):
+        self._driver = weakref.ref(driver)
+        self.current = {}
+        self.unsupported = set()
+        self.updates = 0  # 实际发出的设置请求次数
+
+    def value(self, key):
+        """当前值，没有设置过时返回驱动默认值"""
+        return self.current.get(key, UIAUTOMATOR2_DEFAULTS.get(key))
+
+    def apply(self, settings: dict) -> dict:
+        """应用设置，只发送变化的项
+
+        Args:
+            settings: 设置项
+
+        Returns:
+            dict: 发生变化的项原来的值，可以再传给 apply 恢复
+        """
+        driver = self._driver()
+        changed = {
+            key: value for key, value in settings.items()
+            if key not in self.unsupported and self.value(key) != value
+        }
+        if driver is None or not changed:
+            return {}
+        previous = {key: self.value(key) for key in changed}
+
+        if IMPLICIT_WAIT in changed:
+            value = changed.pop(IMPLICIT_WAIT)
+            try:
+                driver.implicitly_wait(value / 1000)
+                self.current[IMPLICIT_WAIT] = value
+                self.updates += 1
+            except Exception as e:
+                Logger.debug(f'设置隐式等待失败: {str(e)}')
+                self.unsupported.add(IMPLICIT_WAIT)
+                previous.pop(IMPLICIT_WAIT, None)
+        if changed:
+            self._update(driver, changed, previous)
+        return previous
+
+    def _update(self, driver, changed, previous):
+        update = getattr(driver, 'update_settings', None)
+        if update is None:
+            self.unsupported.update(changed)
+            for key in changed:
+                previous.pop(key, None)
+            return
+        try:
+            update(dict(changed))
+            self.current.update(changed)
+            self.updates += 1
+            return
+        except Exception:
+            pass
+        # 驱动不认识其中某一项时逐项设置，跳过不支持的
+        for key, value in changed.items():
+            try:
+                update({key: value})
+                self.current[key] = value
+                self.updates += 1
+            except Exception as e:
+                Logger.debug(f'驱动不支持设置 {key}: {str(e)}')
+                self.unsupported.add(key)
+                previous.pop(key, None)
+
+
+_settings = weakref.WeakKeyDictionary()
+
+
+def get_settings_state(driver) -> DriverSettings:
+    """获取驱动对应的设置记录，同一个驱动的页面工厂和快照共享一个
+
+    Args:
+        driver: Appium WebDriver 实例
+
+    Returns:
+        DriverSettings: 设置记录
+    """
+    state = _settings.get(driver)
+    if state is None:
+        state = _settings[driver] = DriverSettings(driver)
+    return state
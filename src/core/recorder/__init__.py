@@ -0,0 +1,3 @@
+from .flight import FlightRecorder, get_recorder
+
+__all__ = ['FlightRecorder', 'get_recorder']
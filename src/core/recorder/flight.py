@@ -0,0 +1,180 @@
+from collections import deque
+import gzip
+import json
+import os
+import time
+import weakref
+
+from config.app_config import FLIGHT_RECORDER_CONFIG
+from utils.logger import Logger
+from core.metrics import get_metrics
+
+
+class FlightRecorder:
+    """故障记录器
+
+    在内存中用环形缓冲区保留最近的页面层级快照（gzip 压缩）、驱动命令及耗时和事件，
+    平时不做任何磁盘 I/O。只有在短时间内连续失败或会话丢失时才把缓冲区连同一张截图
+    写入磁盘，并且按最短间隔和总次数限制写入，长时间故障也不会写满磁盘。
+    """
+
+    def __init__(self, driver=None, device_id: str = 'default', config=None):
+        """初始化
+
+        Args:
+            driver: 可选，Appium WebDriver 实例，写入时用于截图和获取当前页面
+            device_id: 设备标识，用于文件名
+            config: 可选，覆盖 FLIGHT_RECORDER_CONFIG 中的配置
+        """
+        self.config = dict(FLIGHT_RECORDER_CONFIG)
+        if config:
+            self.config.update(config)
+        self.enabled = self.config['enabled']
+        self.device_id = device_id
+        self._driver = weakref.ref(driver) if driver is not None else lambda: None
+        self.snapshots = deque(maxlen=self.config['snapshots'])  # (时间, 压缩后的 XML)
+        self.commands = deque(maxlen=self.config['commands'])  # (时间, 命令, 耗时, 错误)
+        self.events = deque(maxlen=self.config['events'])  # (时间, 事件)
+        self.failures = deque()
+        self.dumps = 0
+        self._last_dump = None
+        self._last_source_hash = None
+
+    def record_snapshot(self, source: str):
+        """保存一份页面层级，与上一份相同时跳过"""
+        if not self.enabled or not source:
+            return
+        source_hash = hash(source)
+        if source_hash == self._last_source_hash:
+            return
+        self._last_source_hash = source_hash
+        self.snapshots.append((time.time(), gzip.compress(source.encode('utf-8'), compresslevel=1)))
+
+    def record_command(self, name: str, seconds: float, error=None):
+        """记录一次驱动命令及其耗时
+
+        Args:
+            name: 命令名称
+            seconds: 耗时（秒）
+            error: 可选，命令抛出的异常，会话已失效时立即写入记录
+        """
+        if not self.enabled:
+            return
+        self.commands.append((time.time(), name, seconds, repr(error) if error else None))
+        if error is not None and type(error).__name__ == 'InvalidSessionIdException':
+            self.session_lost(f'{name}: {error}')
+
+    def record_event(self, message: str):
+        """记录一条事件"""
+        if self.enabled:
+            self.events.append((time.time(), message))
+
+    def failure(self, reason: str) -> bool:
+        """记录一次失败，时间窗口内失败次数达到阈值时写入记录
+
+        Returns:
+            bool: 是否写入了记录
+        """
+        if not self.enabled:
+            return False
+        now = time.monotonic()
+        self.record_event(f'失败: {reason}')
+        self.failures.append(now)
+        while self.failures and now - self.failures[0] > self.config['failure_window']:
+            self.failures.popleft()
+        if len(self.failures) < self.config['failure_threshold']:
+            return False
+        self.failures.clear()
+        return self.dump(f'连续失败: {reason}') is not None
+
+    def session_lost(self, reason: str) -> bool:
+        """会话丢失（应用重启、会话失效等），立即写入记录
+
+        Returns:
+            bool: 是否写入了记录
+        """
+        if not self.enabled:
+            return False
+        self.record_event(f'会话丢失: {reason}')
+        return self.dump(f'会话丢失: {reason}') is not None
+
+    def dump(self, reason: str):
+        """把缓冲区写入磁盘，受最短间隔和总次数限制
+
+        Returns:
+            str: 写入的目录，被限流或写入失败时返回 None
+        """
+        now = time.monotonic()
+        if self.dumps >= self.config['max_dumps']:
+            return None
+        if self._last_dump is not None and now - self._last_dump < self.config['min_interval']:
+            Logger.debug(f'故障记录写入过于频繁，跳过: {reason}')
+            return None
+        self._last_dump = now
+        self.dumps += 1
+
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        directory = os.path.join(self.config['directory'], f'{self.device_id}-{stamp}-{self.dumps}')
+        try:
+            os.makedirs(directory, exist_ok=True)
+            driver = self._driver()
+            if driver is not None:
+                self._capture_current(driver, directory)
+            for index, (timestamp, data) in enumerate(self.snapshots):
+                with open(os.path.join(directory, f'snapshot-{index:03d}-{int(timestamp)}.xml.gz'), 'wb') as file:
+                    file.write(data)
+            with open(os.path.join(directory, 'recording.json'), 'w', encoding='utf-8') as file:
+                json.dump({
+                    'device': self.device_id,
+                    'reason': reason,
+                    'time': time.time(),
+                    'commands': [
+                        {'time': t, 'command': name, 'seconds': round(seconds, 4), 'error': error}
+                        for t, name, seconds, error in self.commands
+                    ],
+                    'events': [{'time': t, 'event': message} for t, message in self.events],
+                }, file, ensure_ascii=False, indent=1)
+            Logger.warn(f'[{self.device_id}] {reason}，故障记录已保存: {directory}')
+            return directory
+        except Exception as e:
+            Logger.error(f'[{self.device_id}] 保存故障记录失败', e)
+            return None
+
+    def _capture_current(self, driver, directory):
+        """截图并保存当前页面层级，会话已失效时会失败，忽略即可"""
+        if self.config['screenshot']:
+            try:
+                driver.get_screenshot_as_file(os.path.join(directory, 'screenshot.png'))
+            except Exception as e:
+                Logger.debug(f'故障截图失败: {str(e)}')
+        try:
+            self.record_snapshot(driver.page_source)
+        except Exception as e:
+            Logger.debug(f'获取当前页面失败: {str(e)}')
+
+    def stats(self) -> dict:
+        """缓冲区占用和写入次数"""
+        return {
+            'snapshots': len(self.snapshots),
+            'snapshot_bytes': sum(len(data) for _, data in self.snapshots),
+            'commands': len(self.commands),
+            'dumps': self.dumps,
+        }
+
+
+_recorders = weakref.WeakKeyDictionary()
+
+
+def get_recorder(driver) -> FlightRecorder:
+    """获取驱动对应的故障记录器，同一个驱动（设备）的所有页面共享一个
+
+    Args:
+        driver: Appium WebDriver 实例
+
+    Returns:
+        FlightRecorder: 故障记录器
+    """
+    recorder = _recorders.get(driver)
+    if recorder is None:
+        recorder = _recorders[driver] = FlightRecorder(driver, get_metrics(driver).device_id)
+    return recorder
@@ -0,0 +1,4 @@
+from .parser import parse_rule, RuleSyntaxError, RECORD_FIELDS, CARD_FIELDS
+from .engine import RuleSet
+
+__all__ = ['parse_rule', 'RuleSyntaxError', 'RECORD_FIELDS', 'CARD_FIELDS', 'RuleSet']
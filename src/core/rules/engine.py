@@ -0,0 +1,192 @@
+import operator
+from bisect import bisect_left, bisect_right
+from functools import reduce
+
+from core.matching import normalize as normalize_text
+from .parser import parse_rule, RECORD_FIELDS
+
+
+def _field(record, name):
+    if isinstance(record, dict):
+        return record.get(name)
+    return getattr(record, name, None)
+
+
+def _to_number(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace(',', '').lstrip('¥￥').strip())
+    except ValueError:
+        return None
+
+
+class _NumberColumn:
+    """数值列
+
+    按数值排序后预先计算前缀位掩码，之后每个比较条件只需一次二分查找，
+    同一字段上的条件再多也不用逐条记录比较。
+    """
+
+    def __init__(self, values):
+        pairs = sorted((value, position) for position, value in enumerate(values) if value is not None)
+        self.sorted_values = [value for value, _ in pairs]
+        self.prefix = [0]
+        for _, position in pairs:
+            self.prefix.append(self.prefix[-1] | (1 << position))
+        self.total = self.prefix[-1]
+
+    def mask(self, op, threshold):
+        """计算满足 "值 op threshold" 的记录位掩码，缺失值始终不满足"""
+        left = self.prefix[bisect_left(self.sorted_values, threshold)]
+        right = self.prefix[bisect_right(self.sorted_values, threshold)]
+        if op == '<':
+            return left
+        if op == '<=':
+            return right
+        if op == '>':
+            return self.total ^ right
+        if op == '>=':
+            return self.total ^ left
+        if op == '==':
+            return right ^ left
+        if op == '!=':
+            return self.total ^ (right ^ left)
+        raise ValueError(f'未知的比较运算符: {op}')
+
+
+class RuleSet:
+    """匹配规则集
+
+    规则只在创建时解析和编译一次。评估时按批处理记录：先把整批记录按字段转换为列，
+    每个不同的条件（例如 price < 80）在列上只计算一次，结果保存为位掩码；规则本身只是
+    位掩码之间的与或非运算，因此即使有上百条规则，每条记录分摊到的开销也很小。
+    """
+
+    def __init__(self, rules, fields=RECORD_FIELDS):
+        """编译规则
+
+        Args:
+            rules: 规则列表，每项为 (名称, 规则文本) 元组或包含 name、rule 字段的字典
+            fields: 规则可以引用的字段，默认为保存的商品记录中的字段
+
+        Raises:
+            RuleSyntaxError: 规则语法错误
+        """
+        self._predicates = {}
+        self._rules = []
+        for rule in rules:
+            if isinstance(rule, dict):
+                name, text = rule['name'], rule['rule']
+            else:
+                name, text = rule
+            self._rules.append((name, self._compile(parse_rule(text, fields))))
+
+    def __len__(self):
+        return len(self._rules)
+
+    @property
+    def names(self):
+        return [name for name, _ in self._rules]
+
+    def _predicate_index(self, node):
+        """登记条件，相同的条件在所有规则间共享"""
+        if node[0] == 'text':
+            node = ('text', node[1], normalize_text(node[2]))
+        return self._predicates.setdefault(node, len(self._predicates))
+
+    def _compile(self, node):
+        """把语法树编译为基于位掩码的函数"""
+        kind = node[0]
+        if kind == 'and':
+            children = [self._compile(child) for child in node[1]]
+            return lambda masks, full: reduce(operator.and_, (child(masks, full) for child in children))
+        if kind == 'or':
+            children = [self._compile(child) for child in node[1]]
+            return lambda masks, full: reduce(operator.or_, (child(masks, full) for child in children))
+        if kind == 'not':
+            child = self._compile(node[1])
+            return lambda masks, full: full ^ child(masks, full)
+        index = self._predicate_index(node)
+        return lambda masks, full: masks[index]
+
+    def _text_masks(self, records, field, terms, masks):
+        """计算同一字段上所有文本条件的位掩码
+
+        按首字符建立索引，每条记录只检查首字符在文本中出现过的条件，
+        条件数量很多时也不需要逐条扫描。
+        """
+        by_first_char = {}
+        for term, index in terms:
+            if not term:
+                masks[index] = (1 << len(records)) - 1
+                continue
+            by_first_char.setdefault(term[0], []).append((term, index))
+
+        for position, record in enumerate(records):
+            text = normalize_text(_field(record, field))
+            bit = 1 << position
+            for char in set(text):
+                for term, index in by_first_char.get(char, ()):
+                    if term in text:
+                        masks[index] |= bit
+
+    def _compute_masks(self, records):
+        """计算每个条件在整批记录上的位掩码"""
+        text_terms = {}
+        number_columns = {}
+        masks = [0] * len(self._predicates)
+
+        for predicate, index in self._predicates.items():
+            if predicate[0] == 'text':
+                _, field, term = predicate
+                text_terms.setdefault(field, []).append((term, index))
+            else:
+                _, field, op, threshold = predicate
+                if field not in number_columns:
+                    number_columns[field] = _NumberColumn([_to_number(_field(record, field)) for record in records])
+                masks[index] = number_columns[field].mask(op, threshold)
+
+        for field, terms in text_terms.items():
+            self._text_masks(records, field, terms, masks)
+        return masks
+
+    def evaluate(self, records):
+        """批量评估记录
+
+        Args:
+            records: 记录列表，支持字典或带属性的对象（例如 ListingRecord）
+
+        Returns:
+            list: 与 records 一一对应，值为第一条命中的规则名称，都不命中时为 None
+        """
+        records = list(records)
+        fired = [None] * len(records)
+        if not records or not self._rules:
+            return fired
+
+        masks = self._compute_masks(records)
+        full = (1 << len(records)) - 1
+        remaining = full
+        for name, rule in self._rules:
+            hits = rule(masks, full) & remaining
+            if not hits:
+                continue
+            remaining &= ~hits
+            while hits:
+                low_bit = hits & -hits
+                fired[low_bit.bit_length() - 1] = name
+                hits ^= low_bit
+            if not remaining:
+                break
+        return fired
+
+    def match(self, record):
+        """评估单条记录
+
+        Returns:
+            str: 第一条命中的规则名称，都不命中时为 None
+        """
+        return self.evaluate([record])[0]
@@ -0,0 +1,162 @@
+import re
+
+from core.extract import ListingRecord
+
+# 规则语法示例：
+#   chiikawa AND price < 80 AND NOT 盲盒
+#   (吉伊卡哇 OR chiikawa) seller:小明 want_count > 10
+# - 裸词或引号中的文本表示标题包含该文本
+# - field:文本 表示指定字段包含该文本
+# - field 比较运算符 数字 表示数值比较，支持 < <= > >= = == != ≤ ≥
+# - AND / OR / NOT 不区分大小写，相邻条件之间省略 AND 时默认为 AND
+# - 只能引用记录中实际存在的字段，未知字段在解析时报错，不会静默地永不命中
+
+# 保存的商品记录中的字段：详情记录（ListingRecord）和卡片记录
+RECORD_FIELDS = frozenset(ListingRecord.__slots__) | {'age_text', 'keyword', 'canonical_id', 'kind', 'created_at'}
+# 列表卡片上能读到的字段，MATCH_RULES 在进入详情页之前按这些字段评估
+CARD_FIELDS = frozenset({'title', 'price'})
+
+_TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<string>"[^"]*"|'[^']*')
+      | (?P<op><=|>=|==|!=|<|>|=|≤|≥)
+      | (?P<lparen>\()
+      | (?P<rparen>\))
+      | (?P<colon>:)
+      | (?P<word>[^\s()"'<>=!:≤≥]+)
+    )''', re.VERBOSE)
+
+_OP_ALIASES = {'=': '==', '≤': '<=', '≥': '>='}
+_KEYWORDS = ('AND', 'OR', 'NOT')
+
+
+class RuleSyntaxError(ValueError):
+    """规则语法错误"""
+    pass
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if not match or match.end() == position:
+            raise RuleSyntaxError(f'无法解析的字符: {text[position:position + 10]!r}')
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'string':
+            kind, value = 'text', value[1:-1]
+        elif kind == 'op':
+            value = _OP_ALIASES.get(value, value)
+        elif kind == 'word' and value.upper() in _KEYWORDS:
+            kind, value = value.upper(), value.upper()
+        tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    """递归下降解析器，生成嵌套元组形式的语法树
+
+    节点格式：
+        ('and', [子节点...])
+        ('or', [子节点...])
+        ('not', 子节点)
+        ('num', 字段, 运算符, 数值)
+        ('text', 字段, 文本)
+    """
+
+    def __init__(self, text, fields):
+        self.text = text
+        self.fields = fields
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def _peek(self, offset=0):
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def _next(self):
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise RuleSyntaxError('规则为空')
+        node = self._parse_or()
+        if self.position < len(self.tokens):
+            raise RuleSyntaxError(f'多余的内容: {self._peek()[1]!r}')
+        return node
+
+    def _parse_or(self):
+        children = [self._parse_and()]
+        while self._peek()[0] == 'OR':
+            self._next()
+            children.append(self._parse_and())
+        return children[0] if len(children) == 1 else ('or', children)
+
+    def _parse_and(self):
+        children = [self._parse_unary()]
+        while self._peek()[0] not in (None, 'OR', 'rparen'):
+            if self._peek()[0] == 'AND':
+                self._next()
+            children.append(self._parse_unary())
+        return children[0] if len(children) == 1 else ('and', children)
+
+    def _parse_unary(self):
+        if self._peek()[0] == 'NOT':
+            self._next()
+            return ('not', self._parse_unary())
+        return self._parse_primary()
+
+    def _check_field(self, name):
+        if name not in self.fields:
+            raise RuleSyntaxError(f'未知的字段: {name}，可用字段: {", ".join(sorted(self.fields))}')
+
+    def _parse_primary(self):
+        kind, value = self._next()
+        if kind == 'lparen':
+            node = self._parse_or()
+            if self._next()[0] != 'rparen':
+                raise RuleSyntaxError(f'缺少右括号: {self.text!r}')
+            return node
+        if kind == 'text':
+            return ('text', 'title', value)
+        if kind != 'word':
+            raise RuleSyntaxError(f'意外的内容: {value!r}')
+
+        next_kind, next_value = self._peek()
+        if next_kind == 'op':
+            self._check_field(value)
+            self._next()
+            number_kind, number = self._next()
+            try:
+                return ('num', value, next_value, float(number))
+            except (TypeError, ValueError):
+                raise RuleSyntaxError(f'{value} {next_value} 后面需要数字，实际为 {number!r}')
+        if next_kind == 'colon':
+            self._check_field(value)
+            self._next()
+            term_kind, term = self._next()
+            if term_kind not in ('word', 'text'):
+                raise RuleSyntaxError(f'{value}: 后面需要文本')
+            return ('text', value, term)
+        return ('text', 'title', value)
+
+
+def parse_rule(text, fields=RECORD_FIELDS):
+    """解析规则文本
+
+    Args:
+        text: 规则文本
+        fields: 规则可以引用的字段，默认为保存的商品记录中的字段
+
+    Returns:
+        tuple: 语法树
+
+    Raises:
+        RuleSyntaxError: 规则语法错误
+    """
+    return _Parser(text, fields).parse()
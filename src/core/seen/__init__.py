@@ -0,0 +1,10 @@
+from .store import SeenItemStore, item_key
+from .bloom import BloomFilter, ScalableBloomFilter
+from .service import SeenService
+from .ipc import SeenServer, SeenClient, create_seen_server, create_seen_client
+
+__all__ = [
+    'SeenItemStore', 'item_key',
+    'BloomFilter', 'ScalableBloomFilter', 'SeenService',
+    'SeenServer', 'SeenClient', 'create_seen_server', 'create_seen_client',
+]
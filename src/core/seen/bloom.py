@@ -0,0 +1,131 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """定长布隆过滤器
+
+    使用两个 64 位哈希做双重哈希生成 k 个比特位置，判断不存在时一定不存在，
+    判断存在时有 error_rate 的误判概率。
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        """初始化
+
+        Args:
+            capacity: 设计容量，超过后误判率会上升
+            error_rate: 设计误判率
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    @staticmethod
+    def _hash(key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    def _positions(self, hashed):
+        h1, h2 = hashed
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def contains_hashed(self, hashed) -> bool:
+        bits = self.bits
+        for position in self._positions(hashed):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add_hashed(self, hashed):
+        bits = self.bits
+        for position in self._positions(hashed):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains_hashed(self._hash(key))
+
+    def add(self, key: str):
+        self.add_hashed(self._hash(key))
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+
+class ScalableBloomFilter:
+    """可扩展布隆过滤器
+
+    当前过滤器写满后追加一个容量更大、误判率更低的过滤器，整体误判率保持在
+    error_rate 附近。总内存超过 max_bytes 时丢弃最早的过滤器，内存占用固定，
+    代价是很久以前的商品会被逐渐遗忘。
+    """
+
+    def __init__(self, initial_capacity: int = 1000000, error_rate: float = 0.001,
+                 growth: int = 2, tightening: float = 0.5, max_bytes: int = 64 * 1024 * 1024):
+        """初始化
+
+        Args:
+            initial_capacity: 第一个过滤器的容量
+            error_rate: 整体误判率
+            growth: 每个新过滤器的容量倍数
+            tightening: 每个新过滤器的误判率倍数
+            max_bytes: 所有过滤器的内存上限（字节）
+        """
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.max_bytes = max_bytes
+        self.filters = []
+        self._generation = 0
+
+    def _next_filter(self):
+        capacity = self.initial_capacity * self.growth ** self._generation
+        error_rate = self.error_rate * (1 - self.tightening) * self.tightening ** self._generation
+        bloom = BloomFilter(capacity, error_rate)
+        # 新过滤器超出内存上限时，退回到初始规格并丢弃最早的过滤器
+        if bloom.nbytes > self.max_bytes:
+            self._generation = 0
+            bloom = BloomFilter(self.initial_capacity, self.error_rate * (1 - self.tightening))
+        while self.filters and self.nbytes + bloom.nbytes > self.max_bytes:
+            self.filters.pop(0)
+        self._generation += 1
+        self.filters.append(bloom)
+        return bloom
+
+    @property
+    def nbytes(self) -> int:
+        return sum(bloom.nbytes for bloom in self.filters)
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self.filters)
+
+    def contains_hashed(self, hashed) -> bool:
+        # 新的过滤器保存的是最近的商品，命中概率更高，优先检查
+        for bloom in reversed(self.filters):
+            if bloom.contains_hashed(hashed):
+                return True
+        return False
+
+    def add_hashed(self, hashed):
+        bloom = self.filters[-1] if self.filters and not self.filters[-1].full else self._next_filter()
+        bloom.add_hashed(hashed)
+
+    def __contains__(self, key: str) -> bool:
+        return self.contains_hashed(BloomFilter._hash(key))
+
+    def add(self, key: str):
+        self.add_hashed(BloomFilter._hash(key))
+
+    def clear(self):
+        self.filters = []
+        self._generation = 0
@@ -0,0 +1,305 @@
+import asyncio
+import json
+import os
+
+from config.app_config import SEEN_SERVICE_CONFIG
+from utils.logger import Logger
+from core.throttle.limiter import TokenBucket
+from .service import SeenService
+
+# 本地进程间通信协议（Unix 域套接字，按行收发）：
+#   ADD key1 key2 ...  -> 每个商品一位 1/0，1 表示新商品（已登记）
+#   HAS key1 key2 ...  -> 每个商品一位 1/0，1 表示已处理过
+#   STATS              -> JSON 格式的统计信息
+#   SNAPSHOT           -> 立即保存快照，返回 OK
+#   TAKE 账号 每秒令牌数 容量 速率倍数 -> 从该账号共享的令牌桶领取一个令牌，返回需要等待的秒数
+# 同一连接上可以连续发送多行请求，按顺序返回。
+
+
+class SeenServer:
+    """已处理商品服务
+
+    同一台机器上的多个浏览进程通过 Unix 域套接字共享一个 SeenService，
+    避免多台设备重复处理同一个商品，并定期把数据保存为快照。
+    同一账号的操作限速令牌桶也放在这里，所有进程共享账号的限额。
+    """
+
+    def __init__(self, service: SeenService, socket_path: str, snapshot_path: str = None,
+                 snapshot_interval: float = 60):
+        """初始化
+
+        Args:
+            service: SeenService 实例
+            socket_path: Unix 域套接字路径
+            snapshot_path: 可选，快照文件路径
+            snapshot_interval: 保存快照的间隔（秒）
+        """
+        self.service = service
+        self.socket_path = socket_path
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        self._server = None
+        self._snapshot_task = None
+        self._clients = set()
+        self._dirty = False
+        self._account_buckets = {}
+
+    def _handle_line(self, line: str) -> str:
+        command, _, rest = line.strip().partition(' ')
+        command = command.upper()
+        keys = rest.split()
+        if command == 'ADD':
+            self._dirty = True
+            return ''.join('1' if self.service.add(key) else '0' for key in keys)
+        if command == 'HAS':
+            return ''.join('1' if self.service.contains(key) else '0' for key in keys)
+        if command == 'STATS':
+            return json.dumps(self.service.stats())
+        if command == 'SNAPSHOT':
+            self.save_snapshot()
+            return 'OK'
+        if command == 'TAKE':
+            return self._take(keys)
+        return f'ERR 未知命令: {command}'
+
+    def _take(self, args) -> str:
+        """从账号的令牌桶领取一个令牌，速率和容量以请求中的为准"""
+        try:
+            account, rate, burst, scale = args[0], float(args[1]), float(args[2]), float(args[3])
+        except (IndexError, ValueError):
+            return 'ERR 用法: TAKE 账号 每秒令牌数 容量 速率倍数'
+        bucket = self._account_buckets.get(account)
+        if bucket is None:
+            bucket = self._account_buckets[account] = TokenBucket(rate, burst)
+        bucket.rate, bucket.burst = rate, burst
+        return f'{bucket.reserve(scale):.3f}'
+
+    async def _handle_client(self, reader, writer):
+        self._clients.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(self._handle_line(line.decode('utf-8')).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError, asyncio.CancelledError):
+            pass
+        except Exception as e:
+            Logger.error('处理已处理商品请求时出错', e)
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    def save_snapshot(self):
+        """保存快照，没有配置快照路径时忽略"""
+        if not self.snapshot_path:
+            return
+        try:
+            self.service.save(self.snapshot_path)
+            self._dirty = False
+            Logger.debug(f'已保存已处理商品快照: {self.snapshot_path}')
+        except Exception as e:
+            Logger.error('保存已处理商品快照失败', e)
+
+    async def _snapshot_loop(self):
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            if self._dirty:
+                self.save_snapshot()
+
+    async def start(self):
+        """启动服务"""
+        if self.snapshot_path:
+            self.service.load(self.snapshot_path)
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        if self.snapshot_path:
+            self._snapshot_task = asyncio.create_task(self._snapshot_loop())
+        Logger.success(f'已处理商品服务已启动: {self.socket_path}')
+
+    async def serve_forever(self):
+        """启动服务并一直运行，退出时保存快照"""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """停止服务并保存快照"""
+        if self._snapshot_task:
+            self._snapshot_task.cancel()
+            self._snapshot_task = None
+        if self._server:
+            self._server.close()
+            for writer in list(self._clients):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        self.save_snapshot()
+        Logger.info('已处理商品服务已停止')
+
+
+class SeenClient:
+    """已处理商品服务的客户端"""
+
+    def __init__(self, socket_path: str):
+        """初始化
+
+        Args:
+            socket_path: Unix 域套接字路径
+        """
+        self.socket_path = socket_path
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+
+    async def connect(self):
+        """连接服务"""
+        self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path)
+
+    async def _request(self, line: str) -> str:
+        async with self._lock:
+            if self._writer is None:
+                await self.connect()
+            self._writer.write(line.encode('utf-8') + b'\n')
+            await self._writer.drain()
+            response = await self._reader.readline()
+            if not response:
+                self._writer = None
+                raise ConnectionError('已处理商品服务连接已断开')
+            return response.decode('utf-8').rstrip('\n')
+
+    async def add_many(self, keys):
+        """批量登记商品
+
+        Args:
+            keys: 商品标识列表
+
+        Returns:
+            list: 与 keys 一一对应，True 表示新商品
+        """
+        if not keys:
+            return []
+        try:
+            response = await self._request('ADD ' + ' '.join(keys))
+        except OSError as e:
+            # 服务不可用时按新商品处理，宁可重复处理也不漏掉商品，下次请求时重连
+            Logger.warn(f'已处理商品服务不可用: {e}')
+            self._writer = None
+            return [True] * len(keys)
+        return [flag == '1' for flag in response]
+
+    async def contains_many(self, keys):
+        """批量查询商品是否已处理
+
+        Returns:
+            list: 与 keys 一一对应，True 表示已处理过
+        """
+        if not keys:
+            return []
+        try:
+            response = await self._request('HAS ' + ' '.join(keys))
+        except OSError as e:
+            Logger.warn(f'已处理商品服务不可用: {e}')
+            self._writer = None
+            return [False] * len(keys)
+        return [flag == '1' for flag in response]
+
+    async def add(self, key: str) -> bool:
+        """登记商品，返回是否为新商品"""
+        return (await self.add_many([key]))[0]
+
+    async def contains(self, key: str) -> bool:
+        """查询商品是否已处理"""
+        return (await self.contains_many([key]))[0]
+
+    async def take(self, account: str, rate: float, burst: float, scale: float = 1.0):
+        """从账号共享的令牌桶领取一个令牌
+
+        Args:
+            account: 账号标识，不能包含空白
+            rate: 每秒令牌数
+            burst: 令牌桶容量
+            scale: 速率倍数
+
+        Returns:
+            float: 需要等待的秒数，服务不可用时返回 None，由调用方使用本进程的令牌桶
+        """
+        try:
+            response = await self._request(f'TAKE {account} {rate} {burst} {scale}')
+        except OSError as e:
+            Logger.warn(f'已处理商品服务不可用: {e}')
+            self._writer = None
+            return None
+        try:
+            return float(response)
+        except ValueError:
+            Logger.debug(f'共享令牌桶请求失败: {response}')
+            return None
+
+    async def stats(self) -> dict:
+        """获取服务统计信息"""
+        return json.loads(await self._request('STATS'))
+
+    async def close(self):
+        """关闭连接"""
+        if self._writer:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+
+
+def create_seen_server(config=None):
+    """按配置创建已处理商品服务
+
+    Args:
+        config: 可选，覆盖 SEEN_SERVICE_CONFIG 中的配置
+
+    Returns:
+        SeenServer: 服务实例
+    """
+    settings = dict(SEEN_SERVICE_CONFIG)
+    if config:
+        settings.update(config)
+    service = SeenService(
+        recent_capacity=settings['recent_capacity'],
+        initial_capacity=settings['initial_capacity'],
+        error_rate=settings['error_rate'],
+        max_bytes=settings['max_bytes']
+    )
+    return SeenServer(service, settings['socket_path'], settings['snapshot_path'], settings['snapshot_interval'])
+
+
+async def create_seen_client(config=None):
+    """按配置连接已处理商品服务
+
+    Args:
+        config: 可选，覆盖 SEEN_SERVICE_CONFIG 中的配置
+
+    Returns:
+        SeenClient: 客户端实例，未启用或连接失败时返回 None（各进程各自处理）
+    """
+    settings = dict(SEEN_SERVICE_CONFIG)
+    if config:
+        settings.update(config)
+    if not settings['enabled']:
+        return None
+    client = SeenClient(settings['socket_path'])
+    try:
+        await client.connect()
+    except OSError as e:
+        Logger.warn(f"无法连接已处理商品服务 {settings['socket_path']}，各进程将独立去重: {e}")
+        return None
+    Logger.info(f"已连接已处理商品服务: {settings['socket_path']}")
+    return client
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""已处理商品服务
+
+多个浏览进程共享的已处理商品集合，在 src 目录下运行：python -m core.seen.server
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# 将 src 目录添加到 Python 路径
+src_path = str(Path(__file__).parents[2].absolute())
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from utils.logger import Logger
+from core.seen.ipc import create_seen_server
+
+
+async def main():
+    server = create_seen_server()
+    try:
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        Logger.info('用户中断')
@@ -0,0 +1,143 @@
+import json
+import os
+import struct
+
+from utils.logger import Logger
+from .bloom import BloomFilter, ScalableBloomFilter
+from .store import SeenItemStore
+
+_SNAPSHOT_MAGIC = b'XYSEEN1\n'
+
+
+class SeenService:
+    """已处理商品集合
+
+    最近处理的商品保存在精确的 LRU 中，更早的商品只保留在可扩展布隆过滤器里。
+    查询时先查 LRU，再由布隆过滤器快速排除没见过的商品；两者的容量都有上限，
+    内存占用固定。可以保存为快照文件，重启后恢复。
+    """
+
+    def __init__(self, recent_capacity: int = 100000, initial_capacity: int = 1000000,
+                 error_rate: float = 0.001, max_bytes: int = 64 * 1024 * 1024):
+        """初始化
+
+        Args:
+            recent_capacity: LRU 中精确保存的商品数量
+            initial_capacity: 第一个布隆过滤器的容量
+            error_rate: 布隆过滤器的误判率
+            max_bytes: 布隆过滤器的内存上限（字节）
+        """
+        self.recent = SeenItemStore(recent_capacity)
+        self.bloom = ScalableBloomFilter(initial_capacity, error_rate, max_bytes=max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    def contains(self, key: str) -> bool:
+        """商品是否已处理（布隆过滤器部分可能误判为已处理）"""
+        if key in self.recent:
+            return True
+        return key in self.bloom
+
+    def add(self, key: str) -> bool:
+        """登记商品
+
+        Args:
+            key: 商品标识
+
+        Returns:
+            bool: 是否为新商品，False 表示已经被处理过
+        """
+        if not self.recent.add(key):
+            self.hits += 1
+            return False
+        hashed = BloomFilter._hash(key)
+        if self.bloom.contains_hashed(hashed):
+            self.hits += 1
+            return False
+        self.bloom.add_hashed(hashed)
+        self.misses += 1
+        return True
+
+    def stats(self) -> dict:
+        """统计信息"""
+        return {
+            'recent': len(self.recent),
+            'bloom_items': len(self.bloom),
+            'bloom_filters': len(self.bloom.filters),
+            'bloom_bytes': self.bloom.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def save(self, path: str):
+        """保存快照，先写临时文件再替换，写到一半中断也不会损坏旧快照
+
+        Args:
+            path: 快照文件路径
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        meta = {
+            'recent': list(self.recent._items.items()),
+            'bloom': {
+                'initial_capacity': self.bloom.initial_capacity,
+                'error_rate': self.bloom.error_rate,
+                'growth': self.bloom.growth,
+                'tightening': self.bloom.tightening,
+                'max_bytes': self.bloom.max_bytes,
+                'generation': self.bloom._generation,
+                'filters': [
+                    {'capacity': bloom.capacity, 'error_rate': bloom.error_rate, 'count': bloom.count}
+                    for bloom in self.bloom.filters
+                ],
+            },
+        }
+        header = json.dumps(meta).encode('utf-8')
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'wb') as file:
+            file.write(_SNAPSHOT_MAGIC)
+            file.write(struct.pack('<Q', len(header)))
+            file.write(header)
+            for bloom in self.bloom.filters:
+                file.write(bloom.bits)
+        os.replace(temp_path, path)
+
+    def load(self, path: str) -> bool:
+        """从快照恢复
+
+        Args:
+            path: 快照文件路径
+
+        Returns:
+            bool: 是否成功恢复，文件不存在或格式不对时返回 False
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'rb') as file:
+                if file.read(len(_SNAPSHOT_MAGIC)) != _SNAPSHOT_MAGIC:
+                    raise ValueError('快照文件格式不正确')
+                length, = struct.unpack('<Q', file.read(8))
+                meta = json.loads(file.read(length).decode('utf-8'))
+                settings = meta['bloom']
+                bloom = ScalableBloomFilter(
+                    settings['initial_capacity'], settings['error_rate'],
+                    settings['growth'], settings['tightening'], settings['max_bytes']
+                )
+                bloom._generation = settings['generation']
+                for item in settings['filters']:
+                    part = BloomFilter(item['capacity'], item['error_rate'])
+                    part.bits = bytearray(file.read(len(part.bits)))
+                    part.count = item['count']
+                    bloom.filters.append(part)
+        except Exception as e:
+            Logger.error(f'读取已处理商品快照失败: {path}', e)
+            return False
+
+        self.bloom = bloom
+        self.recent.clear()
+        for key, seen_at in meta['recent']:
+            self.recent.add(key, seen_at)
+        Logger.info(f'已从快照恢复 {len(self.bloom)} 个已处理商品')
+        return True
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import hashlib
+import time
+
+
+def item_key(title: str, price: str = '') -> str:
+    """生成商品的身份标识
+
+    闲鱼列表卡片上没有商品ID，使用标题和价格的组合来识别同一个商品。
+
+    Args:
+        title: 商品标题
+        price: 商品价格文本，可选
+
+    Returns:
+        str: 16位十六进制的商品标识
+    """
+    raw = f"{''.join((title or '').split()).lower()}|{(price or '').strip()}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+class SeenItemStore:
+    """已见商品记录
+
+    按最近使用顺序保存商品标识及首次看到的时间，超过容量时淘汰最久未见的记录。
+    """
+
+    def __init__(self, capacity: int = 50000):
+        """初始化已见商品记录
+
+        Args:
+            capacity: 最多保存的商品数量
+        """
+        self.capacity = capacity
+        self._items = OrderedDict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, key: str, seen_at: float = None) -> bool:
+        """记录一个商品
+
+        Args:
+            key: 商品标识
+            seen_at: 看到的时间戳，默认为当前时间
+
+        Returns:
+            bool: 是否为新商品
+        """
+        if key in self._items:
+            self._items.move_to_end(key)
+            return False
+
+        self._items[key] = seen_at if seen_at is not None else time.time()
+        if len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+        return True
+
+    def items(self):
+        """按从旧到新的顺序返回 (商品标识, 首次看到的时间戳) 列表"""
+        return list(self._items.items())
+
+    def first_seen(self, key: str):
+        """获取商品首次被看到的时间戳，未见过时返回 None"""
+        return self._items.get(key)
+
+    def clear(self):
+        """清空记录"""
+        self._items.clear()
@@ -1,3 +1,4 @@
 from .handler import SignalHandler
+from .shutdown import bounded, quit_driver
 
-__all__ = ['SignalHandler'] 
\ No newline at end of file
+__all__ = ['SignalHandler', 'bounded', 'quit_driver']
@@ -1,6 +1,6 @@
 import asyncio
 import signal
-from typing import Callable
+from typing import Awaitable, Callable
 
 from utils.logger import Logger
 
@@ -9,8 +9,28 @@ class SignalHandler:
     def __init__(self, stop_callback: Callable[[], None]):
         self.loop = asyncio.get_running_loop()
         self.stop_callback = stop_callback
+        self._flush_callbacks = []
+        self._tasks = []
         self._setup_handlers()
     
+    def register_flush(self, callback: Callable[[], Awaitable[None]]):
+        """注册收到信号时需要立即执行的落盘回调
+        
+        Args:
+            callback: 异步回调函数，例如 ResultSink.flush
+        """
+        self._flush_callbacks.append(callback)
+    
+    def register_task(self, task: asyncio.Task):
+        """注册收到信号时需要立即取消的任务
+        
+        只设置停止标志时，任务要等当前的浏览、等待结束后才会退出；取消后会立即进入清理。
+        
+        Args:
+            task: asyncio 任务，例如运行自动化流程的任务
+        """
+        self._tasks.append(task)
+    
     def _setup_handlers(self):
         """设置信号处理器"""
         for sig in (signal.SIGINT, signal.SIGTERM):
@@ -21,6 +41,11 @@ class SignalHandler:
         """信号处理函数"""
         Logger.info('收到中断信号')
         self.stop_callback()
+        for callback in self._flush_callbacks:
+            asyncio.ensure_future(callback())
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
     
     def cleanup(self):
         """清理信号处理器"""
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+from config.app_config import SHUTDOWN_CONFIG
+from utils.logger import Logger
+
+
+def _run_in_daemon_thread(func):
+    """在守护线程中执行阻塞调用
+
+    不使用默认线程池：超时后线程仍在等待网络响应，asyncio.run 退出时会等线程池中的线程结束，
+    守护线程则不会拖住进程退出。
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def target():
+        result, error = None, None
+        try:
+            result = func()
+        except Exception as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(resolve, result, error)
+        except RuntimeError:
+            pass  # 事件循环已经关闭
+
+    threading.Thread(target=target, name=f'shutdown-{getattr(func, "__name__", "call")}', daemon=True).start()
+    return future
+
+
+async def bounded(what: str, action, timeout: float = None) -> bool:
+    """在限定时间内执行一个清理步骤
+
+    超时或出错只记录日志，不影响后面的清理步骤。
+
+    Args:
+        what: 步骤名称，用于日志
+        action: 协程对象，或者无参的阻塞函数（在守护线程中执行）
+        timeout: 可选，超时时间（秒），默认使用 SHUTDOWN_CONFIG['step_timeout']
+
+    Returns:
+        bool: 是否在限定时间内成功完成
+    """
+    if timeout is None:
+        timeout = SHUTDOWN_CONFIG['step_timeout']
+    if not asyncio.iscoroutine(action):
+        action = _run_in_daemon_thread(action)
+    try:
+        await asyncio.wait_for(action, timeout)
+        return True
+    except asyncio.TimeoutError:
+        Logger.warn(f'{what}超时（{timeout} 秒），跳过')
+    except Exception as e:
+        Logger.error(f'{what}时出错', e)
+    return False
+
+
+async def quit_driver(driver, timeout: float = None) -> bool:
+    """关闭 Appium 会话，最多等待 timeout 秒
+
+    Args:
+        driver: WebDriver 实例
+        timeout: 可选，超时时间（秒），默认使用 SHUTDOWN_CONFIG['quit_timeout']
+
+    Returns:
+        bool: 会话是否已正常关闭
+    """
+    if timeout is None:
+        timeout = SHUTDOWN_CONFIG['quit_timeout']
+    return await bounded('关闭会话', driver.quit, timeout)
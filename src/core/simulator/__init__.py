@@ -0,0 +1,4 @@
+from .driver import SimulatedDriver, SimulatedElement
+from .feed import ListingGenerator
+
+__all__ = ['SimulatedDriver', 'SimulatedElement', 'ListingGenerator']
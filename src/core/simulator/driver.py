@@ -0,0 +1,353 @@
+import copy
+import random
+import time
+import weakref
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+from selenium.common.exceptions import InvalidSessionIdException, StaleElementReferenceException
+
+from config.app_config import SIMULATOR_CONFIG
+from core.drivers.replay import HierarchyDriver, ReplayElement
+from .feed import ListingGenerator
+
+HOME, CITY_SERVICE, DETAIL, LAUNCHER = 'home', 'city_service', 'detail', 'launcher'
+
+_FEED_ID = 'com.taobao.idlefish:id/nested_recycler_view'
+_ROW_HEIGHT = 600
+
+
+def _merge_config(config: dict = None) -> dict:
+    """合并配置，latency 按命令类型逐项覆盖"""
+    merged = copy.deepcopy(SIMULATOR_CONFIG)
+    for key, value in (config or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key].update(value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _add(parent, cls, bounds, **attributes):
+    """添加一个节点，bounds 为 (左, 上, 右, 下)"""
+    attributes = {name.replace('_', '-'): value for name, value in attributes.items()}
+    return ET.SubElement(parent, 'node', {'class': cls, 'bounds': '[%d,%d][%d,%d]' % bounds, **attributes})
+
+
+class SimulatedElement(ReplayElement):
+    """模拟器中的元素
+
+    记住获取时所在的页面层级，页面重绘或离开该页面后再访问会抛出 StaleElementReferenceException，
+    与真实设备上跨循环持有 WebElement 的表现一致。
+    """
+
+    def __init__(self, driver, node):
+        super().__init__(driver, node)
+        self._root = driver._root
+
+    def _check(self, kind='attribute'):
+        self._driver._command(kind)
+        if self._root is not self._driver._root:
+            raise StaleElementReferenceException('元素已失效（页面已重绘或已离开）')
+
+    @property
+    def text(self):
+        self._check()
+        return super().text
+
+    @property
+    def rect(self):
+        self._check()
+        return super().rect
+
+    def get_attribute(self, name):
+        self._check()
+        return super().get_attribute(name)
+
+    def is_displayed(self):
+        self._check()
+        return super().is_displayed()
+
+    def click(self):
+        self._check('click')
+        self._driver.click(self)
+
+    def find_element(self, by, value):
+        self._check('find')
+        return self._driver._find(by, value, self._node, single=True)
+
+    def find_elements(self, by, value):
+        self._check('find')
+        return self._driver._find(by, value, self._node)
+
+
+class SimulatedDriver(HierarchyDriver):
+    """闲鱼应用模拟器
+
+    实现与 ReplayDriver 相同的驱动接口，页面层级按当前状态实时生成：
+    - 首页：无限的商品流，滑动后加载新的一屏，偶尔卡在加载中
+    - 详情页：点击商品进入，滑动若干屏后到底，返回时偶尔落到城市服务页
+    - 城市服务页：点击底部闲鱼tab回到首页
+    - 桌面：应用崩溃后停留在这里，直到重新激活应用
+
+    每个命令按配置的对数正态分布采样耗时，并按概率注入元素失效、应用崩溃和会话丢失。
+    """
+
+    element_class = SimulatedElement
+
+    def __init__(self, device_id: str = 'sim', config: dict = None, seed=None, window_size=(1080, 2400)):
+        """初始化
+
+        Args:
+            device_id: 设备标识，作为 capabilities 中的 udid
+            config: 可选，覆盖 SIMULATOR_CONFIG 中的配置
+            seed: 可选，随机种子，默认使用配置中的 seed
+            window_size: (宽, 高) 屏幕尺寸
+        """
+        super().__init__(window_size)
+        self.config = _merge_config(config)
+        self.capabilities = {'udid': device_id, 'deviceName': device_id, 'platformName': 'Android'}
+        self.rng = random.Random(self.config['seed'] if seed is None else seed)
+        self.feed = ListingGenerator(self.config, random.Random(self.rng.random()))
+        self.counts = Counter()  # 各类命令的次数
+        self.events = Counter()  # 注入的卡顿、元素失效、崩溃等事件的次数
+        self.latency = 0.0  # 采样的命令耗时总和（秒）
+        self.screen = HOME
+        self.items = self.feed.screen()  # 首页当前一屏的商品
+        self.listing = None  # 详情页的商品
+        self.detail_offset = 0
+        self.session_lost = False
+        self._loading_until = 0.0
+        self._root = None
+        self._home_root = None  # 离开首页时保留首页的层级，返回后之前获取的元素仍然有效
+        self._targets = weakref.WeakKeyDictionary()  # 可点击的节点 -> 点击后的动作，随页面层级一起释放
+
+    # ---- 命令与故障注入 ----
+
+    def _command(self, kind: str):
+        """执行一个命令前调用：采样耗时，按概率注入故障"""
+        if self.session_lost:
+            raise InvalidSessionIdException('模拟会话已丢失')
+        config = self.config
+        self.counts[kind] += 1
+        median, sigma = config['latency'].get(kind) or config['latency']['other']
+        seconds = median * self.rng.lognormvariate(0, sigma)
+        self.latency += seconds
+        if config['latency_scale'] > 0:
+            time.sleep(seconds * config['latency_scale'])
+
+        roll = self.rng.random()
+        if roll < config['session_loss_rate']:
+            self.session_lost = True
+            self.events['session_loss'] += 1
+            raise InvalidSessionIdException('模拟会话已丢失')
+        roll -= config['session_loss_rate']
+        if roll < config['crash_rate']:
+            self.events['crash'] += 1
+            self._show(LAUNCHER)
+            return
+        roll -= config['crash_rate']
+        if roll < config['stale_rate'] and self.screen != LAUNCHER:
+            # 界面重绘，之前获取的元素全部失效
+            self.events['stale'] += 1
+            self._invalidate()
+
+    def _invalidate(self):
+        self._root = None
+        if self.screen == HOME:
+            self._home_root = None
+
+    def _show(self, screen: str):
+        """切换到指定页面"""
+        if self.screen == HOME and self._root is not None:
+            self._home_root = self._root
+        self.screen = screen
+        self._root = self._home_root if screen == HOME else None
+        self._loading_until = 0.0
+
+    def _load(self):
+        """开始加载新内容，按概率卡住一段时间"""
+        if self.rng.random() < self.config['stall_rate']:
+            median, sigma = self.config['stall_seconds']
+            self._loading_until = time.monotonic() + median * self.rng.lognormvariate(0, sigma)
+            self.events['stall'] += 1
+
+    def _loading(self) -> bool:
+        return self._loading_until and time.monotonic() < self._loading_until
+
+    # ---- 页面层级 ----
+
+    def _tree(self):
+        if self._root is not None and self._loading_until and not self._loading():
+            # 加载完成，页面重绘
+            self._loading_until = 0.0
+            self._invalidate()
+        if self._root is None:
+            self._root = getattr(self, f'_render_{self.screen}')()
+        return self._root
+
+    def _frame(self):
+        width, height = self.window_size
+        hierarchy = ET.Element('hierarchy', rotation='0')
+        return hierarchy, _add(hierarchy, 'android.widget.FrameLayout', (0, 0, width, height))
+
+    def _tab_bar(self, frame, selected: bool):
+        width, height = self.window_size
+        desc = '闲鱼，未读消息数0，选中状态' if selected else '闲鱼，未选中状态'
+        tab = _add(frame, 'android.view.View', (0, height - 100, width // 5, height), content_desc=desc)
+        self._targets[tab] = lambda: self._show(HOME)
+        _add(frame, 'android.view.View', (width // 5, height - 100, width * 2 // 5, height), content_desc='会玩')
+
+    def _render_home(self):
+        width, height = self.window_size
+        hierarchy, frame = self._frame()
+        _add(frame, 'android.view.View', (0, 0, 100, 100), content_desc='扫一扫')
+        _add(frame, 'android.widget.TextView', (120, 20, width - 120, 90),
+             resource_id='com.taobao.idlefish:id/search_term', text='搜索')
+        if self._loading():
+            _add(frame, 'android.widget.ProgressBar', (width // 2 - 50, height // 2 - 50, width // 2 + 50, height // 2 + 50))
+        else:
+            feed = _add(frame, 'androidx.recyclerview.widget.RecyclerView', (0, 200, width, height - 200),
+                        resource_id=_FEED_ID)
+            column = width // 2
+            for index, listing in enumerate(self.items):
+                left, top = (index % 2) * column, 200 + (index // 2) * _ROW_HEIGHT
+                card = _add(feed, 'android.widget.FrameLayout', (left, top, left + column, top + _ROW_HEIGHT))
+                title = _add(card, 'android.widget.TextView', (left, top + 400, left + column, top + 500),
+                             text=listing['title'])
+                _add(card, 'android.widget.TextView', (left, top + 500, left + column, top + 580),
+                     text=f"¥{listing['price']}")
+                self._targets[card] = self._targets[title] = lambda listing=listing: self._open(listing)
+        self._tab_bar(frame, selected=True)
+        return hierarchy
+
+    def _render_city_service(self):
+        width, height = self.window_size
+        hierarchy, frame = self._frame()
+        _add(frame, 'android.view.View', (0, 0, 100, 100), content_desc='扫一扫')
+        _add(frame, 'android.widget.TextView', (0, 200, width, 300), text='同城服务')
+        self._tab_bar(frame, selected=False)
+        return hierarchy
+
+    def _render_detail(self):
+        width, height = self.window_size
+        hierarchy, frame = self._frame()
+        if self._loading():
+            _add(frame, 'android.widget.ProgressBar', (width // 2 - 50, height // 2 - 50, width // 2 + 50, height // 2 + 50))
+            return hierarchy
+        listing = self.listing
+        rows = [
+            f"¥{listing['price']}",
+            listing['description'],
+            f"{listing['want_count']}人想要",
+            f"{listing['post_time']}发布 · {listing['location']}",
+            listing['seller'],
+            '信用极好 · 回复率98%',
+        ]
+        rows += [f'商品图片 {page + 1}' for page in range(self.config['detail_pages'] * 2)]
+        rows.append('为你推荐')
+        # 每滑动一次往下移动两行，滑到底后内容不再变化
+        start = min(self.detail_offset, self.config['detail_pages']) * 2
+        for index, text in enumerate(rows[start:start + 8]):
+            top = 150 + index * 200
+            _add(frame, 'android.widget.TextView', (40, top, width - 40, top + 180), text=text)
+        bottom = height - 150
+        _add(frame, 'android.view.View', (0, bottom, 200, height), content_desc=f"收藏, {listing['want_count'] // 2}")
+        _add(frame, 'android.view.View', (width - 600, bottom, width - 300, height), content_desc='卖同款, 卖同款')
+        _add(frame, 'android.view.View', (width - 300, bottom, width, height), content_desc='我想要, 我想要')
+        return hierarchy
+
+    def _render_launcher(self):
+        width, height = self.window_size
+        hierarchy, frame = self._frame()
+        _add(frame, 'android.widget.TextView', (0, 0, width, 100), text='桌面')
+        return hierarchy
+
+    # ---- 页面切换 ----
+
+    def _open(self, listing):
+        self.listing = listing
+        self.detail_offset = 0
+        self._show(DETAIL)
+        self._load()
+
+    def _refresh_feed(self):
+        self.items = self.feed.screen()
+        self._home_root = None
+        self._root = None
+        self._load()
+
+    def _launch(self):
+        self._home_root = None
+        self._show(HOME)
+        self._refresh_feed()
+
+    @property
+    def page_source(self):
+        self._command('page_source')
+        return ET.tostring(self._tree(), encoding='unicode')
+
+    def _find(self, by, value, root=None, single=False):
+        if root is None:
+            self._command('find')
+        return super()._find(by, value, root, single)
+
+    def click(self, element):
+        self._record('click', element._node.get('bounds'))
+        action = self._targets.get(element._node)
+        if action:
+            action()
+
+    def swipe(self, start_x, start_y, end_x, end_y, duration=None):
+        self._command('swipe')
+        self._record('swipe', start_x, start_y, end_x, end_y)
+        if self.screen == HOME and not self._loading():
+            self._refresh_feed()
+        elif self.screen == DETAIL:
+            self.detail_offset = max(0, self.detail_offset + (1 if end_y < start_y else -1))
+            self._root = None
+
+    def back(self):
+        self._command('back')
+        self._record('back')
+        if self.screen == DETAIL:
+            self._show(CITY_SERVICE if self.rng.random() < self.config['city_service_rate'] else HOME)
+        elif self.screen == CITY_SERVICE:
+            self._show(HOME)
+
+    def execute_script(self, script, *args):
+        self._command('other')
+        self._record('script', script)
+        if script == 'mobile: deepLink' and self.screen != HOME:
+            self._launch()
+        return None
+
+    def activate_app(self, package):
+        self._command('app')
+        self._record('activate', package)
+        if self.screen == LAUNCHER:
+            self._launch()
+
+    def terminate_app(self, package):
+        self._command('app')
+        self._record('terminate', package)
+        self._home_root = None
+        self._show(LAUNCHER)
+        return True
+
+    def update_settings(self, settings):
+        self._command('settings')
+        super().update_settings(settings)
+
+    def get_settings(self):
+        self._command('settings')
+        return super().get_settings()
+
+    def stats(self) -> dict:
+        """命令和注入事件的统计"""
+        return {
+            'commands': dict(self.counts),
+            'events': dict(self.events),
+            'simulated_latency': round(self.latency, 3),
+            'feed': self.feed.stats(),
+        }
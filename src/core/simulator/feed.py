@@ -0,0 +1,99 @@
+import random
+from collections import deque
+
+from config.app_config import SEARCH_CONFIG
+
+_LOCATIONS = ('广东深圳', '浙江杭州', '上海', '北京', '江苏南京', '四川成都', '湖北武汉', '福建厦门')
+_POST_TIMES = ('刚刚', '5分钟前', '1小时前', '3小时前', '昨天', '2天前', '1周前')
+_SELLERS = ('小鱼干', '闲置达人', '不想上班', '阿猫阿狗', '收纳控', '搬家清仓', '学生党')
+
+
+def _zipf_weights(count: int, exponent: float):
+    return [1.0 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+class ListingGenerator:
+    """模拟商品流的商品生成器
+
+    标题由前缀、主体、后缀三部分组成，每部分的词按 Zipf 分布抽取（靠前的词更常见）。
+    按 match_rate 在标题中混入关键词，按 duplicate_rate 把最近出现过的商品换个说法再发一次，
+    用来覆盖关键词匹配和重复发布识别。
+    """
+
+    def __init__(self, config: dict, rng: random.Random = None):
+        """初始化
+
+        Args:
+            config: 模拟器配置，格式同 SIMULATOR_CONFIG
+            rng: 可选，random.Random 实例，便于复现
+        """
+        self.config = config
+        self.rng = rng or random.Random()
+        titles = config['titles']
+        self._parts = []
+        for name in ('prefixes', 'subjects', 'suffixes'):
+            words = list(titles[name])
+            self._parts.append((words, _zipf_weights(len(words), titles['zipf'])))
+        self.keywords = list(config.get('keywords') or SEARCH_CONFIG['keywords'])
+        self._recent = deque(maxlen=100)  # 可以被重复发布的最近商品
+        self._next_id = self.rng.randrange(10 ** 11, 10 ** 12)
+        self.generated = 0
+        self.matches = 0
+        self.duplicates = 0
+
+    def _word(self, index: int) -> str:
+        words, weights = self._parts[index]
+        return self.rng.choices(words, weights)[0]
+
+    def _title(self) -> str:
+        subject = self._word(1)
+        if self.keywords and self.rng.random() < self.config['match_rate']:
+            subject = f'{self.rng.choice(self.keywords)} {subject}'
+            self.matches += 1
+        return ' '.join(part for part in (self._word(0), subject, self._word(2)) if part)
+
+    def _price(self) -> str:
+        median, sigma = self.config['price']
+        return f'{max(1.0, self.rng.lognormvariate(0, sigma) * median):.0f}'
+
+    def next(self) -> dict:
+        """生成下一个商品
+
+        Returns:
+            dict: 商品，包含 item_id、title、price、seller、want_count、post_time、location、description
+        """
+        self._next_id += 1
+        self.generated += 1
+        if self._recent and self.rng.random() < self.config['duplicate_rate']:
+            # 重复发布：同一件商品换个后缀、改个价格再发一次
+            original = self.rng.choice(self._recent)
+            title = original['title']
+            if self.rng.random() < 0.5:
+                title = f'{title} {self._word(2)}'.strip()
+            listing = dict(original, item_id=str(self._next_id), title=title,
+                           price=f"{float(original['price']) * self.rng.uniform(0.9, 1.0):.0f}")
+            self.duplicates += 1
+        else:
+            title = self._title()
+            listing = {
+                'item_id': str(self._next_id),
+                'title': title,
+                'price': self._price(),
+                'seller': self.rng.choice(_SELLERS),
+                'want_count': int(self.rng.expovariate(1 / 8)),
+                'post_time': self.rng.choice(_POST_TIMES),
+                'location': self.rng.choice(_LOCATIONS),
+                'description': f'{title}，{self.rng.choice(("自用闲置", "搬家出", "买多了", "换新了"))}，'
+                               f'{self.rng.choice(("功能正常", "无磕碰", "有轻微使用痕迹", "配件齐全"))}，'
+                               f'{self.rng.choice(("不退不换", "可小刀", "同城可自提", "拍下尽快发货"))}',
+            }
+        self._recent.append(listing)
+        return listing
+
+    def screen(self) -> list:
+        """生成一屏商品"""
+        low, high = self.config['items_per_screen']
+        return [self.next() for _ in range(self.rng.randint(low, high))]
+
+    def stats(self) -> dict:
+        return {'generated': self.generated, 'matches': self.matches, 'duplicates': self.duplicates}
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""模拟设备压力测试
+
+在一个进程里用 SimulatedDriver 模拟多台设备，每台设备运行完整的 PageFactory、TaskManager 和任务，
+定期输出吞吐量、事件循环延迟和 CPU 占用，用来发现设备数增加后的瓶颈。
+
+在 src 目录下运行：python -m core.simulator.load --devices 200 --duration 300
+"""
+import asyncio
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+# 将 src 目录添加到 Python 路径
+src_path = str(Path(__file__).parents[2].absolute())
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from config.app_config import CHECKPOINT_CONFIG, SHUTDOWN_CONFIG
+from core.metrics import get_metrics
+from core.throttle import get_limiter
+from core.drivers import create_page_factory
+from core.simulator.driver import SimulatedDriver
+
+
+class CountingSink:
+    """只统计记录数的结果输出，接口与 ResultSink 相同"""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def put(self, kind: str, record: dict) -> bool:
+        self.counts[kind] += 1
+        return True
+
+    async def flush(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class LoopLagMonitor:
+    """定期测量事件循环的调度延迟，设备太多时延迟会明显升高"""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.samples = []
+        self._mark = 0
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(loop.time() - start - self.interval)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    def take(self, since_last: bool = True) -> dict:
+        """延迟统计（毫秒）
+
+        Args:
+            since_last: 为 True 时只统计上次调用以来的采样，否则统计全部采样
+        """
+        samples = sorted(self.samples[self._mark:] if since_last else self.samples)
+        self._mark = len(self.samples)
+        if not samples:
+            return {'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+        pick = lambda quantile: samples[min(len(samples) - 1, int(len(samples) * quantile))] * 1000
+        return {'p50': pick(0.5), 'p99': pick(0.99), 'max': samples[-1] * 1000}
+
+
+class SimulatedDevice:
+    """一台模拟设备及其完整的任务栈"""
+
+    def __init__(self, device_id: str, config: dict = None, seed=None, sink=None, dedup=None, driver=None):
+        from core.tasks.task_manager import TaskManager
+
+        self.device_id = device_id
+        # 也可以传入其他离线驱动，例如 ReplayDriver
+        self.driver = driver or SimulatedDriver(device_id, config, seed)
+        self.metrics = get_metrics(self.driver, device_id)
+        # 每台模拟设备视为不同的账号，不共享账号级的令牌桶
+        get_limiter(self.driver, {'account': device_id})
+        self.page_factory = create_page_factory(self.driver)
+        self.task_manager = TaskManager(self.driver, self.page_factory, sink=sink, dedup=dedup)
+        self.task = None
+        self.runner = None
+
+    def start(self, task_id: str):
+        self.page_factory.start_observer()
+        self.runner = asyncio.create_task(self.task_manager.run_task(task_id))
+
+    def stop(self):
+        self.progress()
+        self.task_manager.stop_current_task()
+
+    async def close(self):
+        await self.page_factory.stop_observer()
+
+    def progress(self) -> dict:
+        """任务进度，任务结束后返回结束时的进度"""
+        self.task = self.task_manager.current_task or self.task
+        return dict(getattr(self.task, 'progress', None) or {})
+
+
+def _summarize(devices, sink) -> dict:
+    totals = Counter()
+    commands = Counter()
+    events = Counter()
+    latency = 0.0
+    for device in devices:
+        totals.update(device.progress())
+        if not hasattr(device.driver, 'stats'):
+            continue
+        stats = device.driver.stats()
+        commands.update(stats['commands'])
+        events.update(stats['events'])
+        latency += stats['simulated_latency']
+    return {
+        'progress': dict(totals),
+        'records': dict(sink.counts),
+        'commands': sum(commands.values()),
+        'events': dict(events),
+        'simulated_latency': latency,
+    }
+
+
+@contextlib.asynccontextmanager
+async def running_devices(devices: int, config: dict = None, seed: int = None, sink=None, dedup=None,
+                          output=None, driver_factory=None):
+    """创建一组模拟设备，退出时停止任务并释放资源
+
+    运行期间设备的日志写入 output（默认丢弃），检查点写到临时目录，不影响真实设备的进度。
+
+    Args:
+        devices: 设备数
+        config: 可选，覆盖 SIMULATOR_CONFIG 中的配置
+        seed: 可选，随机种子，第 i 台设备使用 seed + i
+        sink: 可选，共享的结果输出
+        dedup: 可选，共享的去重器
+        output: 可选，设备日志的输出文件
+        driver_factory: 可选，按设备序号创建驱动的函数，默认使用 SimulatedDriver
+
+    Yields:
+        list: 尚未启动任务的 SimulatedDevice 列表
+    """
+    checkpoint_directory = CHECKPOINT_CONFIG['directory']
+    with tempfile.TemporaryDirectory() as directory, \
+            open(output or os.devnull, 'w', encoding='utf-8') as log_file, \
+            contextlib.redirect_stdout(log_file):
+        CHECKPOINT_CONFIG['directory'] = directory
+        simulated = []
+        try:
+            for index in range(devices):
+                simulated.append(SimulatedDevice(
+                    f'sim-{index:03d}', config, None if seed is None else seed + index, sink, dedup,
+                    driver_factory(index) if driver_factory else None
+                ))
+            yield simulated
+        finally:
+            for device in simulated:
+                device.stop()
+            runners = [device.runner for device in simulated if device.runner]
+            if runners:
+                _, pending = await asyncio.wait(runners, timeout=SHUTDOWN_CONFIG['task_timeout'] * 5)
+                for runner in pending:
+                    runner.cancel()
+                await asyncio.gather(*runners, return_exceptions=True)
+            for device in simulated:
+                await device.close()
+            CHECKPOINT_CONFIG['directory'] = checkpoint_directory
+
+
+async def run_load_test(devices: int = 100, duration: float = 60, task_id: str = 'browse_items',
+                        config: dict = None, seed: int = None, interval: float = 10, output=None):
+    """运行压力测试
+
+    模拟设备的日志写入 output（默认丢弃），测试结果写到标准输出。
+
+    Args:
+        devices: 模拟设备数
+        duration: 运行时长（秒）
+        task_id: 每台设备运行的任务ID
+        config: 可选，覆盖 SIMULATOR_CONFIG 中的配置，默认不实际阻塞命令耗时
+        seed: 可选，随机种子，第 i 台设备使用 seed + i
+        interval: 输出统计的间隔（秒）
+        output: 可选，设备日志的输出文件
+
+    Returns:
+        dict: 最终统计
+    """
+    from core.dedup import create_deduper
+
+    console = sys.stdout
+    config = dict({'latency_scale': 0.0}, **(config or {}))
+    sink = CountingSink()
+    dedup = create_deduper()
+    lag = LoopLagMonitor()
+
+    def report(label, elapsed, cpu, summary, since_last=True):
+        stats = lag.take(since_last)
+        progress = summary['progress']
+        per_hour = progress.get('viewed', 0) / elapsed * 3600 if elapsed > 0 else 0.0
+        print(
+            f"[{label} {elapsed:6.0f}s] 设备 {devices}，扫描 {progress.get('scanned', 0)}，"
+            f"浏览 {progress.get('viewed', 0)}（{per_hour:.0f}/小时），记录 {sum(summary['records'].values())}，"
+            f"命令 {summary['commands']}（{summary['commands'] / max(elapsed, 1e-9):.0f}/秒），"
+            f"CPU {cpu * 100:.0f}%，循环延迟 p50 {stats['p50']:.1f}ms p99 {stats['p99']:.1f}ms "
+            f"最大 {stats['max']:.1f}ms，事件 {summary['events']}",
+            file=console, flush=True
+        )
+
+    async with running_devices(devices, config, seed, sink, dedup, output) as simulated:
+        lag.start()
+        try:
+            start, cpu_start = time.monotonic(), time.process_time()
+            for device in simulated:
+                device.start(task_id)
+
+            last, cpu_last = start, cpu_start
+            while time.monotonic() - start < duration:
+                await asyncio.sleep(min(interval, duration - (time.monotonic() - start)))
+                now, cpu_now = time.monotonic(), time.process_time()
+                report('运行', now - start, (cpu_now - cpu_last) / max(now - last, 1e-9), _summarize(simulated, sink))
+                last, cpu_last = now, cpu_now
+        finally:
+            await lag.stop()
+
+    elapsed = time.monotonic() - start
+    summary = _summarize(simulated, sink)
+    report('结束', elapsed, (time.process_time() - cpu_start) / max(elapsed, 1e-9), summary, since_last=False)
+    return summary
+
+
+async def run_from_args(args):
+    """按 python src/cli.py simulate 的命令行参数运行压力测试"""
+    config = {'latency_scale': args.latency_scale}
+    for key in ('crash_rate', 'stale_rate', 'stall_rate'):
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+    return await run_load_test(args.devices, args.duration, args.task, config, args.seed, args.interval, args.log)
+
+
+if __name__ == '__main__':
+    # 命令行参数与 python src/cli.py simulate 相同
+    from cli import main
+    sys.exit(main(['simulate', *sys.argv[1:]]))
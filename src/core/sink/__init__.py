@@ -0,0 +1,5 @@
+from .result_sink import ResultSink, create_sink
+from .writers import JsonlWriter, SqliteWriter, ParquetWriter
+from .reader import read_records, guess_format
+
+__all__ = ['ResultSink', 'create_sink', 'JsonlWriter', 'SqliteWriter', 'ParquetWriter', 'read_records', 'guess_format']
@@ -0,0 +1,53 @@
+import json
+import os
+import sqlite3
+
+_FORMATS_BY_EXTENSION = {
+    '.jsonl': 'jsonl',
+    '.json': 'jsonl',
+    '.db': 'sqlite',
+    '.sqlite': 'sqlite',
+    '.sqlite3': 'sqlite',
+    '.parquet': 'parquet',
+}
+
+
+def guess_format(path: str) -> str:
+    """按扩展名判断输出格式，无法判断时按 JSONL 处理"""
+    return _FORMATS_BY_EXTENSION.get(os.path.splitext(path)[1].lower(), 'jsonl')
+
+
+def read_records(path: str, format: str = None):
+    """逐条读取 ResultSink 保存的商品记录
+
+    Args:
+        path: 输出文件路径
+        format: 可选，jsonl、sqlite 或 parquet，默认按扩展名判断
+
+    Yields:
+        dict: 商品记录，与写入时的字典相同
+    """
+    format = format or guess_format(path)
+    if format == 'jsonl':
+        with open(path, encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    elif format == 'sqlite':
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            for (data,) in conn.execute('SELECT data FROM records ORDER BY rowid'):
+                yield json.loads(data)
+        finally:
+            conn.close()
+    elif format == 'parquet':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError('读取 Parquet 需要安装 pyarrow: pip install pyarrow')
+        parquet_file = pq.ParquetFile(path)
+        for index in range(parquet_file.num_row_groups):
+            for data in parquet_file.read_row_group(index, columns=['data']).column('data').to_pylist():
+                yield json.loads(data)
+    else:
+        raise ValueError(f'未知的输出格式: {format}')
@@ -0,0 +1,189 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.logger import Logger
+from config.app_config import SINK_CONFIG
+from .writers import JsonlWriter, SqliteWriter, ParquetWriter
+
+WRITERS = {
+    'jsonl': JsonlWriter,
+    'sqlite': SqliteWriter,
+    'parquet': ParquetWriter,
+}
+
+
+class ResultSink:
+    """商品记录输出
+
+    浏览过程中通过 put 把卡片和详情记录放入内存队列，后台协程攒批后交给单独的写线程，
+    浏览主循环不会等待磁盘写入。攒够 batch_size 条或距上次写入超过 flush_interval 秒时写一次。
+    """
+
+    def __init__(self, writer, batch_size=200, flush_interval=2.0, queue_size=10000):
+        """初始化输出
+
+        Args:
+            writer: 输出写入器，需要实现 write_batch、sync、close
+            batch_size: 攒够多少条记录写一次
+            flush_interval: 最长多久写一次（秒）
+            queue_size: 内存队列上限
+        """
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.written = 0  # 已写入的记录数
+        self.dropped = 0  # 队列满时丢弃的记录数
+        self._queue = None
+        self._pending = []
+        self._task = None
+        self._ready = None  # 有新记录或需要停止时唤醒后台协程
+        self._stopping = False
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='result-sink')
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_depth(self) -> int:
+        """队列中等待写入的记录数"""
+        return (self._queue.qsize() if self._queue else 0) + len(self._pending)
+
+    def start(self):
+        """启动后台写入"""
+        if not self.running:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._ready = asyncio.Event()
+            self._stopping = False
+            self._task = asyncio.ensure_future(self._run())
+        return self
+
+    def put(self, kind, record):
+        """放入一条记录，不会阻塞
+
+        Args:
+            kind: 记录类型，例如 card、detail
+            record: 记录字典
+
+        Returns:
+            bool: 是否成功放入队列
+        """
+        if self._queue is None:
+            return False
+        data = dict(record)
+        data['kind'] = kind
+        data.setdefault('created_at', time.time())
+        try:
+            self._queue.put_nowait(data)
+            self._ready.set()
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                Logger.warn(f'输出队列已满，已丢弃 {self.dropped} 条记录')
+            return False
+
+    def _drain(self):
+        """把队列中已有的记录移到待写入列表"""
+        while not self._queue.empty() and len(self._pending) < self.batch_size:
+            self._pending.append(self._queue.get_nowait())
+
+    async def _write(self, sync=False):
+        """把待写入列表交给写线程"""
+        batch, self._pending = self._pending, []
+        if not batch and not sync:
+            return
+        loop = asyncio.get_event_loop()
+        try:
+            if batch:
+                await loop.run_in_executor(self._executor, self.writer.write_batch, batch)
+                self.written += len(batch)
+            if sync:
+                await loop.run_in_executor(self._executor, self.writer.sync)
+        except Exception as e:
+            Logger.error(f'写入 {len(batch)} 条记录失败', e)
+
+    async def _run(self):
+        """后台攒批写入，设置停止标志后在当前批次写完时退出"""
+        last_write = time.monotonic()
+        while not self._stopping:
+            self._drain()
+            if len(self._pending) >= self.batch_size or time.monotonic() - last_write >= self.flush_interval:
+                await self._write()
+                last_write = time.monotonic()
+                continue
+
+            # 只等待唤醒事件，不取消正在进行的写入，也不会在取消时丢失已取出的记录
+            self._ready.clear()
+            if self._queue.empty():
+                timeout = max(0.0, self.flush_interval - (time.monotonic() - last_write))
+                try:
+                    await asyncio.wait_for(self._ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def flush(self):
+        """立即写出队列中的全部记录并落盘"""
+        if self._queue is None:
+            return
+        while not self._queue.empty() or self._pending:
+            self._drain()
+            await self._write()
+        await self._write(sync=True)
+
+    async def _finish(self):
+        """让后台协程写完当前批次后退出，再写出剩余记录"""
+        if self._task:
+            self._stopping = True
+            self._ready.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def close(self, timeout=5):
+        """停止后台写入，写出剩余记录并关闭输出
+
+        Args:
+            timeout: 最长等待时间（秒）
+        """
+        try:
+            await asyncio.wait_for(self._finish(), timeout)
+            await asyncio.get_event_loop().run_in_executor(self._executor, self.writer.close)
+            Logger.info(f'结果输出已关闭，共写入 {self.written} 条记录')
+        except asyncio.TimeoutError:
+            Logger.warn(f'结果输出关闭超时，剩余 {self.queue_depth} 条记录未写入')
+        except Exception as e:
+            Logger.error('关闭结果输出失败', e)
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+def create_sink(config=None):
+    """按配置创建并启动结果输出
+
+    Args:
+        config: 可选，覆盖 SINK_CONFIG 中的配置
+
+    Returns:
+        ResultSink: 结果输出实例，未启用时返回 None
+    """
+    settings = dict(SINK_CONFIG)
+    if config:
+        settings.update(config)
+    if not settings['enabled']:
+        return None
+
+    writer_class = WRITERS.get(settings['format'])
+    if writer_class is None:
+        raise ValueError(f"未知的输出格式: {settings['format']}")
+
+    Logger.info(f"商品记录将保存到: {settings['path']}")
+    sink = ResultSink(
+        writer_class(settings['path']),
+        batch_size=settings['batch_size'],
+        flush_interval=settings['flush_interval'],
+        queue_size=settings['queue_size']
+    )
+    return sink.start()
@@ -0,0 +1,120 @@
+import json
+import os
+import sqlite3
+
+
+def _ensure_parent(path):
+    """确保输出文件所在目录存在"""
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+
+
+class JsonlWriter:
+    """JSON Lines 输出，每条记录一行"""
+
+    def __init__(self, path):
+        _ensure_parent(path)
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8', buffering=1024 * 1024)
+
+    def write_batch(self, records):
+        """写入一批记录"""
+        self._file.write(''.join(
+            json.dumps(record, ensure_ascii=False) + '\n' for record in records
+        ))
+        self._file.flush()
+
+    def sync(self):
+        """把数据落盘"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self.sync()
+        self._file.close()
+
+
+class SqliteWriter:
+    """SQLite 输出，每批记录在一个事务中提交"""
+
+    def __init__(self, path):
+        _ensure_parent(path)
+        self.path = path
+        # 写入只在 ResultSink 的单个写线程中进行
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS records ('
+            'kind TEXT, item_id TEXT, title TEXT, data TEXT, created_at REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_records_item_id ON records (item_id)')
+        self._conn.commit()
+
+    def write_batch(self, records):
+        """写入一批记录"""
+        with self._conn:
+            self._conn.executemany(
+                'INSERT INTO records (kind, item_id, title, data, created_at) VALUES (?, ?, ?, ?, ?)',
+                [
+                    (
+                        record.get('kind'),
+                        record.get('item_id'),
+                        record.get('title'),
+                        json.dumps(record, ensure_ascii=False),
+                        record.get('created_at'),
+                    ) for record in records
+                ]
+            )
+
+    def sync(self):
+        """把数据落盘"""
+        self._conn.execute('PRAGMA wal_checkpoint(PASSIVE)')
+
+    def close(self):
+        self._conn.close()
+
+
+class ParquetWriter:
+    """Parquet 输出，每批记录写成一个 row group
+
+    需要安装 pyarrow。文件尾只在 close 时写入，进程被强制结束时文件无法读取，
+    收到 SIGTERM 时的 flush 也不能让文件变为可读，需要随时可读时使用 jsonl 或 sqlite。
+    """
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError('Parquet 输出需要安装 pyarrow: pip install pyarrow')
+
+        _ensure_parent(path)
+        self.path = path
+        self._pa = pa
+        self._schema = pa.schema([
+            ('kind', pa.string()),
+            ('item_id', pa.string()),
+            ('title', pa.string()),
+            ('data', pa.string()),
+            ('created_at', pa.float64()),
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write_batch(self, records):
+        """写入一批记录"""
+        table = self._pa.Table.from_pydict({
+            'kind': [record.get('kind') for record in records],
+            'item_id': [record.get('item_id') for record in records],
+            'title': [record.get('title') for record in records],
+            'data': [json.dumps(record, ensure_ascii=False) for record in records],
+            'created_at': [record.get('created_at') for record in records],
+        }, schema=self._schema)
+        self._writer.write_table(table)
+
+    def sync(self):
+        """Parquet 文件在关闭时才写入文件尾，无法在这里落盘，已写入的 row group 在关闭前不可读"""
+        pass
+
+    def close(self):
+        self._writer.close()
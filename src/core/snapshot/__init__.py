@@ -0,0 +1,3 @@
+from .hierarchy import HierarchySnapshot, CompactNodes, parse_compact, apply_snapshot_settings
+
+__all__ = ['HierarchySnapshot', 'CompactNodes', 'parse_compact', 'apply_snapshot_settings']
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""页面快照解析性能测试
+
+在 src 目录下运行：python -m core.snapshot.bench
+"""
+import random
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+# 将 src 目录添加到 Python 路径
+src_path = str(Path(__file__).parents[2].absolute())
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from utils.logger import Logger
+from config.app_config import SNAPSHOT_CONFIG
+from core.snapshot.hierarchy import HierarchySnapshot, parse_bounds
+
+_ATTRIBUTES = (
+    'checkable="false" checked="false" clickable="true" enabled="true" focusable="true" focused="false" '
+    'long-clickable="false" password="false" scrollable="false" selected="false" displayed="true" '
+    'package="com.taobao.idlefish"'
+)
+
+
+def _node(rng, depth, index, children=''):
+    top = index * 120
+    return (
+        f'<android.widget.FrameLayout index="{index}" class="android.widget.FrameLayout" '
+        f'text="{"商品" + str(rng.randint(1, 99999)) if depth % 3 == 0 else ""}" content-desc="" '
+        f'resource-id="" {_ATTRIBUTES} bounds="[0,{top}][1080,{top + 120}]">{children}'
+        f'</android.widget.FrameLayout>'
+    )
+
+
+def generate_feed_source(cards=40, depth=12, chrome_nodes=300, seed=42, trimmed=False):
+    """生成类似闲鱼首页的页面 XML
+
+    Args:
+        cards: 商品卡片数
+        depth: 每个卡片的嵌套层数
+        chrome_nodes: 商品流之外的节点数（导航栏、标签页等）
+        seed: 随机种子
+        trimmed: 是否模拟精简后的层级（去掉多余属性、压缩布局层）
+    """
+    rng = random.Random(seed)
+    attributes = '' if trimmed else _ATTRIBUTES
+    depth = depth // 2 if trimmed else depth
+
+    def card(index):
+        inner = ''
+        for level in range(depth):
+            inner = _node(rng, level, index, inner)
+        return inner.replace(_ATTRIBUTES, attributes)
+
+    feed = ''.join(card(index) for index in range(cards))
+    chrome = ''.join(_node(rng, 0, index).replace(_ATTRIBUTES, attributes) for index in range(chrome_nodes))
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><hierarchy rotation="0">'
+        f'{chrome}<androidx.recyclerview.widget.RecyclerView class="androidx.recyclerview.widget.RecyclerView" '
+        f'resource-id="{SNAPSHOT_CONFIG["feed_scope"]}" bounds="[0,200][1080,2200]">{feed}'
+        '</androidx.recyclerview.widget.RecyclerView></hierarchy>'
+    )
+
+
+def _parse_full(source):
+    """原来的解析方式：整棵树解析后为每个节点生成字典"""
+    root = ET.fromstring(source)
+    return [{
+        'class': element.get('class') or element.tag,
+        'text': element.get('text') or '',
+        'desc': element.get('content-desc') or '',
+        'resource_id': element.get('resource-id') or '',
+        'bounds': parse_bounds(element.get('bounds')),
+    } for element in root.iter()]
+
+
+def _timeit(function, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = function()
+    return (time.perf_counter() - start) / rounds * 1000, result
+
+
+def run_benchmark(rounds=20):
+    """对比完整层级 + 整树解析与精简层级 + 流式解析的字节数和耗时
+
+    Returns:
+        dict: 各方式的字节数、节点数和每次解析毫秒数
+    """
+    full = generate_feed_source()
+    trimmed = generate_feed_source(trimmed=True)
+    scope = SNAPSHOT_CONFIG['feed_scope']
+    cases = {
+        'full_tree': (full, lambda: _parse_full(full)),
+        'full_stream': (full, lambda: HierarchySnapshot(full).compact),
+        'trimmed_stream': (trimmed, lambda: HierarchySnapshot(trimmed).compact),
+        'trimmed_scoped': (trimmed, lambda: HierarchySnapshot(trimmed, scope).compact),
+    }
+    report = {}
+    for name, (source, function) in cases.items():
+        milliseconds, nodes = _timeit(function, rounds)
+        size = len(source.encode('utf-8'))
+        report[name] = {'bytes': size, 'nodes': len(nodes), 'parse_ms': milliseconds}
+        Logger.info(f'{name:<16} {size / 1024:>8.1f} KB  {len(nodes):>6} 个节点  {milliseconds:>7.2f} 毫秒')
+    return report
+
+
+if __name__ == '__main__':
+    run_benchmark()
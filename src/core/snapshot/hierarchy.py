@@ -0,0 +1,255 @@
+from array import array
+import hashlib
+import re
+import time
+import xml.etree.ElementTree as ET
+
+from config.app_config import SNAPSHOT_CONFIG
+from utils.logger import Logger
+from core.metrics import get_metrics
+from core.metrics.device import REGISTRY
+from core.recorder import get_recorder
+from core.profiles import get_settings_state
+
+_BOUNDS_PATTERN = re.compile(r'\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]')
+
+# 每次向解析器喂入的字节数
+_CHUNK_SIZE = 64 * 1024
+
+SNAPSHOT_BYTES = REGISTRY.histogram(
+    'xianyu_snapshot_bytes', '每次获取的页面层级大小（字节）', ('device',),
+    buckets=(8e3, 16e3, 32e3, 64e3, 128e3, 256e3, 512e3, 1e6, 2e6)
+)
+SNAPSHOT_PARSE_SECONDS = REGISTRY.histogram(
+    'xianyu_snapshot_parse_seconds', '解析页面层级的耗时', ('device',),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+)
+
+
+def parse_bounds(bounds: str):
+    """解析 bounds 属性，例如 "[0,0][1080,200]"
+
+    Returns:
+        tuple: (left, top, right, bottom)，无法解析时返回 None
+    """
+    match = _BOUNDS_PATTERN.match(bounds or '')
+    if not match:
+        return None
+    return tuple(int(value) for value in match.groups())
+
+
+class CompactNodes:
+    """紧凑存储的页面节点
+
+    每个字段一个数组：类名和 resource-id 通过去重表保存为编号，bounds 保存为 int 数组，
+    不再为每个节点创建字典。
+    """
+
+    __slots__ = ('classes', 'class_ids', 'texts', 'descs', 'resource_ids', 'resource_id_ids', 'bounds', 'depths')
+
+    def __init__(self):
+        self.classes = []  # 类名去重表
+        self.class_ids = array('H')
+        self.texts = []
+        self.descs = []
+        self.resource_ids = []  # resource-id 去重表
+        self.resource_id_ids = array('H')
+        self.bounds = array('i')  # 每个节点 4 个值，无法解析时为 -1
+        self.depths = array('H')
+
+    def __len__(self):
+        return len(self.texts)
+
+    def bounds_of(self, index):
+        left = self.bounds[index * 4]
+        if left == -1 and self.bounds[index * 4 + 2] == -1:
+            return None
+        return tuple(self.bounds[index * 4:index * 4 + 4])
+
+
+_NO_BOUNDS = (-1, -1, -1, -1)
+
+
+def _intern(table, lookup, value):
+    index = lookup.get(value)
+    if index is None:
+        index = lookup[value] = len(table)
+        table.append(value)
+    return index
+
+
+def parse_compact(source: str, scope: str = None) -> CompactNodes:
+    """流式解析页面 XML，只提取需要的属性
+
+    使用 XMLPullParser 分块解析，每个节点处理完后立即清空，不保留整棵树。
+
+    Args:
+        source: 页面 XML
+        scope: 可选，容器的 resource-id，只保留该容器内的节点；页面上没有该容器时保留全部节点
+
+    Returns:
+        CompactNodes: 节点数组
+    """
+    nodes = CompactNodes()
+    class_lookup, resource_lookup = {}, {}
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    depth = 0
+    scope_depth = None  # 进入容器时的深度
+    scope_found = False
+    match_bounds = _BOUNDS_PATTERN.match
+    extend_bounds = nodes.bounds.extend
+
+    for offset in range(0, len(source), _CHUNK_SIZE):
+        parser.feed(source[offset:offset + _CHUNK_SIZE])
+        for event, element in parser.read_events():
+            if event == 'end':
+                depth -= 1
+                if scope_depth is not None and depth == scope_depth:
+                    scope_depth = None
+                element.clear()
+                continue
+
+            depth += 1
+            get = element.get
+            resource_id = get('resource-id') or ''
+            if scope:
+                if scope_depth is None:
+                    if resource_id != scope:
+                        continue
+                    scope_depth = depth - 1
+                    scope_found = True
+
+            nodes.class_ids.append(_intern(nodes.classes, class_lookup, get('class') or element.tag))
+            nodes.texts.append(get('text') or '')
+            nodes.descs.append(get('content-desc') or '')
+            nodes.resource_id_ids.append(_intern(nodes.resource_ids, resource_lookup, resource_id))
+            match = match_bounds(get('bounds') or '')
+            extend_bounds(map(int, match.groups()) if match else _NO_BOUNDS)
+            nodes.depths.append(min(depth, 0xFFFF))
+    parser.close()
+
+    if scope and not scope_found:
+        return parse_compact(source)
+    return nodes
+
+
+def apply_snapshot_settings(driver, settings=None):
+    """让 Appium 返回精简的页面层级（限制深度、去掉不需要的属性）
+
+    这些设置对元素查找没有影响，只在与当前值不同时发送。
+
+    Args:
+        driver: Appium WebDriver 实例
+        settings: 可选，覆盖 SNAPSHOT_CONFIG['settings']
+    """
+    settings = settings if settings is not None else SNAPSHOT_CONFIG['settings']
+    if settings:
+        get_settings_state(driver).apply(settings)
+
+
+class HierarchySnapshot:
+    """页面层级快照
+
+    一次 page_source 请求拿到整个页面的层级结构，之后的文本读取和比对都在本地完成，
+    不再为每个元素单独发起请求。解析使用流式解析器，只把需要的属性保存为紧凑数组，
+    并记录每次快照的字节数和解析耗时。
+    """
+
+    def __init__(self, source: str, scope: str = None):
+        """初始化快照
+
+        Args:
+            source: UiAutomator2 返回的页面 XML
+            scope: 可选，容器的 resource-id，只解析该容器内的节点
+        """
+        self.source = source or ''
+        self.scope = scope
+        # 按 UTF-8 字节数统计，中文标题较多的页面字符数明显小于实际传输的大小
+        self.source_bytes = len(self.source.encode('utf-8'))
+        self.parse_seconds = None
+        self._compact = None
+        self._nodes = None
+        self._fingerprint = None
+
+    @classmethod
+    def capture(cls, driver, scope: str = None):
+        """从设备获取当前页面的快照，同时交给故障记录器保留一份
+
+        Args:
+            driver: Appium WebDriver 实例
+            scope: 可选，容器的 resource-id，只解析该容器内的节点
+        """
+        apply_snapshot_settings(driver)
+        # 忽略不重要视图会改变元素查找的结果，只在获取快照时打开；
+        # 当前页面的设置已经打开时不需要额外请求
+        state = get_settings_state(driver)
+        restore = state.apply(SNAPSHOT_CONFIG['capture_settings'])
+        try:
+            source = driver.page_source
+        finally:
+            if restore:
+                state.apply(restore)
+        get_recorder(driver).record_snapshot(source)
+        snapshot = cls(source, scope)
+        snapshot.compact
+        device_id = get_metrics(driver).device_id
+        SNAPSHOT_BYTES.labels(device_id).observe(snapshot.source_bytes)
+        SNAPSHOT_PARSE_SECONDS.labels(device_id).observe(snapshot.parse_seconds)
+        Logger.debug(
+            f'页面快照 {snapshot.source_bytes / 1024:.1f} KB，{len(snapshot.compact)} 个节点，'
+            f'解析 {snapshot.parse_seconds * 1000:.1f} 毫秒'
+        )
+        return snapshot
+
+    @property
+    def compact(self) -> CompactNodes:
+        """紧凑数组形式的节点"""
+        if self._compact is None:
+            start = time.perf_counter()
+            try:
+                self._compact = parse_compact(self.source, self.scope)
+            except ET.ParseError as e:
+                Logger.debug(f'解析页面层级失败: {str(e)}')
+                self._compact = CompactNodes()
+            self.parse_seconds = time.perf_counter() - start
+        return self._compact
+
+    @property
+    def nodes(self):
+        """页面节点列表，按文档顺序排列
+
+        每个节点是包含 class、text、desc、resource_id、bounds 字段的字典，按需从紧凑数组生成。
+        """
+        if self._nodes is None:
+            compact = self.compact
+            self._nodes = [
+                {
+                    'class': compact.classes[compact.class_ids[index]],
+                    'text': compact.texts[index],
+                    'desc': compact.descs[index],
+                    'resource_id': compact.resource_ids[compact.resource_id_ids[index]],
+                    'bounds': compact.bounds_of(index),
+                }
+                for index in range(len(compact))
+            ]
+        return self._nodes
+
+    def texts(self):
+        """获取页面上所有非空文本（text 优先，其次 content-desc）"""
+        compact = self.compact
+        return [text or desc for text, desc in zip(compact.texts, compact.descs) if text or desc]
+
+    def fingerprint(self) -> str:
+        """计算页面内容指纹
+
+        只使用文本和位置，忽略选中、聚焦等易变属性。两次滑动后指纹不变，
+        说明页面已经到底。
+        """
+        if self._fingerprint is None:
+            compact = self.compact
+            digest = hashlib.md5()
+            for index, (text, desc) in enumerate(zip(compact.texts, compact.descs)):
+                if text or desc:
+                    digest.update(f'{text}|{desc}|{compact.bounds_of(index)}\n'.encode('utf-8'))
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
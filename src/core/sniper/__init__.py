@@ -0,0 +1,4 @@
+from .interval import AdaptiveInterval
+from .listing_age import parse_listing_age
+
+__all__ = ['AdaptiveInterval', 'parse_listing_age']
@@ -0,0 +1,57 @@
+class AdaptiveInterval:
+    """自适应刷新间隔
+
+    根据观察到的新商品到达速率调整刷新间隔：
+    - 新商品多时缩短间隔，尽快发现新上架的商品
+    - 长时间没有新商品时逐步拉长间隔，减少无效刷新
+    - 前 N 个结果全部是新商品时说明刷新太慢，直接降到最短间隔
+    """
+
+    def __init__(self, initial: float, min_interval: float, max_interval: float,
+                 target_per_refresh: float = 1.0, smoothing: float = 0.3):
+        """初始化刷新间隔
+
+        Args:
+            initial: 初始刷新间隔（秒）
+            min_interval: 最短刷新间隔（秒）
+            max_interval: 最长刷新间隔（秒）
+            target_per_refresh: 期望每次刷新看到的新商品数
+            smoothing: 到达速率的指数平滑系数，越大越看重最近一次观察
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_per_refresh = target_per_refresh
+        self.smoothing = smoothing
+        self.interval = self._clamp(initial)
+        self.rate = None  # 新商品到达速率（个/秒）
+
+    def _clamp(self, value: float) -> float:
+        return max(self.min_interval, min(self.max_interval, value))
+
+    def observe(self, new_count: int, elapsed: float, saturated: bool = False) -> float:
+        """记录一次刷新的结果并更新刷新间隔
+
+        Args:
+            new_count: 本次刷新发现的新商品数
+            elapsed: 距上次刷新的时间（秒）
+            saturated: 前 N 个结果是否全部为新商品
+
+        Returns:
+            float: 更新后的刷新间隔（秒）
+        """
+        if elapsed <= 0:
+            return self.interval
+
+        observed_rate = new_count / elapsed
+        if self.rate is None:
+            self.rate = observed_rate
+        else:
+            self.rate = self.smoothing * observed_rate + (1 - self.smoothing) * self.rate
+
+        if saturated:
+            self.interval = self.min_interval
+        elif self.rate > 0:
+            self.interval = self._clamp(self.target_per_refresh / self.rate)
+        else:
+            self.interval = self._clamp(self.interval * 1.5)
+        return self.interval
@@ -0,0 +1,25 @@
+import re
+
+_AGE_PATTERN = re.compile(r'(\d+)\s*(秒|分钟|小时)前')
+_UNIT_SECONDS = {'秒': 1, '分钟': 60, '小时': 3600}
+
+
+def parse_listing_age(text: str):
+    """解析商品卡片上的发布时间文本
+
+    支持 "刚刚"、"30秒前"、"5分钟前"、"2小时前" 等格式。
+
+    Args:
+        text: 发布时间文本
+
+    Returns:
+        float: 距发布的秒数，无法解析时返回 None
+    """
+    if not text:
+        return None
+    if '刚刚' in text:
+        return 0.0
+    match = _AGE_PATTERN.search(text)
+    if not match:
+        return None
+    return float(int(match.group(1)) * _UNIT_SECONDS[match.group(2)])
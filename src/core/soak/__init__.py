@@ -0,0 +1,4 @@
+from .clock import VirtualClock, VirtualTimeEventLoop, run_virtual
+from .monitor import MemoryMonitor, object_counts, rss_bytes
+
+__all__ = ['VirtualClock', 'VirtualTimeEventLoop', 'run_virtual', 'MemoryMonitor', 'object_counts', 'rss_bytes']
@@ -0,0 +1,99 @@
+import asyncio
+import selectors
+import time
+
+_real_monotonic = time.monotonic
+
+
+class VirtualClock:
+    """加速的单调时钟
+
+    虚拟时间 = 真实时间 + 跳过的等待时间。事件循环空闲（所有协程都在等待定时器）时，
+    直接跳到下一个定时器，而不是真的等待，CPU 上的实际耗时仍然照常计入。
+    """
+
+    def __init__(self):
+        self.skipped = 0.0
+        self._installed = False
+
+    def monotonic(self) -> float:
+        return _real_monotonic() + self.skipped
+
+    def advance(self, seconds: float):
+        """跳过一段等待时间"""
+        self.skipped += seconds
+
+    def install(self):
+        """替换 time.monotonic，让限速、节奏、阶段预算等使用虚拟时间
+
+        在调用时读取 time.monotonic 的代码都会使用虚拟时间，需要在创建驱动和任务之前调用。
+        """
+        time.monotonic = self.monotonic
+        self._installed = True
+
+    def uninstall(self):
+        if self._installed:
+            time.monotonic = _real_monotonic
+            self._installed = False
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """没有就绪的 I/O 时不阻塞，把等待时间记到虚拟时钟上"""
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__()
+        self._clock = clock
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if events or (timeout is not None and timeout <= 0):
+            return events
+        if timeout is None:
+            # 没有定时器，只能等待 I/O 或其他线程唤醒
+            return super().select(None)
+        self._clock.advance(timeout)
+        return []
+
+
+class VirtualTimeEventLoop(asyncio.SelectorEventLoop):
+    """使用虚拟时钟的事件循环，asyncio.sleep、wait_for 等的等待都会被跳过
+
+    依赖其他线程或外部 I/O 按真实时间完成的操作在这个事件循环中会提前超时，
+    只适合运行模拟设备和回放驱动。
+    """
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__(_VirtualSelector(clock))
+        self.clock = clock
+
+    def time(self) -> float:
+        return self.clock.monotonic()
+
+
+def run_virtual(main, clock: VirtualClock = None):
+    """在虚拟时间的事件循环中运行协程，与 asyncio.run 类似
+
+    Args:
+        main: 协程
+        clock: 可选，虚拟时钟，默认新建一个并在运行期间替换 time.monotonic
+
+    Returns:
+        协程的返回值
+    """
+    clock = clock or VirtualClock()
+    clock.install()
+    loop = VirtualTimeEventLoop(clock)
+    try:
+        asyncio.set_event_loop(loop)
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+            clock.uninstall()
@@ -0,0 +1,145 @@
+import gc
+import os
+import resource
+import time
+import tracemalloc
+from collections import Counter
+
+# 统计内存分配时忽略的帧，避免把 tracemalloc 和导入系统本身算进去
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def rss_bytes() -> int:
+    """当前进程的常驻内存（字节）
+
+    Linux 上读取 /proc/self/statm，其他系统退回到 getrusage 的峰值常驻内存。
+    """
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+
+def object_counts() -> Counter:
+    """按类型统计存活的对象数"""
+    gc.collect()
+    return Counter(type(obj).__qualname__ for obj in gc.get_objects())
+
+
+class MemorySample:
+    """一次内存采样"""
+
+    def __init__(self, items: int, snapshot: bool = True):
+        self.time = time.monotonic()
+        self.items = items
+        self.objects = object_counts()
+        # 先取快照再读内存：基线的快照会一直保留，之后每次读数时也都有一份刚取的快照，两边可以比较
+        self.snapshot = tracemalloc.take_snapshot().filter_traces(_TRACE_FILTERS) \
+            if snapshot and tracemalloc.is_tracing() else None
+        self.rss = rss_bytes()
+        self.traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+
+class MemoryMonitor:
+    """长时间运行时的内存增长检测
+
+    预热（缓存填满、模块导入完成）之后取一次基线，之后每次采样与基线比较，
+    把常驻内存、tracemalloc 统计的内存和各类型对象数的增长折算为每处理一万个商品的增长量。
+    有界缓存填满后不再增长，持续按处理量增长的才是泄漏。
+    """
+
+    def __init__(self, config: dict):
+        """初始化
+
+        Args:
+            config: 浸泡测试配置，格式同 SOAK_CONFIG
+        """
+        self.config = config
+        self.baseline = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.config['tracemalloc_frames'])
+
+    def stop(self):
+        tracemalloc.stop()
+        self.baseline = None
+
+    def sample(self, items: int) -> dict:
+        """采样一次
+
+        Args:
+            items: 到目前为止处理的商品数
+
+        Returns:
+            dict: 采样结果，预热阶段只包含 items、rss、traced；
+                取得基线后再包含每万个商品的增长量 rss_growth、traced_growth（字节）、
+                增长最多的对象类型 objects 和分配位置 allocators
+        """
+        sample = MemorySample(items, snapshot=self.baseline is not None or items >= self.config['warmup_items'])
+        result = {'items': items, 'rss': sample.rss, 'traced': sample.traced}
+        if self.baseline is None:
+            if items >= self.config['warmup_items']:
+                self.baseline = sample
+                result['baseline'] = True
+            return result
+
+        baseline = self.baseline
+        processed = items - baseline.items
+        result['processed'] = processed
+        if processed < self.config['min_items']:
+            return result
+        per_10k = 10000.0 / processed
+        result['rss_growth'] = (sample.rss - baseline.rss) * per_10k
+        result['traced_growth'] = (sample.traced - baseline.traced) * per_10k
+
+        top = self.config['top']
+        growth = Counter({
+            name: (count - baseline.objects.get(name, 0)) * per_10k
+            for name, count in sample.objects.items()
+        })
+        result['objects'] = [(name, value) for name, value in growth.most_common(top) if value >= 1]
+        if sample.snapshot is not None and baseline.snapshot is not None:
+            key = 'traceback' if self.config['tracemalloc_frames'] > 1 else 'lineno'
+            statistics = sample.snapshot.compare_to(baseline.snapshot, key)
+            # 分配位置在前，调用方在后
+            result['allocators'] = [
+                (' <- '.join(str(frame) for frame in reversed(stat.traceback)), stat.size_diff * per_10k)
+                for stat in statistics[:top] if stat.size_diff > 0
+            ]
+        # 基线的快照保留，最新的快照比较完就可以释放
+        sample.snapshot = None
+        return result
+
+    def violations(self, result: dict) -> list:
+        """超过阈值的增长
+
+        Args:
+            result: sample 的返回值
+
+        Returns:
+            list: 问题描述，没有问题时为空列表
+        """
+        problems = []
+        megabytes = 1024 * 1024
+        if result.get('rss_growth', 0) > self.config['rss_threshold_mb'] * megabytes:
+            problems.append(
+                f"常驻内存每万个商品增长 {result['rss_growth'] / megabytes:.1f} MB，"
+                f"超过阈值 {self.config['rss_threshold_mb']} MB"
+            )
+        if result.get('traced_growth', 0) > self.config['traced_threshold_mb'] * megabytes:
+            problems.append(
+                f"Python 分配的内存每万个商品增长 {result['traced_growth'] / megabytes:.1f} MB，"
+                f"超过阈值 {self.config['traced_threshold_mb']} MB"
+            )
+        for name, value in result.get('objects', ()):
+            if value > self.config['object_threshold']:
+                problems.append(f'{name} 对象每万个商品增加 {value:.0f} 个，超过阈值 {self.config["object_threshold"]}')
+        return problems
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""浸泡测试
+
+在虚拟时间的事件循环中让模拟设备（或回放驱动）长时间运行完整的任务栈，
+定期采样常驻内存、各类型对象数和 tracemalloc 的分配位置，
+按处理的商品数折算增长量，超过 SOAK_CONFIG 中的阈值时退出状态为 1，
+处理的商品太少、无法计算增长时为 2。
+
+在 src 目录下运行：python -m core.soak.runner --hours 12 --devices 4
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 将 src 目录添加到 Python 路径
+src_path = str(Path(__file__).parents[2].absolute())
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from config.app_config import SOAK_CONFIG
+from core.soak.clock import run_virtual
+from core.soak.monitor import MemoryMonitor
+
+_MB = 1024 * 1024
+
+
+def _report(result: dict, elapsed: float, real: float, console):
+    """输出一次采样结果"""
+    line = (f"[{elapsed / 3600:5.1f}h 实际 {real:5.0f}s] 商品 {result['items']}，"
+            f"常驻内存 {result['rss'] / _MB:.1f} MB，Python 分配 {result['traced'] / _MB:.1f} MB")
+    if result.get('baseline'):
+        line += '，取为基线'
+    elif 'rss_growth' in result:
+        line += (f"，每万个商品增长：常驻 {result['rss_growth'] / _MB:+.2f} MB，"
+                 f"分配 {result['traced_growth'] / _MB:+.2f} MB")
+    print(line, file=console, flush=True)
+
+
+def _report_details(result: dict, console):
+    """输出增长最多的对象类型和分配位置"""
+    if result.get('objects'):
+        print('  增长最多的对象类型（每万个商品）：', file=console)
+        for name, value in result['objects']:
+            print(f'    {value:10.0f}  {name}', file=console)
+    if result.get('allocators'):
+        print('  增长最多的分配位置（每万个商品）：', file=console)
+        for location, size in result['allocators']:
+            print(f'    {size / 1024:8.1f} KB  {location}', file=console)
+    console.flush()
+
+
+async def run_soak(config: dict = None, task_id: str = 'browse_items', replay: str = None,
+                   seed: int = None, output=None) -> dict:
+    """运行浸泡测试，需要在 run_virtual 启动的事件循环中运行
+
+    Args:
+        config: 可选，覆盖 SOAK_CONFIG 中的配置
+        task_id: 每台设备运行的任务ID
+        replay: 可选，录制文件或目录，使用回放驱动代替应用模拟器
+        seed: 可选，随机种子，第 i 台设备使用 seed + i
+        output: 可选，设备日志的输出文件，默认丢弃
+
+    Returns:
+        dict: 最后一次采样结果，violations 为超过阈值的增长；
+            处理的商品不足以计算增长时 insufficient 为 True
+    """
+    from core.dedup import create_deduper
+    from core.drivers import ReplayDriver
+    from core.simulator.load import CountingSink, running_devices
+
+    config = dict(SOAK_CONFIG, **(config or {}))
+    console = sys.stdout
+    monitor = MemoryMonitor(config)
+    driver_factory = (lambda index: ReplayDriver.from_path(replay)) if replay else None
+    duration = config['hours'] * 3600
+    interval = config['sample_minutes'] * 60
+    result = {}
+
+    print(f"浸泡测试：{config['devices']} 台设备运行 {task_id}，虚拟时长 {config['hours']} 小时，"
+          f"每 {config['sample_minutes']} 分钟采样", file=console, flush=True)
+    monitor.start()
+    try:
+        # 模拟设备不实际阻塞命令耗时，设备的等待全部由虚拟时钟跳过
+        async with running_devices(config['devices'], {'latency_scale': 0.0}, seed, CountingSink(),
+                                   create_deduper(), output, driver_factory) as devices:
+            # 指标是进程内全局的，只统计本次运行的增量
+            scanned = sum(device.metrics.items_scanned.value for device in devices)
+            start, real_start = time.monotonic(), time.perf_counter()
+            for device in devices:
+                device.start(task_id)
+
+            while time.monotonic() - start < duration:
+                await asyncio.sleep(min(interval, duration - (time.monotonic() - start)))
+                items = int(sum(device.metrics.items_scanned.value for device in devices) - scanned)
+                result = monitor.sample(items)
+                _report(result, time.monotonic() - start, time.perf_counter() - real_start, console)
+                if all(device.runner.done() for device in devices):
+                    print('所有设备的任务都已结束，提前停止', file=console, flush=True)
+                    break
+    finally:
+        monitor.stop()
+
+    result['violations'] = monitor.violations(result)
+    result['insufficient'] = 'rss_growth' not in result
+    if result['insufficient']:
+        print(f"处理的商品不足（{result.get('items', 0)}），无法计算增长，"
+              f"需要至少 {config['warmup_items'] + config['min_items']} 个，可以增加 --hours 或 --devices",
+              file=console, flush=True)
+        return result
+
+    _report_details(result, console)
+    if result['violations']:
+        print('发现内存增长：', file=console)
+        for problem in result['violations']:
+            print(f'  {problem}', file=console)
+    else:
+        print('没有发现超过阈值的内存增长', file=console)
+    console.flush()
+    return result
+
+
+def run_from_args(args) -> int:
+    """按 python src/cli.py soak 的命令行参数运行浸泡测试
+
+    Returns:
+        int: 退出状态，发现内存增长时为 1，处理的商品不足、无法判断时为 2
+    """
+    config = {}
+    for key in ('hours', 'devices', 'sample_minutes', 'warmup_items', 'min_items', 'rss_threshold_mb',
+                'traced_threshold_mb', 'object_threshold'):
+        if getattr(args, key) is not None:
+            config[key] = getattr(args, key)
+    result = run_virtual(run_soak(config, args.task, args.replay, args.seed, args.log))
+    if result['violations']:
+        return 1
+    return 2 if result['insufficient'] else 0
+
+
+if __name__ == '__main__':
+    # 命令行参数与 python src/cli.py soak 相同
+    from cli import main
+    sys.exit(main(['soak', *sys.argv[1:]]))
@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
 import random
-import asyncio
 from utils.logger import Logger
+from core.pacing import get_pacer
+from core.metrics import get_metrics
+from core.checkpoint import open_checkpoint
+from config.app_config import CHECKPOINT_CONFIG
 
 class BaseTask(ABC):
     """任务基类
@@ -12,18 +15,30 @@ class BaseTask(ABC):
     - 任务的运行状态控制
     - 任务的运行和停止
     - 通用的人工行为模拟
+    - 任务进度的检查点
     """
     
-    def __init__(self, driver, page_factory):
+    # 检查点中列表字段最多保留的条数，子类按需覆盖
+    CHECKPOINT_LIMITS = {}
+    
+    def __init__(self, driver, page_factory, sink=None, dedup=None, seen=None):
         """初始化任务
         
         Args:
             driver: Appium WebDriver 实例
             page_factory: 页面工厂实例
+            sink: 可选，ResultSink 实例，用于保存浏览到的商品
+            dedup: 可选，ListingDeduper 实例，用于跳过重复发布的商品
+            seen: 可选，SeenClient 实例，多个进程共享已处理的商品
         """
         self.driver = driver
         self.page_factory = page_factory
+        self.sink = sink
+        self.dedup = dedup
+        self.seen = seen
+        self.metrics = get_metrics(driver)
         self.running = True
+        self._checkpoint = open_checkpoint(f'{self.metrics.device_id}-{type(self).__name__}', self.CHECKPOINT_LIMITS)
     
     @property
     @abstractmethod
@@ -53,23 +68,92 @@ class BaseTask(ABC):
         self.running = False
         Logger.info(f'停止任务: {self.name}')
     
+    def checkpoint_state(self) -> dict:
+        """任务进度，子类覆盖
+        
+        Returns:
+            dict: 可以 JSON 序列化的完整进度
+        """
+        return {}
+    
+    def restore_checkpoint(self, state: dict):
+        """从检查点恢复任务进度，子类覆盖
+        
+        Args:
+            state: checkpoint_state 返回的字典，加上之后的增量修改
+        """
+        pass
+    
+    def resume(self) -> bool:
+        """任务启动时从检查点恢复进度
+        
+        Returns:
+            bool: 是否恢复了进度
+        """
+        if self._checkpoint is None:
+            return False
+        try:
+            state = self._checkpoint.load(CHECKPOINT_CONFIG['max_age'])
+            if not state:
+                return False
+            self.restore_checkpoint(state)
+        except Exception as e:
+            Logger.error('恢复检查点失败，从头开始', e)
+            self._checkpoint.clear()
+            return False
+        Logger.info(f'已从检查点恢复进度: {self.name}')
+        return True
+    
+    def checkpoint(self, fields=None, extend=None):
+        """记录一次进度变化
+        
+        只追加一行增量日志，到时间后才合并为完整快照，可以在每个商品处理完后调用。
+        
+        Args:
+            fields: 可选，直接覆盖的字段
+            extend: 可选，列表字段 -> 追加的值列表
+        """
+        if self._checkpoint is None:
+            return
+        try:
+            self._checkpoint.record(fields, extend)
+            if self._checkpoint.due():
+                self._checkpoint.save(self.checkpoint_state())
+        except OSError as e:
+            Logger.warn(f'写入检查点失败: {e}')
+    
+    def save_checkpoint(self):
+        """立即写入完整快照，任务结束时调用"""
+        if self._checkpoint is None:
+            return
+        try:
+            self._checkpoint.save(self.checkpoint_state())
+            self._checkpoint.close()
+        except OSError as e:
+            Logger.warn(f'写入检查点失败: {e}')
+    
+    def emit(self, kind, record):
+        """输出一条商品记录，没有配置输出时忽略
+        
+        Args:
+            kind: 记录类型，例如 card、detail
+            record: 记录字典
+        """
+        if self.sink:
+            self.sink.put(kind, record)
+    
     async def simulate_scroll(self, page, scroll_config=None):
         """模拟人工滑动行为
         
         使用页面的基础滑动功能来模拟人工浏览行为，包括：
         - 随机的滑动次数
         - 随机的滑动方向
-        - 随机的等待时间
+        - 按浏览节奏（PacingEngine）采样的停留时间
         
         Args:
             page: 页面对象，必须继承自BasePage
             scroll_config: 滑动配置，可选，包含以下字段：
-                - min_times: 最少滑动次数，默认2
-                - max_times: 最多滑动次数，默认4
                 - up_probability: 向上滑动的概率，默认0.7
-                - initial_wait: (min, max) 初始等待时间范围，默认(2, 4)
-                - scroll_wait: (min, max) 每次滑动后等待时间范围，默认(1, 3)
-                - final_wait: (min, max) 最终等待时间范围，默认(2, 4)
         
         Returns:
             bool: 是否成功完成所有滑动
@@ -77,27 +161,22 @@ class BaseTask(ABC):
         try:
             # 默认配置
             config = {
-                'min_times': 2,
-                'max_times': 4,
                 'up_probability': 0.7,
-                'initial_wait': (2, 4),
-                'scroll_wait': (1, 3),
-                'final_wait': (2, 4)
             }
             
             # 更新配置
             if scroll_config:
                 config.update(scroll_config)
             
+            pacer = get_pacer(self.driver)
             Logger.info('开始模拟浏览行为...')
             
             # 初始等待，假装在看页面内容
-            initial_wait = random.uniform(*config['initial_wait'])
-            Logger.debug(f'初始停留 {initial_wait:.1f} 秒...')
-            await asyncio.sleep(initial_wait)
+            initial_wait = await pacer.pause('initial')
+            Logger.debug(f'初始停留 {initial_wait:.1f} 秒')
             
             # 随机决定滑动次数
-            scroll_times = random.randint(config['min_times'], config['max_times'])
+            scroll_times = pacer.scroll_count()
             Logger.debug(f'计划滑动 {scroll_times} 次')
             
             # 执行滑动
@@ -118,14 +197,12 @@ class BaseTask(ABC):
                     return False
                 
                 # 滑动后等待，模拟看内容
-                wait_time = random.uniform(*config['scroll_wait'])
-                Logger.debug(f'停留 {wait_time:.1f} 秒...')
-                await asyncio.sleep(wait_time)
+                wait_time = await pacer.pause('scroll')
+                Logger.debug(f'停留 {wait_time:.1f} 秒')
             
             # 最后停留一会，表示对内容感兴趣
-            final_wait = random.uniform(*config['final_wait'])
-            Logger.debug(f'最后停留 {final_wait:.1f} 秒...')
-            await asyncio.sleep(final_wait)
+            final_wait = await pacer.pause('final')
+            Logger.debug(f'最后停留 {final_wait:.1f} 秒')
             
             Logger.info('完成模拟浏览')
             return True
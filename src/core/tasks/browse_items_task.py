@@ -1,13 +1,27 @@
 import asyncio
-import random
+from collections import OrderedDict
 from utils.logger import Logger
+from config.app_config import CHECKPOINT_CONFIG
 from .base_task import BaseTask
 from core.pages.home_page import HomePage
 from core.pages.detail_page import DetailPage
+from core.extract import ListingRecord
+from core.seen import item_key
+from core.throttle import get_limiter
+from core.pacing import get_pacer
+from core.tracing import span, sleep
+from core.deadline import budget
 
 class BrowseItemsTask(BaseTask):
     """浏览商品任务（养号）"""
     
+    CHECKPOINT_LIMITS = {'recent': CHECKPOINT_CONFIG['recent_items']}
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.progress = {'scanned': 0, 'viewed': 0, 'skipped': 0}
+        self._recent = OrderedDict()  # 最近处理过的商品标识，重启后不再重复浏览
+    
     @property
     def name(self) -> str:
         return "浏览商品"
@@ -16,50 +30,54 @@ class BrowseItemsTask(BaseTask):
     def description(self) -> str:
         return "自动浏览商品详情页，模拟正常用户行为"
     
+    def _remember(self, key):
+        """记住处理过的商品，超过上限时淘汰最早的"""
+        self._recent[key] = None
+        if len(self._recent) > self.CHECKPOINT_LIMITS['recent']:
+            self._recent.popitem(last=False)
+    
+    def checkpoint_state(self) -> dict:
+        return {
+            'progress': dict(self.progress),
+            'recent': list(self._recent),
+            'pacing': get_pacer(self.driver).state(),
+        }
+    
+    def restore_checkpoint(self, state: dict):
+        self.progress.update(state.get('progress') or {})
+        for key in state.get('recent') or ():
+            self._remember(key)
+        if state.get('pacing'):
+            get_pacer(self.driver).restore(state['pacing'])
+        Logger.info(
+            f"已浏览 {self.progress['viewed']} 个详情，跳过最近处理过的 {len(self._recent)} 个商品"
+        )
+    
     async def ensure_home_page(self):
         """确保在首页
-        
-        如果在详情页则返回，如果在其他页面则等待进入首页
+
+        通过页面导航器规划最低代价的路线回到首页，路线走不通时激活或重启应用。
         
         Returns:
             bool: 是否成功进入首页
         """
         try:
-            # 首先检查当前页面
-            current_page = await self.page_factory.get_current_page()
-            
-            # 如果在详情页，返回上一页
-            if isinstance(current_page, DetailPage):
-                Logger.info('当前在详情页，返回首页...')
-                self.driver.back()
-                await asyncio.sleep(2)
-            
-            # 等待进入首页
-            for _ in range(3):  # 最多尝试3次
-                if await self.page_factory.wait_for_page(HomePage, timeout=5):
-                    return True
-                await asyncio.sleep(2)
-            
-            return False
-            
+            return await self.page_factory.navigator.navigate_to(HomePage)
         except Exception as e:
             Logger.error('确保首页时出错', e)
             return False
 
-    async def browse_detail_page(self, detail_page):
+    async def browse_detail_page(self, detail_page, canonical_id=None):
         """浏览详情页
         
         Args:
             detail_page: DetailPage实例
+            canonical_id: 可选，列表卡片归并到的规范商品标识
         """
         try:
             Logger.info('===== 开始浏览详情页 =====')
             Logger.info(f'传入的页面类型: {type(detail_page).__name__}')
             
-            # 先等待页面加载
-            Logger.info('等待详情页加载...')
-            await asyncio.sleep(2)
-            
             # 检查是否真的在详情页
             current_page = await self.page_factory.get_current_page()
             Logger.info(f'当前页面类型: {type(current_page).__name__}')
@@ -67,41 +85,25 @@ class BrowseItemsTask(BaseTask):
             if not isinstance(current_page, DetailPage):
                 Logger.error('当前不在详情页，跳过浏览')
                 return
+            self.metrics.detail_visits.inc()
             
-            # 执行3-5次滑动
-            scroll_times = random.randint(3, 5)
-            Logger.info(f'计划滑动 {scroll_times} 次')
-            
-            for i in range(scroll_times):
-                try:
-                    # 滑动页面
-                    Logger.info(f'[{i+1}/{scroll_times}] 准备执行滑动...')
-                    
-                    # 获取滑动前的页面状态
-                    try:
-                        window_size = detail_page.driver.get_window_size()
-                        Logger.debug(f'当前窗口尺寸: {window_size}')
-                    except Exception as e:
-                        Logger.error('获取窗口尺寸失败', e)
-                    
-                    # 执行滑动
-                    await detail_page.scroll_page()
-                    Logger.success(f'[{i+1}/{scroll_times}] 滑动操作执行完成')
-                    
-                    # 随机等待1-3秒
-                    wait_time = random.uniform(1, 3)
-                    Logger.debug(f'等待 {wait_time:.1f} 秒...')
-                    await asyncio.sleep(wait_time)
-                    
-                except Exception as scroll_error:
-                    Logger.error(f'第 {i+1} 次滑动失败: {str(scroll_error)}')
-                    Logger.error(f'错误类型: {type(scroll_error).__name__}')
-                    continue  # 继续下一次滑动
+            # 滑到底后提前结束，浏览的同时提取商品信息
+            if not await detail_page.browse_page():
+                Logger.warn('详情页浏览异常')
             
-            # 最后停留2-4秒
-            final_wait = random.uniform(2, 4)
-            Logger.info(f'浏览完成，最后停留 {final_wait:.1f} 秒')
-            await asyncio.sleep(final_wait)
+            if detail_page.captured_fields:
+                record = ListingRecord.from_fields(detail_page.captured_fields)
+                data = record.to_dict()
+                if self.dedup:
+                    duplicate = self.dedup.check_detail(record)
+                    data['canonical_id'] = canonical_id or duplicate.canonical_id
+                    if duplicate:
+                        Logger.info(f'详情与已见商品重复 (规范商品: {duplicate.canonical_id})')
+                self.emit('detail', data)
+                Logger.info(
+                    f"商品信息: {record.title} | 价格: {record.price} | "
+                    f"卖家: {record.seller or '-'} | 想要: {record.want_count}"
+                )
             Logger.info('===== 详情页浏览结束 =====')
             
         except Exception as e:
@@ -113,85 +115,152 @@ class BrowseItemsTask(BaseTask):
         """运行任务"""
         try:
             Logger.info(f'=== 开始任务: {self.name} ===')
+            self.resume()
             
             while self.running:
-                try:
-                    # 确保在首页
-                    if not await self.ensure_home_page():
-                        Logger.warn('未能进入首页，重试中...')
-                        await asyncio.sleep(2)
-                        continue
+                with span('loop'):
+                    try:
+                        # 确保在首页
+                        with span('ensure_home_page'), budget('ensure_home_page'):
+                            at_home = await self.ensure_home_page()
+                        if not at_home:
+                            Logger.warn('未能进入首页，重试中...')
+                            await asyncio.sleep(2)
+                            continue
                     
-                    home_page = await self.page_factory.get_current_page()
-                    if not isinstance(home_page, HomePage):
-                        continue
+                        home_page = await self.page_factory.get_current_page()
+                        if not isinstance(home_page, HomePage):
+                            continue
                     
-                    # 获取商品列表容器
-                    container = await home_page.get_item_container()
-                    if not container:
-                        Logger.warn('未找到商品列表容器，等待重试...')
-                        await asyncio.sleep(2)
-                        continue
+                        # 获取商品列表容器
+                        with span('get_item_container'), budget('get_item_container'):
+                            container = await home_page.get_item_container()
+                        if not container:
+                            Logger.warn('未找到商品列表容器，等待重试...')
+                            await asyncio.sleep(2)
+                            continue
                     
-                    # 获取并处理商品列表
-                    items = await home_page.get_items(container)
-                    if not items:
-                        Logger.info('当前页面没有商品，准备滚动...')
-                        await home_page.scroll_page()
-                        await asyncio.sleep(2)  # 等待页面加载
-                        continue
+                        # 获取并处理商品列表
+                        with span('get_items'), budget('get_items'):
+                            items = await home_page.get_items(container)
+                        if not items:
+                            Logger.info('当前页面没有商品，准备滚动...')
+                            with span('scroll_page'), budget('scroll_page'):
+                                await home_page.scroll_page()
+                            await sleep(2, 'wait_load')  # 等待页面加载
+                            continue
                     
-                    # 处理商品列表
-                    for item in items:
-                        if not self.running:
-                            break
+                        # 处理商品列表
+                        for item in items:
+                            if not self.running:
+                                break
                             
-                        try:
-                            # 获取商品标题
-                            title = await home_page.get_item_title(item)
-                            if not title:
-                                continue
+                            viewed = False
+                            handled_key = None
+                            try:
+                                with budget('item'):
+                                    try:
+                                        # 获取商品标题
+                                        with span('get_item_title'), budget('get_item_title'):
+                                            title = await home_page.get_item_title(item)
+                                        if not title:
+                                            continue
+                                        self.metrics.items_scanned.inc()
+                                        key = item_key(title)
+                                        
+                                        # 重启前已经处理过的商品直接跳过
+                                        if key in self._recent:
+                                            Logger.debug(f'商品在检查点中已处理过，跳过: {title}')
+                                            continue
+                                        handled_key = key
+                                        self.progress['scanned'] += 1
                                 
-                            Logger.info(f'浏览商品: {title}')
+                                        # 其他进程（设备）已经浏览过的商品直接跳过
+                                        if self.seen and not await self.seen.add(key):
+                                            Logger.debug(f'商品已被浏览过，跳过: {title}')
+                                            self.progress['skipped'] += 1
+                                            continue
                             
-                            # 点击商品
-                            try:
-                                if not item.is_displayed():
-                                    continue
-                                item.click()
-                                await asyncio.sleep(2)
-                            except Exception as e:
-                                Logger.warn(f'点击商品失败: {str(e)}')
-                                continue
+                                        # 点击前识别重复发布，重复的商品不再进入详情页
+                                        duplicate = self.dedup.check_card(title) if self.dedup else None
+                                        card = {'item_id': key, 'title': title}
+                                        if duplicate is not None:
+                                            card['canonical_id'] = duplicate.canonical_id
+                                        self.emit('card', card)
+                                        if duplicate:
+                                            Logger.info(f'跳过重复发布的商品: {title} (规范商品: {duplicate.canonical_id})')
+                                            self.progress['skipped'] += 1
+                                            continue
                             
-                            # 等待进入详情页
-                            if await self.page_factory.wait_for_page(DetailPage, timeout=5):
-                                detail_page = await self.page_factory.get_current_page()
-                                if isinstance(detail_page, DetailPage):
-                                    # 浏览详情页
-                                    await self.browse_detail_page(detail_page)
-                                # 返回首页
-                                self.driver.back()
-                                await asyncio.sleep(2)
-                                # 确保返回到首页
-                                if not await self.ensure_home_page():
-                                    break
+                                        Logger.info(f'浏览商品: {title}')
                             
-                        except Exception as e:
-                            Logger.error('处理商品时出错', e)
-                            continue
+                                        # 点击商品
+                                        try:
+                                            with span('tap'), budget('tap'):
+                                                if not item.is_displayed():
+                                                    continue
+                                                # 点击后由页面观察器确认进入详情页，不再固定等待
+                                                async with get_limiter(self.driver).action('detail_open'):
+                                                    item.click()
+                                                self.page_factory.notify_action()
+                                        except Exception as e:
+                                            Logger.warn(f'点击商品失败: {str(e)}')
+                                            handled_key = None  # 没有点开，下次还可以再试
+                                            continue
+                            
+                                        # 等待进入详情页
+                                        with span('wait_for_page'), budget('wait_for_page'):
+                                            entered = await self.page_factory.wait_for_page(DetailPage, timeout=5)
+                                        if entered:
+                                            detail_page = await self.page_factory.get_current_page()
+                                            if isinstance(detail_page, DetailPage):
+                                                # 浏览详情页
+                                                with span('browse_detail_page'), budget('browse_detail_page'):
+                                                    await self.browse_detail_page(
+                                                        detail_page,
+                                                        duplicate.canonical_id if duplicate is not None else None
+                                                    )
+                                                viewed = True
+                                                self.progress['viewed'] += 1
+                                            # 返回首页
+                                            with span('back'), budget('back'):
+                                                at_home = await self.ensure_home_page()
+                                            if not at_home:
+                                                break
+                            
+                                    except Exception as e:
+                                        Logger.error('处理商品时出错', e)
+                                        continue
+                            finally:
+                                if handled_key:
+                                    # 每个商品只追加一行增量日志，在会话休息之前写入
+                                    self._remember(handled_key)
+                                    self.checkpoint(
+                                        {'progress': dict(self.progress), 'pacing': get_pacer(self.driver).state()},
+                                        {'recent': [handled_key]}
+                                    )
+                                # 会话间的休息不计入单个商品的预算
+                                if viewed:
+                                    # 记录浏览量，一轮会话结束时休息
+                                    await get_pacer(self.driver).view_done()
                     
-                    # 滚动页面并等待加载
-                    await home_page.scroll_page()
-                    await asyncio.sleep(2)  # 等待页面加载
+                        # 滚动后这些元素都会失效，不在等待期间持有
+                        # （回放和模拟驱动的元素会让整个页面层级留在内存中）
+                        container = items = item = None
+                        
+                        # 滚动页面并等待加载
+                        with span('scroll_page'), budget('scroll_page'):
+                            await home_page.scroll_page()
+                        await sleep(2, 'wait_load')  # 等待页面加载
                     
-                except Exception as e:
-                    Logger.error('任务执行出错', e)
-                    await asyncio.sleep(2)  # 出错后等待一段时间再重试
+                    except Exception as e:
+                        Logger.error('任务执行出错', e)
+                        await asyncio.sleep(2)  # 出错后等待一段时间再重试
                 
         except asyncio.CancelledError:
             Logger.info(f'任务被取消: {self.name}')
         except Exception as error:
             Logger.error(f'任务执行出错: {self.name}', error)
         finally:
+            self.save_checkpoint()
             Logger.info(f'=== 结束任务: {self.name} ===') 
\ No newline at end of file
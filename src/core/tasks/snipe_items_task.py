@@ -0,0 +1,309 @@
+import asyncio
+import time
+from collections import deque
+
+from utils.logger import Logger
+from config.app_config import SEARCH_CONFIG, SNIPER_CONFIG, CHECKPOINT_CONFIG
+from .base_task import BaseTask
+from core.pages.search_page import SearchPage
+from core.seen import SeenItemStore, item_key
+from core.deadline import budget
+from core.sniper import AdaptiveInterval, parse_listing_age
+
+class SnipeItemsTask(BaseTask):
+    """新品捡漏任务
+
+    按关键词打开"最新发布"排序的搜索结果，定时刷新并比对前 N 个商品，
+    发现新上架的商品后立即触发回调。刷新间隔根据新商品到达速率自动调整，
+    并记录从商品发布到被发现的耗时（发现延迟）。
+    """
+
+    CHECKPOINT_LIMITS = {'seen': CHECKPOINT_CONFIG['seen_items']}
+
+    def __init__(self, driver, page_factory, title_matcher=None, on_item_found=None,
+                 keywords=None, config=None, sink=None, rules=None, dedup=None, seen=None):
+        """初始化捡漏任务
+
+        Args:
+            driver: Appium WebDriver 实例
+            page_factory: 页面工厂实例
+            title_matcher: 可选，标题匹配函数，返回 True 时才触发回调
+            on_item_found: 可选，发现新商品时的回调函数 (item, title)
+            keywords: 可选，监控的关键词列表
+            config: 可选，覆盖 SNIPER_CONFIG 中的配置
+            sink: 可选，ResultSink 实例，用于保存发现的新商品
+            rules: 可选，RuleSet 实例，配置后按规则批量筛选新商品，代替 title_matcher
+            dedup: 可选，ListingDeduper 实例，重复发布的旧商品不再触发回调
+            seen: 可选，SeenClient 实例，多个进程监控同一关键词时只有一个进程触发回调
+        """
+        super().__init__(driver, page_factory, sink, dedup, seen)
+        self.config = dict(SNIPER_CONFIG)
+        if config:
+            self.config.update(config)
+
+        self.keywords = keywords or self.config['keywords'] or SEARCH_CONFIG['keywords']
+        self.title_matcher = title_matcher
+        self.on_item_found = on_item_found
+        self.rules = rules
+        # 本进程已见过的商品，作为判断新商品的基线；self.seen 是可选的跨进程 SeenClient
+        self.recent = SeenItemStore(self.config['seen_capacity'])
+
+        now = time.monotonic()
+        self._intervals = {
+            keyword: AdaptiveInterval(
+                self.config['initial_interval'],
+                self.config['min_interval'],
+                self.config['max_interval'],
+                self.config['target_per_refresh']
+            ) for keyword in self.keywords
+        }
+        self._due = {keyword: now for keyword in self.keywords}
+        self._last_refresh = {}
+        self._open_keyword = None
+
+        # 发现延迟（秒），保留最近的样本用于统计
+        self.detect_latencies = deque(maxlen=1000)
+        self.matches = 0
+
+    @property
+    def name(self) -> str:
+        return "新品捡漏"
+
+    @property
+    def description(self) -> str:
+        return "按关键词监控最新发布的商品，新商品上架后尽快触发回调"
+
+    def stats(self):
+        """获取发现延迟统计
+
+        Returns:
+            dict: 包含样本数、平均值、中位数和 p95 的统计信息（秒）
+        """
+        samples = sorted(self.detect_latencies)
+        if not samples:
+            return {'count': 0, 'mean': None, 'p50': None, 'p95': None}
+        return {
+            'count': len(samples),
+            'mean': sum(samples) / len(samples),
+            'p50': samples[len(samples) // 2],
+            'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        }
+
+    def _keyword_state(self):
+        """各关键词的刷新间隔和到期时间，单调时钟换算为时间戳以便跨进程恢复"""
+        now, wall = time.monotonic(), time.time()
+        state = {}
+        for keyword in self.keywords:
+            interval = self._intervals[keyword]
+            last_refresh = self._last_refresh.get(keyword)
+            state[keyword] = {
+                'interval': interval.interval,
+                'rate': interval.rate,
+                'due_at': wall + self._due[keyword] - now,
+                'last_refresh_at': wall + last_refresh - now if last_refresh is not None else None,
+            }
+        return state
+
+    def checkpoint_state(self) -> dict:
+        return {
+            'matches': self.matches,
+            'latencies': list(self.detect_latencies)[-100:],
+            'keywords': self._keyword_state(),
+            'seen': [[key, seen_at] for key, seen_at in self.recent.items()[-self.CHECKPOINT_LIMITS['seen']:]],
+        }
+
+    def restore_checkpoint(self, state: dict):
+        self.matches = state.get('matches', 0)
+        self.detect_latencies.extend(state.get('latencies') or ())
+        for key, seen_at in state.get('seen') or ():
+            self.recent.add(key, seen_at)
+        now, wall = time.monotonic(), time.time()
+        for keyword, saved in (state.get('keywords') or {}).items():
+            if keyword not in self._intervals:
+                continue
+            self._intervals[keyword].interval = saved['interval']
+            self._intervals[keyword].rate = saved['rate']
+            self._due[keyword] = now + max(0.0, saved['due_at'] - wall)
+            # 恢复基线后，停机期间上架的商品会作为新商品触发
+            if saved['last_refresh_at'] is not None:
+                self._last_refresh[keyword] = now - (wall - saved['last_refresh_at'])
+        Logger.info(f'已恢复 {len(self.recent)} 个已见商品和 {len(self._last_refresh)} 个关键词的刷新进度')
+
+    def _next_keyword(self):
+        """选出最早到期需要刷新的关键词"""
+        return min(self.keywords, key=lambda keyword: self._due[keyword])
+
+    async def _open_results(self, keyword):
+        """打开指定关键词的最新发布结果列表"""
+        if not await self.page_factory.navigator.navigate_to(SearchPage):
+            return False
+
+        search_page = self.page_factory._get_page_instance(SearchPage)
+        if not await search_page.search(keyword):
+            return False
+        if not await self.page_factory.wait_for_page(SearchPage, timeout=5):
+            return False
+        await search_page.sort_by_newest()
+        self._open_keyword = keyword
+        return True
+
+    async def _refresh(self, keyword):
+        """刷新指定关键词的结果列表
+
+        当前打开的就是该关键词时按配置下拉刷新，否则重新搜索。
+        """
+        if self._open_keyword == keyword and self.config['refresh_mode'] == 'pull':
+            search_page = self.page_factory._get_page_instance(SearchPage)
+            if await search_page.pull_to_refresh():
+                await asyncio.sleep(1)
+                return True
+        return await self._open_results(keyword)
+
+    async def _scan(self, keyword):
+        """比对结果列表前 N 个商品并触发回调"""
+        search_page = self.page_factory._get_page_instance(SearchPage)
+        with budget('scan_results'):
+            cards = await search_page.get_top_cards(self.config['top_n'])
+        self.metrics.items_scanned.inc(len(cards))
+        now = time.monotonic()
+        last_refresh = self._last_refresh.get(keyword)
+        first_scan = last_refresh is None
+
+        new_cards = []
+        new_keys = []
+        for card in cards:
+            key = item_key(card['title'], card['price'])
+            if self.recent.add(key):
+                new_keys.append([key, self.recent.first_seen(key)])
+                record = {
+                    'item_id': key,
+                    'title': card['title'],
+                    'price': card['price'],
+                    'age_text': card['age_text'],
+                    'keyword': keyword,
+                }
+                duplicate = self.dedup.check_card(card['title']) if self.dedup else None
+                if duplicate is not None:
+                    record['canonical_id'] = duplicate.canonical_id
+                self.emit('card', record)
+                if duplicate:
+                    Logger.debug(f"[{keyword}] 重复发布的商品: {card['title']} (规范商品: {duplicate.canonical_id})")
+                    continue
+                new_cards.append(card)
+
+        if not first_scan:
+            interval = self._intervals[keyword].observe(
+                len(new_cards),
+                now - last_refresh,
+                saturated=bool(cards) and len(new_cards) == len(cards)
+            )
+            Logger.debug(f'[{keyword}] 新商品 {len(new_cards)} 个，下次刷新间隔 {interval:.1f} 秒')
+        self._last_refresh[keyword] = now
+        self._due[keyword] = now + self._intervals[keyword].interval
+        self.checkpoint({'keywords': self._keyword_state()}, {'seen': new_keys} if new_keys else None)
+
+        if first_scan and not self.config['fire_on_first_scan']:
+            Logger.info(f'[{keyword}] 已记录 {len(new_cards)} 个现有商品作为基线')
+            return
+
+        # 有规则时对整屏新商品一次性评估
+        fired = self.rules.evaluate(new_cards) if self.rules else [None] * len(new_cards)
+        matched = []
+        for card, rule_name in zip(new_cards, fired):
+            title = card['title']
+            if self.rules:
+                if not rule_name:
+                    continue
+                Logger.debug(f'[{keyword}] 命中规则: {rule_name}')
+            elif self.title_matcher and not self.title_matcher(title):
+                continue
+
+            # 多个进程监控同一关键词时，只由第一个登记成功的进程处理
+            if self.seen and not await self.seen.add(item_key(title, card['price'])):
+                Logger.debug(f'[{keyword}] 商品已由其他进程处理: {title}')
+                continue
+
+            # 优先使用卡片上的发布时间，否则以距上次刷新的时间作为上界
+            age = parse_listing_age(card['age_text'])
+            latency = age if age is not None else now - (last_refresh or now)
+            self.detect_latencies.append(latency)
+            self.matches += 1
+            self.metrics.matches.inc()
+            Logger.success(f'[{keyword}] 发现新商品: {title} (发现延迟 {latency:.1f} 秒)')
+            matched.append(card)
+        if matched:
+            self.checkpoint({'matches': self.matches})
+
+        if not self.on_item_found:
+            return
+        for index, card in enumerate(matched):
+            if not self.running:
+                return
+            if index:
+                # 上一个回调可能离开了结果页，重新打开后找回这个商品的卡片
+                with budget('open_results'):
+                    card = await self._reopen_card(keyword, card)
+                if card is None:
+                    continue
+            with budget('item'):
+                await self.on_item_found(card['element'], card['title'])
+            # 回调可能离开了结果页，下一轮需要重新打开
+            self._open_keyword = None
+
+    async def _reopen_card(self, keyword, card):
+        """重新打开结果页，按标题和价格找回之前读到的商品卡片
+
+        Returns:
+            dict: 新读到的商品卡片，结果页打不开或商品已不在前 N 个时返回 None
+        """
+        key = item_key(card['title'], card['price'])
+        if await self._open_results(keyword):
+            search_page = self.page_factory._get_page_instance(SearchPage)
+            for fresh in await search_page.get_top_cards(self.config['top_n']):
+                if item_key(fresh['title'], fresh['price']) == key:
+                    return fresh
+        Logger.warn(f"[{keyword}] 未能重新找到商品，跳过回调: {card['title']}")
+        return None
+
+    async def run(self):
+        """运行任务"""
+        try:
+            Logger.info(f'=== 开始任务: {self.name} ===')
+            Logger.info(f'监控关键词: {", ".join(self.keywords)}')
+            self.resume()
+
+            while self.running:
+                try:
+                    keyword = self._next_keyword()
+                    wait_time = self._due[keyword] - time.monotonic()
+                    if wait_time > 0:
+                        await asyncio.sleep(wait_time)
+                        continue
+
+                    with budget('open_results'):
+                        refreshed = await self._refresh(keyword)
+                    if not refreshed:
+                        Logger.warn(f'[{keyword}] 刷新结果列表失败，稍后重试')
+                        self._due[keyword] = time.monotonic() + self.config['min_interval']
+                        continue
+
+                    await self._scan(keyword)
+
+                except Exception as e:
+                    Logger.error('任务执行出错', e)
+                    self._open_keyword = None
+                    await asyncio.sleep(2)
+
+        except asyncio.CancelledError:
+            Logger.info(f'任务被取消: {self.name}')
+        except Exception as error:
+            Logger.error(f'任务执行出错: {self.name}', error)
+        finally:
+            self.save_checkpoint()
+            stats = self.stats()
+            if stats['count']:
+                Logger.info(
+                    f"发现延迟: 样本 {stats['count']} 个，平均 {stats['mean']:.1f} 秒，"
+                    f"p50 {stats['p50']:.1f} 秒，p95 {stats['p95']:.1f} 秒"
+                )
+            Logger.info(f'=== 结束任务: {self.name} ===')
@@ -1,16 +1,23 @@
 from typing import Dict, Type
 import asyncio
 from utils.logger import Logger
+from core.deadline import bind_device
+from core.metrics import get_metrics
 from .base_task import BaseTask
 from .browse_items_task import BrowseItemsTask
+from .snipe_items_task import SnipeItemsTask
 
 class TaskManager:
     """任务管理器"""
     
-    def __init__(self, driver, page_factory):
+    def __init__(self, driver, page_factory, sink=None, dedup=None, seen=None):
         self.driver = driver
         self.page_factory = page_factory
+        self.sink = sink
+        self.dedup = dedup
+        self.seen = seen
         self.current_task = None
+        self._runner = None  # 正在运行 current_task.run() 的 asyncio 任务
         self._task_classes: Dict[str, Type[BaseTask]] = {}
         self._register_tasks()
     
@@ -18,6 +25,7 @@ class TaskManager:
         """注册所有可用任务"""
         self._task_classes = {
             'browse_items': BrowseItemsTask,
+            'snipe_items': SnipeItemsTask,
             # 后续可以在这里添加更多任务
             # 'playground': PlaygroundTask,
             # 'activity': ActivityTask,
@@ -36,13 +44,23 @@ class TaskManager:
         return tasks
     
     def stop_current_task(self):
-        """停止当前任务"""
+        """停止当前任务
+
+        除了设置停止标志，还会直接取消正在运行的任务协程，任务在等待、浏览详情页时也能立即退出。
+        """
         if self.current_task:
             self.current_task.stop()
             self.current_task = None
+        if self._runner and not self._runner.done():
+            self._runner.cancel()
     
-    async def run_task(self, task_id: str):
-        """运行指定任务"""
+    async def run_task(self, task_id: str, **options):
+        """运行指定任务
+
+        Args:
+            task_id: 任务ID
+            **options: 传给任务构造函数的额外参数，例如回调函数
+        """
         if task_id not in self._task_classes:
             raise ValueError(f'未知的任务ID: {task_id}')
         
@@ -51,12 +69,23 @@ class TaskManager:
         
         # 创建并运行新任务
         task_class = self._task_classes[task_id]
-        self.current_task = task_class(self.driver, self.page_factory)
+        task = self.current_task = task_class(
+            self.driver, self.page_factory,
+            sink=self.sink, dedup=self.dedup, seen=self.seen, **options
+        )
+        # 任务协程继承设备标识，阶段超出预算的计数按设备区分
+        bind_device(get_metrics(self.driver).device_id)
+        runner = self._runner = asyncio.create_task(task.run())
         
         try:
-            await self.current_task.run()
-        except Exception as e:
-            Logger.error(f'运行任务出错: {task_id}', e)
-            raise
+            # 任务被 stop_current_task 取消时正常返回
+            await asyncio.wait([runner])
         finally:
-            self.current_task = None 
\ No newline at end of file
+            if not runner.done():
+                # 调用方被取消时一并取消任务
+                runner.cancel()
+            if self.current_task is task:
+                self.current_task = None
+        if not runner.cancelled() and runner.exception():
+            Logger.error(f'运行任务出错: {task_id}', runner.exception())
+            raise runner.exception() 
\ No newline at end of file
@@ -0,0 +1,3 @@
+from .limiter import TokenBucket, AdaptiveController, ActionLimiter, get_limiter
+
+__all__ = ['TokenBucket', 'AdaptiveController', 'ActionLimiter', 'get_limiter']
@@ -0,0 +1,215 @@
+from contextlib import asynccontextmanager
+import time
+import weakref
+
+from config.app_config import THROTTLE_CONFIG
+from utils.logger import Logger
+from core import tracing
+from core.metrics import DeviceMetrics, get_metrics
+from core.recorder import get_recorder
+
+
+class TokenBucket:
+    """令牌桶
+
+    按 rate（每秒令牌数）持续补充，最多积攒 burst 个。领取时允许令牌数变为负数，
+    返回需要等待的时间，多个协程并发领取时按顺序排队，不需要轮询。
+    """
+
+    def __init__(self, rate: float, burst: float, clock=None):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock = clock or time.monotonic
+        self._tokens = burst
+        self._updated = clock()
+
+    def reserve(self, scale: float = 1.0) -> float:
+        """领取一个令牌
+
+        Args:
+            scale: 速率倍数，自适应降速时小于 1
+
+        Returns:
+            float: 需要等待的秒数
+        """
+        now = self._clock()
+        rate = self.rate * scale
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / rate
+
+
+class AdaptiveController:
+    """自适应降速（加性增、乘性减）
+
+    每种动作分别记录快、慢两条命令耗时的指数移动平均。快均值明显高于慢均值
+    （Appium 变慢）或者最近出错比例过高时，把速率倍数乘以 decrease；
+    一切正常时每次加回 increase，直到恢复满速。
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.multiplier = 1.0
+        self._fast = {}
+        self._slow = {}
+        self.error_rate = 0.0
+
+    def record(self, action: str, latency: float, error: bool = False):
+        """记录一次动作的耗时和结果
+
+        Returns:
+            bool: 是否触发了降速
+        """
+        config = self.config
+        fast = self._fast.get(action, latency)
+        slow = self._slow.get(action, latency)
+        fast += (latency - fast) * 0.3
+        slow += (latency - slow) * 0.02
+        self._fast[action] = fast
+        self._slow[action] = slow
+        self.error_rate += ((1.0 if error else 0.0) - self.error_rate) * 0.1
+
+        spiking = fast > config['min_latency'] and fast > slow * config['spike_ratio']
+        if error or spiking or self.error_rate > config['error_threshold']:
+            self.multiplier = max(config['min_multiplier'], self.multiplier * config['decrease'])
+            return True
+        self.multiplier = min(1.0, self.multiplier + config['increase'])
+        return False
+
+
+class ActionLimiter:
+    """设备动作限速器
+
+    每个动作依次经过设备、账号和动作类型三个令牌桶，取最长的等待时间。
+    设置了 account_client（SeenClient）时账号的令牌桶放在已处理商品服务中，
+    同一账号的所有进程共享限额；否则只在本进程内共享，fleet 中每个工作进程只有一台设备，
+    账号限额这时只作用于这一台设备。自适应倍数按设备计算，作用于该设备的所有令牌桶。
+    """
+
+    _account_buckets = {}
+
+    def __init__(self, device_id: str = 'default', config=None, metrics=None, recorder=None):
+        """初始化
+
+        Args:
+            device_id: 设备标识，用于日志
+            config: 可选，覆盖 THROTTLE_CONFIG 中的配置
+            metrics: 可选，DeviceMetrics 实例，记录命令耗时和出错次数
+            recorder: 可选，FlightRecorder 实例，保留最近的命令用于故障排查
+        """
+        self.config = dict(THROTTLE_CONFIG)
+        if config:
+            self.config.update(config)
+        self.device_id = device_id
+        self.enabled = self.config['enabled']
+        self.controller = AdaptiveController(self.config)
+        self.counts = {}
+        self.waited = 0.0
+        self.metrics = metrics or DeviceMetrics(device_id)
+        self.recorder = recorder
+        self.account_client = None  # 可选，SeenClient，设置后账号的令牌桶在所有进程间共享
+        self._started = time.monotonic()
+
+        per_second = lambda per_minute: per_minute / 60.0
+        self._device_bucket = TokenBucket(per_second(self.config['device_per_minute']), self.config['device_burst'])
+        account = self.config['account']
+        if account not in self._account_buckets:
+            self._account_buckets[account] = TokenBucket(
+                per_second(self.config['account_per_minute']), self.config['account_burst']
+            )
+        self._account_bucket = self._account_buckets[account]
+        self._action_buckets = {
+            name: TokenBucket(per_second(per_minute), burst)
+            for name, (per_minute, burst) in self.config['actions'].items()
+        }
+
+    async def acquire(self, action: str):
+        """等待直到允许执行动作"""
+        self.counts[action] = self.counts.get(action, 0) + 1
+        if not self.enabled:
+            return
+        scale = self.controller.multiplier
+        buckets = [self._device_bucket]
+        if action in self._action_buckets:
+            buckets.append(self._action_buckets[action])
+        delay = max(max(bucket.reserve(scale) for bucket in buckets), await self._account_delay(scale))
+        if delay > 0:
+            self.waited += delay
+            await tracing.sleep(delay, 'throttle_wait')
+
+    async def _account_delay(self, scale: float) -> float:
+        """从账号的令牌桶领取令牌，共享服务不可用时使用本进程的令牌桶"""
+        if self.account_client is not None:
+            bucket = self._account_bucket
+            delay = await self.account_client.take(self.config['account'], bucket.rate, bucket.burst, scale)
+            if delay is not None:
+                return delay
+        return self._account_bucket.reserve(scale)
+
+    def record(self, action: str, latency: float, error: bool = False):
+        """记录动作结果，用于自适应降速"""
+        if not self.enabled:
+            return
+        before = self.controller.multiplier
+        if self.controller.record(action, latency, error) and before == 1.0:
+            Logger.warn(f'[{self.device_id}] 命令变慢或出错，降低操作速率 (耗时 {latency:.2f} 秒)')
+
+    @asynccontextmanager
+    async def action(self, name: str):
+        """限速执行一个动作，并记录耗时和是否出错
+
+        用法：
+            async with limiter.action('tap'):
+                element.click()
+        """
+        await self.acquire(name)
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as error:
+            latency = time.monotonic() - start
+            self.metrics.observe_command(name, latency, error=True)
+            if self.recorder:
+                self.recorder.record_command(name, latency, error)
+            self.record(name, latency, error=True)
+            raise
+        latency = time.monotonic() - start
+        self.metrics.observe_command(name, latency)
+        if self.recorder:
+            self.recorder.record_command(name, latency)
+        self.record(name, latency)
+
+    def stats(self) -> dict:
+        """动作统计"""
+        minutes = max((time.monotonic() - self._started) / 60.0, 1e-9)
+        return {
+            'multiplier': round(self.controller.multiplier, 3),
+            'error_rate': round(self.controller.error_rate, 3),
+            'waited_seconds': round(self.waited, 3),
+            'per_minute': {name: round(count / minutes, 2) for name, count in self.counts.items()},
+        }
+
+
+_limiters = weakref.WeakKeyDictionary()
+
+
+def get_limiter(driver, config=None) -> ActionLimiter:
+    """获取驱动对应的限速器，同一个驱动（设备）的所有页面共享一个
+
+    Args:
+        driver: Appium WebDriver 实例
+        config: 可选，首次获取时覆盖 THROTTLE_CONFIG 中的配置
+
+    Returns:
+        ActionLimiter: 限速器
+    """
+    limiter = _limiters.get(driver)
+    if limiter is None:
+        metrics = get_metrics(driver)
+        limiter = _limiters[driver] = ActionLimiter(
+            metrics.device_id, config, metrics=metrics, recorder=get_recorder(driver)
+        )
+    return limiter
@@ -0,0 +1,7 @@
+from .tracer import Span, Tracer, get_tracer, span, sleep, finish_tracing
+from .driver import TracedDriver, TracedElement, trace_driver
+
+__all__ = [
+    'Span', 'Tracer', 'get_tracer', 'span', 'sleep', 'finish_tracing',
+    'TracedDriver', 'TracedElement', 'trace_driver',
+]
@@ -0,0 +1,87 @@
+from .tracer import get_tracer, span
+
+# 读取时会向 Appium 发送请求的属性
+_REMOTE_PROPERTIES = frozenset((
+    'page_source', 'current_activity', 'current_package', 'current_context', 'contexts',
+    'orientation', 'window_handles', 'current_url',
+    'text', 'rect', 'location', 'size', 'tag_name',
+))
+
+
+def _is_element(value):
+    return hasattr(value, 'is_displayed') and hasattr(value, 'click') and not isinstance(value, TracedElement)
+
+
+def _wrap_result(value):
+    if _is_element(value):
+        return TracedElement(value)
+    if isinstance(value, list) and value and _is_element(value[0]):
+        return [TracedElement(item) if _is_element(item) else item for item in value]
+    return value
+
+
+def _unwrap(value):
+    return value._target if isinstance(value, _TracedProxy) else value
+
+
+class _TracedProxy:
+    """把驱动命令包装成 driver 类别的 span，嵌套在当前阶段下面"""
+
+    def __init__(self, target):
+        object.__setattr__(self, '_target', target)
+
+    def __getattr__(self, name):
+        if name in _REMOTE_PROPERTIES:
+            with span(name, 'driver'):
+                return _wrap_result(getattr(self._target, name))
+        value = getattr(self._target, name)
+        if name.startswith('_') or not callable(value):
+            return value
+
+        def traced(*args, **kwargs):
+            args = [_unwrap(arg) for arg in args]
+            with span(name, 'driver'):
+                return _wrap_result(value(*args, **kwargs))
+        return traced
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __eq__(self, other):
+        return self._target == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self._target)
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self._target!r})'
+
+
+class TracedDriver(_TracedProxy):
+    """记录驱动命令耗时的 WebDriver 代理"""
+    pass
+
+
+class TracedElement(_TracedProxy):
+    """记录元素命令耗时的 WebElement 代理"""
+    pass
+
+
+def trace_driver(driver):
+    """按配置包装驱动
+
+    追踪未启用，或配置中关闭了驱动命令追踪时原样返回。
+
+    Args:
+        driver: WebDriver 实例
+
+    Returns:
+        驱动或其代理
+    """
+    from config.app_config import TRACE_CONFIG
+
+    if driver is None or not get_tracer().enabled or not TRACE_CONFIG.get('driver_commands', True):
+        return driver
+    if isinstance(driver, TracedDriver):
+        return driver
+    return TracedDriver(driver)
@@ -0,0 +1,224 @@
+import asyncio
+from collections import deque
+import contextvars
+import json
+import os
+import threading
+import time
+
+from config.app_config import TRACE_CONFIG
+from utils.logger import Logger
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class _NullSpan:
+    """未启用追踪时使用的空 span"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """一段计时区间，同时支持 with 和 async with，嵌套关系通过 contextvars 传递"""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'stack', 'start', 'child_time', 'parent', '_token')
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self.stack = self.parent.stack + (self.name,) if self.parent else (self.name,)
+        self.child_time = 0.0
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration = time.perf_counter() - self.start
+        _current_span.reset(self._token)
+        if self.parent:
+            self.parent.child_time += duration
+        self.tracer._record(self, duration, exc_type is not None)
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        return self.__exit__(exc_type, exc, traceback)
+
+
+class Tracer:
+    """阶段耗时追踪
+
+    记录每个 span 的起止时间，可以导出为 Chrome trace-event JSON（chrome://tracing 或 Perfetto 打开）
+    和折叠栈格式（flamegraph.pl、speedscope 使用）。事件数量有上限，超出后丢弃最早的事件，
+    但按阶段汇总的耗时统计覆盖整个运行过程。
+    """
+
+    def __init__(self, enabled: bool = True, max_events: int = 200000):
+        self.enabled = enabled
+        self.events = deque(maxlen=max_events)
+        self.totals = {}  # 名称 -> [次数, 总耗时, 自身耗时, 出错次数]
+        self.folded = {}  # 调用栈 -> 自身耗时
+        self._origin = time.perf_counter()
+        self._tids = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, category: str = 'phase', **args):
+        """创建一个 span
+
+        用法：
+            with tracer.span('get_items'):
+                ...
+            async with tracer.span('browse_detail_page'):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, category, args)
+
+    def _thread_id(self):
+        # 同一线程中的多个协程各自一条时间线，避免并发的 span 互相嵌套
+        try:
+            key = id(asyncio.current_task())
+        except RuntimeError:
+            key = threading.get_ident()
+        return self._tids.setdefault(key, len(self._tids) + 1)
+
+    def _record(self, span, duration, error):
+        self_time = max(0.0, duration - span.child_time)
+        with self._lock:
+            total = self.totals.get(span.name)
+            if total is None:
+                total = self.totals[span.name] = [0, 0.0, 0.0, 0]
+            total[0] += 1
+            total[1] += duration
+            total[2] += self_time
+            if error:
+                total[3] += 1
+            stack = ';'.join(span.stack)
+            self.folded[stack] = self.folded.get(stack, 0.0) + self_time
+
+            event = {
+                'name': span.name,
+                'cat': span.category,
+                'ph': 'X',
+                'ts': (span.start - self._origin) * 1e6,
+                'dur': duration * 1e6,
+                'pid': os.getpid(),
+                'tid': self._thread_id(),
+            }
+            if span.args or error:
+                event['args'] = dict(span.args, error=True) if error else span.args
+            self.events.append(event)
+
+    def summary(self):
+        """按阶段汇总耗时
+
+        Returns:
+            list: 按自身耗时从大到小排列的 (名称, 次数, 总耗时, 自身耗时, 自身耗时占比, 出错次数)
+        """
+        with self._lock:
+            items = list(self.totals.items())
+        self_total = sum(total[2] for _, total in items) or 1.0
+        rows = [
+            (name, count, duration, self_time, self_time / self_total, errors)
+            for name, (count, duration, self_time, errors) in items
+        ]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def log_summary(self):
+        """在日志中输出各阶段耗时"""
+        rows = self.summary()
+        if not rows:
+            return
+        Logger.info('===== 各阶段耗时（按自身耗时排序）=====')
+        for name, count, duration, self_time, share, errors in rows:
+            Logger.info(
+                f'{name:<24} {count:>7} 次  总计 {duration:>9.2f} 秒  自身 {self_time:>9.2f} 秒  '
+                f'{share * 100:>5.1f}%' + (f'  出错 {errors} 次' if errors else '')
+            )
+
+    def export_chrome(self, path: str):
+        """导出 Chrome trace-event JSON"""
+        _ensure_parent(path)
+        with self._lock:
+            events = list(self.events)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, file, ensure_ascii=False)
+
+    def export_folded(self, path: str):
+        """导出折叠栈格式，数值为自身耗时（微秒）"""
+        _ensure_parent(path)
+        with self._lock:
+            folded = list(self.folded.items())
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, seconds in folded:
+                file.write(f'{stack} {int(seconds * 1e6)}\n')
+
+
+def _ensure_parent(path):
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+
+
+_tracer = Tracer(TRACE_CONFIG['enabled'], TRACE_CONFIG['max_events'])
+
+
+def get_tracer() -> Tracer:
+    """获取进程内共享的追踪器"""
+    return _tracer
+
+
+def span(name: str, category: str = 'phase', **args):
+    """在共享追踪器上创建 span，未启用追踪时几乎没有开销"""
+    if not _tracer.enabled:
+        return _NULL_SPAN
+    return Span(_tracer, name, category, args)
+
+
+async def sleep(seconds: float, name: str = 'sleep'):
+    """带 span 的 asyncio.sleep，便于统计固定等待占用的时间"""
+    with span(name, 'sleep'):
+        await asyncio.sleep(seconds)
+
+
+def finish_tracing(suffix: str = None):
+    """导出追踪结果并输出各阶段耗时，在程序退出时调用
+
+    Args:
+        suffix: 可选，文件名后缀，多进程时用于区分各个工作进程
+    """
+    if not _tracer.enabled or not _tracer.totals:
+        return
+    _tracer.log_summary()
+    for key, export in (('chrome_path', _tracer.export_chrome), ('folded_path', _tracer.export_folded)):
+        path = TRACE_CONFIG.get(key)
+        if not path:
+            continue
+        if suffix:
+            root, ext = os.path.splitext(path)
+            path = f'{root}-{suffix}{ext}'
+        try:
+            export(path)
+            Logger.info(f'追踪结果已保存: {path}')
+        except Exception as e:
+            Logger.error(f'保存追踪结果失败: {path}', e)
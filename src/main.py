@@ -1,4 +1,4 @@
-import asyncio
+import argparse
 import sys
 from pathlib import Path
 
@@ -7,32 +7,19 @@ src_path = str(Path(__file__).parent.absolute())
 if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
-from utils.logger import Logger
-from core.automation import XianyuAutomation
-from core.signal import SignalHandler
+import cli
 
-async def run_automation():
-    """运行自动化程序的主函数"""
-    automation = XianyuAutomation()
-    signal_handler = SignalHandler(automation.stop)
-    
-    try:
-        await automation.run()
-    except Exception as e:
-        Logger.error('程序异常退出', e)
-        raise
-    finally:
-        signal_handler.cleanup()
 
 def main():
-    """程序入口函数"""
-    try:
-        asyncio.run(run_automation())
-    except KeyboardInterrupt:
-        pass  # 优雅退出，不显示错误堆栈
-    except Exception as e:
-        Logger.error('程序运行出错', e)
-        raise
+    """程序入口函数，保留原来的参数，等同于 cli.py run / run --watch / fleet"""
+    parser = argparse.ArgumentParser(description='闲鱼自动化助手')
+    parser.add_argument('--watch', action='store_true', help='新品捡漏监控模式')
+    parser.add_argument('--fleet', action='store_true', help='多设备模式，设备配置见 FLEET_CONFIG')
+    args = parser.parse_args()
+
+    if args.fleet:
+        return cli.main(['fleet'])
+    return cli.main(['run', '--watch'] if args.watch else ['run'])
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    sys.exit(main())
@@ -1,19 +1,20 @@
 #!/usr/bin/env python3
-from appium import webdriver
-from appium.options.common.base import AppiumOptions
 import asyncio
-import signal
 import os
 
 from utils.logger import Logger
-from config.app_config import APPIUM_CONFIG
 from core.pages.page_factory import PageFactory
 from core.pages.home_page import HomePage
 from core.pages.city_service_page import CityServicePage
 from core.pages.detail_page import DetailPage
+from core.pages.search_page import SearchPage
+from core.metrics import start_metrics_server
+from core.signal import SignalHandler, bounded, quit_driver
+from core.drivers import create_driver
 
 class PageMonitor:
-    def __init__(self):
+    def __init__(self, device=None):
+        self.device = device
         self.driver = None
         self.page_factory = None
         self.running = True
@@ -23,14 +24,8 @@ class PageMonitor:
         """初始化 Appium"""
         try:
             Logger.info('初始化自动化配置...')
-            options = AppiumOptions()
-            for key, value in APPIUM_CONFIG['capabilities'].items():
-                options.set_capability(key, value)
-            
-            self.driver = webdriver.Remote(
-                command_executor=f'http://localhost:4723',
-                options=options
-            )
+            # 只连接设备，不切换当前应用
+            self.driver = create_driver(self.device, launch_app=False)
             Logger.success('Appium 连接成功')
 
             # 初始化页面工厂
@@ -38,6 +33,7 @@ class PageMonitor:
             self.page_factory.register_page(HomePage, HomePage.IDENTIFIERS)
             self.page_factory.register_page(CityServicePage, CityServicePage.IDENTIFIERS)
             self.page_factory.register_page(DetailPage, DetailPage.IDENTIFIERS)
+            self.page_factory.register_page(SearchPage, SearchPage.IDENTIFIERS)
             
             return True
         except Exception as e:
@@ -51,14 +47,13 @@ class PageMonitor:
             Logger.info('正在停止监控...')
 
     async def cleanup(self):
-        """清理资源"""
+        """清理资源，每一步都有超时"""
+        if self.page_factory:
+            await bounded('停止页面观察器', self.page_factory.stop_observer())
         if self.driver:
-            try:
-                Logger.info('正在关闭会话...')
-                self.driver.quit()
+            Logger.info('正在关闭会话...')
+            if await quit_driver(self.driver):
                 Logger.success('会话已关闭')
-            except Exception as e:
-                Logger.error('关闭会话时出错', e)
 
     async def monitor_pages(self):
         """监控页面状态"""
@@ -66,9 +61,19 @@ class PageMonitor:
             Logger.info('=== 开始页面监控 ===')
             Logger.info('提示：按 Ctrl+C 停止监控')
             
+            # 订阅页面观察器的页面切换事件，不再单独轮询
+            observer = self.page_factory.start_observer()
+            events = observer.subscribe()
+            
             while self.running:
                 try:
-                    current_page = await self.page_factory.get_current_page()
+                    try:
+                        # 定期醒来检查运行状态
+                        event = await asyncio.wait_for(events.get(), timeout=1)
+                    except asyncio.TimeoutError:
+                        continue
+                    
+                    current_page = event.current
                     current_type = type(current_page) if current_page else None
                     
                     # 只在页面类型发生变化时输出日志
@@ -79,15 +84,17 @@ class PageMonitor:
                             Logger.info('当前页面: 城市服务页面')
                         elif isinstance(current_page, DetailPage):
                             Logger.info('当前页面: 商品详情页')
+                        elif isinstance(current_page, SearchPage):
+                            Logger.info('当前页面: 搜索结果页')
                         else:
                             Logger.debug('当前页面: 未知页面')
                         self._last_page_type = current_type
-                    
-                    await asyncio.sleep(1)  # 缩短检查间隔，提高响应性
                 except Exception as e:
                     Logger.error('页面检查出错', e)
                     await asyncio.sleep(1)
 
+            observer.unsubscribe(events)
+
         except asyncio.CancelledError:
             Logger.info('监控被取消')
         except Exception as error:
@@ -95,26 +102,33 @@ class PageMonitor:
         finally:
             await self.cleanup()
 
-async def main():
-    monitor = PageMonitor()
-    
-    def signal_handler():
-        monitor.stop()
+async def main(device=None):
+    """运行页面监控
+
+    Args:
+        device: 可选，设备配置，格式同 FLEET_CONFIG['devices']
+    """
+    monitor = PageMonitor(device)
     
     if not await monitor.setup():
         return
     
-    loop = asyncio.get_running_loop()
-    for sig in (signal.SIGINT, signal.SIGTERM):
-        loop.add_signal_handler(sig, signal_handler)
+    signal_handler = SignalHandler(monitor.stop)
+    metrics_server = await start_metrics_server()
     
+    # 收到信号时直接取消监控任务，不等下一次检查运行状态
+    runner = asyncio.create_task(monitor.monitor_pages())
+    signal_handler.register_task(runner)
     try:
-        await monitor.monitor_pages()
+        await runner
+    except asyncio.CancelledError:
+        pass
     except Exception as e:
         Logger.error('程序异常退出', e)
     finally:
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.remove_signal_handler(sig)
+        signal_handler.cleanup()
+        if metrics_server:
+            await metrics_server.stop()
 
 if __name__ == '__main__':
     try:
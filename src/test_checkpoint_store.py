@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""检查点快照与增量日志重放的测试"""
+import json
+
+from core.checkpoint import CheckpointStore
+
+
+def test_journal_is_replayed_on_load(tmp_path):
+    path = str(tmp_path / 'sniper.json')
+    store = CheckpointStore(path, limits={'seen': 3})
+    store.record({'round': 1}, {'seen': ['a', 'b']})
+    store.record({'round': 2}, {'seen': ['c', 'd']})
+    store.close()
+
+    restored = CheckpointStore(path, limits={'seen': 3})
+    assert restored.load() == {'round': 2, 'seen': ['b', 'c', 'd']}
+    assert restored.seq == 2
+
+
+def test_entries_merged_into_snapshot_are_skipped(tmp_path):
+    path = str(tmp_path / 'sniper.json')
+    store = CheckpointStore(path)
+    store.record(extend={'seen': ['a']})
+    store.record(extend={'seen': ['b']})
+    journal = open(store.journal_path, encoding='utf-8').read()
+    store.save()
+    # 模拟快照已经替换、日志还没清空时崩溃
+    with open(store.journal_path, 'w', encoding='utf-8') as file:
+        file.write(journal)
+    store.record(extend={'seen': ['c']})
+    store.close()
+
+    restored = CheckpointStore(path)
+    assert restored.load() == {'seen': ['a', 'b', 'c']}
+    assert restored.seq == 3
+
+
+def test_half_written_last_line_is_ignored(tmp_path):
+    path = str(tmp_path / 'sniper.json')
+    store = CheckpointStore(path)
+    store.record({'round': 1})
+    store.close()
+    with open(store.journal_path, 'a', encoding='utf-8') as file:
+        file.write(json.dumps({'seq': 2, 'at': 0, 'set': {'round': 2}})[:10])
+
+    assert CheckpointStore(path).load() == {'round': 1}
+
+
+def test_stale_checkpoint_is_discarded(tmp_path):
+    path = str(tmp_path / 'sniper.json')
+    store = CheckpointStore(path)
+    store.save({'round': 5})
+    snapshot = json.load(open(path, encoding='utf-8'))
+    snapshot['saved_at'] -= 3600
+    json.dump(snapshot, open(path, 'w', encoding='utf-8'))
+
+    restored = CheckpointStore(path)
+    assert restored.load(max_age=600) is None
+    assert not (tmp_path / 'sniper.json').exists()
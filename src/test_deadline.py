@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""阶段预算和剩余时间的测试"""
+import asyncio
+import time
+
+import pytest
+
+from config.app_config import DEADLINE_CONFIG
+from core.deadline import DeadlineExceeded, budget, budget_stats, check, expired, remaining, wait_until
+
+
+@pytest.fixture(autouse=True)
+def deadline_enabled(monkeypatch):
+    monkeypatch.setitem(DEADLINE_CONFIG, 'enabled', True)
+
+
+def test_no_budget_keeps_default():
+    assert remaining() is None
+    assert remaining(5) == 5
+    assert not expired()
+    with budget('phase-without-config'):
+        assert remaining(5) == 5
+
+
+def test_inner_budget_cannot_extend_outer():
+    with budget('outer', 1):
+        with budget('inner', 60):
+            assert remaining() <= 1
+        with budget('short', 0.2):
+            assert remaining() <= 0.2
+            assert remaining(0.1) <= 0.1
+        assert 0.2 < remaining() <= 1
+    assert remaining() is None
+
+
+def test_expired_budget_is_counted():
+    with pytest.raises(DeadlineExceeded):
+        with budget('test-expired', 0):
+            assert expired()
+            check()
+    with budget('test-expired', 0):
+        time.sleep(DEADLINE_CONFIG['overrun_grace'] + 0.05)
+    stats = budget_stats()['test-expired']
+    assert stats['count'] == 2
+    assert stats['exceeded'] == 1
+
+
+def test_wait_until_uses_remaining_time():
+    async def scenario():
+        with budget('wait', 0.2):
+            start = time.monotonic()
+            result = await wait_until(lambda: False, timeout=10, poll=0.05)
+            return result, time.monotonic() - start
+
+    result, elapsed = asyncio.run(scenario())
+    assert result is None
+    assert elapsed < 1
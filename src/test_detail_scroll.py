@@ -1,26 +1,16 @@
 #!/usr/bin/env python3
-from appium import webdriver
-from appium.options.common.base import AppiumOptions
 import asyncio
-import os
 
 from utils.logger import Logger
-from config.app_config import APPIUM_CONFIG
 from core.pages.detail_page import DetailPage
+from core.drivers import create_driver
 
 async def test_detail_scroll():
     """测试详情页滚动功能"""
     try:
         # 初始化 Appium
         Logger.info('初始化 Appium...')
-        options = AppiumOptions()
-        for key, value in APPIUM_CONFIG['capabilities'].items():
-            options.set_capability(key, value)
-        
-        driver = webdriver.Remote(
-            command_executor='http://localhost:4723',
-            options=options
-        )
+        driver = create_driver(launch_app=False)
         Logger.success('Appium 连接成功')
 
         # 创建详情页实例
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""任务队列租约过期和重新排队的测试"""
+import asyncio
+
+import pytest
+
+from core.jobs import Job, MemoryJobQueue, SqliteJobQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def queue_factory(request, tmp_path):
+    def create(clock):
+        if request.param == 'memory':
+            return MemoryJobQueue(clock=clock)
+        return SqliteJobQueue(str(tmp_path / 'jobs.db'), clock=clock)
+    return create
+
+
+def test_expired_lease_is_requeued(queue_factory):
+    async def scenario():
+        clock = FakeClock()
+        queue = queue_factory(clock)
+        job_id = await queue.submit(Job('scan', {'keyword': 'chiikawa'}))
+
+        first = await queue.lease('worker-a', 30)
+        assert first.job_id == job_id
+        assert await queue.lease('worker-b', 30) is None
+
+        # worker-a 失联，租约过期后任务交给 worker-b
+        clock.now += 31
+        second = await queue.lease('worker-b', 30)
+        assert second.job_id == job_id
+        assert second.attempts == 2
+
+        # 旧的租约持有者不能再续约或提交结果
+        assert not await queue.heartbeat(job_id, 'worker-a', 30)
+        assert not await queue.complete(job_id, 'worker-a', {'items': 1})
+        assert await queue.complete(job_id, 'worker-b', {'items': 2})
+        job = await queue.get(job_id)
+        assert job.status == Job.DONE
+        assert job.result == {'items': 2}
+        await queue.close()
+
+    asyncio.run(scenario())
+
+
+def test_heartbeat_keeps_lease(queue_factory):
+    async def scenario():
+        clock = FakeClock()
+        queue = queue_factory(clock)
+        job_id = await queue.submit(Job('scan'))
+        await queue.lease('worker-a', 30)
+
+        clock.now += 20
+        assert await queue.heartbeat(job_id, 'worker-a', 30)
+        clock.now += 20
+        assert await queue.lease('worker-b', 30) is None
+        await queue.close()
+
+    asyncio.run(scenario())
+
+
+def test_job_fails_after_max_attempts(queue_factory):
+    async def scenario():
+        clock = FakeClock()
+        queue = queue_factory(clock)
+        job_id = await queue.submit(Job('scan', max_attempts=2))
+
+        await queue.lease('worker-a', 30)
+        assert await queue.fail(job_id, 'worker-a', '页面加载失败')
+        await queue.lease('worker-a', 30)
+        clock.now += 31
+
+        assert (await queue.stats())[Job.FAILED] == 1
+        job = await queue.get(job_id)
+        assert job.status == Job.FAILED
+        assert job.error == 'lease expired'
+        assert await queue.lease('worker-b', 30) is None
+        await queue.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""关键词模糊匹配的测试"""
+import pytest
+
+from core.matching.keyword_index import KeywordIndex, _window_distance
+from core.matching.normalize import _TRADITIONAL_TABLE, to_pinyin
+
+
+@pytest.fixture(scope='module')
+def index():
+    return KeywordIndex(['chiikawa', '奇卡瓦'], threshold=0.7)
+
+
+@pytest.mark.parametrize('title', [
+    'chiikawa 挂件',
+    'ｃｈｉｉ ｋａｗａ 玩偶',
+    'c h i i🌟k a w a',
+    'chiikava 钥匙扣',
+    'CHIKAWA 贴纸',
+    '正版奇卡瓦',
+    '吉伊卡哇 挂件',
+    'ちいかわ',
+])
+def test_matches(index, title):
+    keyword, score = index.match(title)
+    assert keyword is not None
+    assert score >= 0.7
+
+
+@pytest.mark.parametrize('title', [
+    '可爱卡哇伊',
+    '卡哇伊七彩发夹',
+    '卡哇伊汽车挂件',
+    'kawa chii 零散字母',
+    '九成新机械键盘',
+])
+def test_unrelated_titles_do_not_match(index, title):
+    assert index.match(title) == (None, 0.0)
+
+
+def test_pinyin_homophone_matches(index):
+    if not to_pinyin('奇'):
+        pytest.skip('未安装 pypinyin')
+    assert index.match('奇卡哇 玩偶')[0] == '奇卡瓦'
+
+
+@pytest.mark.parametrize('keyword, title', [
+    ('奇卡瓦', '旗卡袜子'),
+    ('猫', '帽子 全新'),
+    ('猫', 'maozi 全新'),
+])
+def test_homophones_of_other_words_do_not_match(keyword, title):
+    assert KeywordIndex([keyword]).match(title) == (None, 0.0)
+
+
+def test_configured_alias_group():
+    index = KeywordIndex(['hello kitty'], alias_groups=[['hello kitty', '凯蒂猫']])
+    assert index.match('凯蒂猫 发夹') == ('hello kitty', 1.0)
+
+
+@pytest.mark.parametrize('pattern, text, distance', [
+    ('chiikawa', 'xxchiikawaxx', 0),
+    ('chiikawa', 'chiikava', 1),
+    ('chiikawa', 'chikawa', 1),
+    ('qikawa', 'keaikawayi', 1),  # 所以短的拼音形式只做精确匹配
+    ('abc', '', 3),
+])
+def test_window_distance(pattern, text, distance):
+    assert _window_distance(pattern, text) == distance
+
+
+def test_traditional_table_has_no_self_pairs():
+    assert all(key != ord(value) for key, value in _TRADITIONAL_TABLE.items())
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""规则解析和批量评估的测试"""
+import pytest
+
+from core.rules import CARD_FIELDS, RuleSet, RuleSyntaxError, parse_rule
+
+
+def test_parse_precedence():
+    assert parse_rule('chiikawa AND price < 80 OR NOT 盲盒') == ('or', [
+        ('and', [('text', 'title', 'chiikawa'), ('num', 'price', '<', 80.0)]),
+        ('not', ('text', 'title', '盲盒')),
+    ])
+
+
+def test_parse_implicit_and_and_field_text():
+    assert parse_rule('(吉伊卡哇 OR chiikawa) seller:小明 want_count ≥ 10') == ('and', [
+        ('or', [('text', 'title', '吉伊卡哇'), ('text', 'title', 'chiikawa')]),
+        ('text', 'seller', '小明'),
+        ('num', 'want_count', '>=', 10.0),
+    ])
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    'price <',
+    'price < abc',
+    '(chiikawa',
+    'chiikawa )',
+    'seller:',
+])
+def test_syntax_errors(text):
+    with pytest.raises(RuleSyntaxError):
+        parse_rule(text)
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(RuleSyntaxError, match='seller_credit'):
+        parse_rule('seller_credit > 90')
+    # 卡片上读不到 want_count，MATCH_RULES 不能引用
+    with pytest.raises(RuleSyntaxError, match='want_count'):
+        parse_rule('want_count > 10', fields=CARD_FIELDS)
+
+
+def test_first_matching_rule_wins():
+    rules = RuleSet([
+        ('cheap', 'chiikawa price < 50'),
+        {'name': 'any', 'rule': 'chiikawa OR 吉伊卡哇'},
+    ])
+    records = [
+        {'title': 'Chiikawa 挂件', 'price': '¥30'},
+        {'title': '吉伊卡哇 玩偶', 'price': 120},
+        {'title': 'chiikawa 贴纸'},
+        {'title': '机械键盘', 'price': 10},
+    ]
+    assert rules.evaluate(records) == ['cheap', 'any', 'any', None]
+    assert rules.match({'title': '九成新'}) is None
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""捡漏任务比对新商品的测试，不需要设备"""
+import asyncio
+
+import pytest
+
+from config.app_config import CHECKPOINT_CONFIG
+from core.pages.search_page import SearchPage
+from core.tasks.snipe_items_task import SnipeItemsTask
+
+
+class FakeDriver:
+    capabilities = {'udid': 'test-sniper'}
+
+
+class FakeSearchPage:
+    def __init__(self):
+        self.cards = []
+
+    async def get_top_cards(self, top_n=10):
+        # 每次读取都是新的元素，和真实页面重新打开后一样
+        return [dict(card, element=object()) for card in self.cards[:top_n]]
+
+    async def search(self, keyword):
+        return True
+
+    async def sort_by_newest(self):
+        return True
+
+
+class FakeNavigator:
+    async def navigate_to(self, target):
+        return target is SearchPage
+
+
+class FakePageFactory:
+    def __init__(self, search_page):
+        self.search_page = search_page
+        self.navigator = FakeNavigator()
+
+    async def wait_for_page(self, page_class, timeout=10):
+        return page_class is SearchPage
+
+    def _get_page_instance(self, page_class):
+        assert page_class is SearchPage
+        return self.search_page
+
+
+class FakeSeenClient:
+    """跨进程已处理商品服务，others 中的商品视为已由其他进程登记"""
+
+    def __init__(self, others=()):
+        self.keys = set(others)
+
+    async def add(self, key):
+        if key in self.keys:
+            return False
+        self.keys.add(key)
+        return True
+
+
+def card(title, price='¥50'):
+    return {'title': title, 'price': price, 'age_text': '1分钟前', 'element': object()}
+
+
+def run_scans(seen=None, new_titles=('chiikawa 新品发夹',)):
+    """基线扫描一次，出现新商品后再扫描一次，返回触发回调的标题"""
+    search_page = FakeSearchPage()
+    fired = []
+
+    async def on_item_found(element, title):
+        fired.append(title)
+
+    task = SnipeItemsTask(FakeDriver(), FakePageFactory(search_page), on_item_found=on_item_found,
+                          keywords=['chiikawa'], seen=seen)
+
+    async def scans():
+        search_page.cards = [card('chiikawa 挂件'), card('chiikawa 玩偶')]
+        await task._scan('chiikawa')
+        search_page.cards = [card(title) for title in new_titles] + search_page.cards
+        await task._scan('chiikawa')
+
+    asyncio.run(scans())
+    return task, fired
+
+
+@pytest.fixture(autouse=True)
+def no_checkpoint(monkeypatch):
+    monkeypatch.setitem(CHECKPOINT_CONFIG, 'enabled', False)
+
+
+def test_new_card_fires_without_seen_client():
+    task, fired = run_scans()
+    assert fired == ['chiikawa 新品发夹']
+    assert task.seen is None
+    assert len(task.recent) == 3
+
+
+def test_new_card_fires_with_seen_client():
+    client = FakeSeenClient()
+    task, fired = run_scans(client)
+    assert fired == ['chiikawa 新品发夹']
+    assert task.seen is client
+    assert len(client.keys) == 1
+
+
+def test_card_claimed_by_other_process_does_not_fire():
+    from core.seen import item_key
+
+    _, fired = run_scans(FakeSeenClient([item_key('chiikawa 新品发夹', '¥50')]))
+    assert fired == []
+
+
+def test_every_new_card_in_one_refresh_fires():
+    titles = ('chiikawa 新品发夹', 'chiikawa 新品挂件', 'chiikawa 新品贴纸')
+    task, fired = run_scans(new_titles=titles)
+    assert fired == list(titles)
+    assert task.matches == 3
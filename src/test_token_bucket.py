@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""令牌桶的测试"""
+import pytest
+
+from core.throttle import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_queue():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # 令牌用完后并发领取的协程依次排队
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_refill_is_capped_at_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+    for _ in range(3):
+        bucket.reserve()
+    clock.now += 100
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_scale_slows_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=1, clock=clock)
+    bucket.reserve()
+    assert bucket.reserve(scale=0.5) == pytest.approx(1.0)
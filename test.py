@@ -1,25 +1,19 @@
-from appium import webdriver
-from appium.webdriver.common.appiumby import AppiumBy
-from appium.options.common.base import AppiumOptions
+import sys
 import time
 import random
+from pathlib import Path
+
+# 将 src 目录添加到 Python 路径
+src_path = str(Path(__file__).parent.joinpath('src').absolute())
+if src_path not in sys.path:
+    sys.path.insert(0, src_path)
+
+from core.drivers import create_driver
 
 class ScrollTest:
     def __init__(self):
-        # Appium 配置
-        options = AppiumOptions()
-        options.set_capability('platformName', 'Android')
-        options.set_capability('automationName', 'UiAutomator2')
-        options.set_capability('deviceName', 'Android')
-        options.set_capability('noReset', True)
-        options.set_capability('dontStopAppOnReset', True)
-        options.set_capability('autoLaunch', False)
-        
-        # Appium 服务器配置
-        self.driver = webdriver.Remote(
-            command_executor='http://localhost:4723',
-            options=options
-        )
+        # 只连接设备，不启动应用
+        self.driver = create_driver(launch_app=False)
         
         # 设置屏幕尺寸
         self.window_size = self.driver.get_window_size()